@@ -1 +1 @@
-__all__ = ['models', 'indices', 'sac', 'export', 'consorcio']
+__all__ = ['models', 'indices', 'sac', 'export', 'consorcio', 'fast']
@@ -0,0 +1,137 @@
+# src/simfin/batch.py
+"""
+Simulação em lote: um cenário por linha (JSONL ou CSV), distribuído num
+ProcessPoolExecutor (ou ThreadPoolExecutor, com pool="threads") e devolvido
+como um resumo por linha, na ordem de entrada.
+Erros de uma linha (prazo inválido, campo ausente, número malformado) viram
+um resumo com "erro" e não interrompem o lote.
+"""
+from __future__ import annotations
+import csv, json, os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, TypeVar, Union
+
+from .models import EntradaValor, Resultado
+from .sac import simular_sac_por_prazo, simular_sac_por_valor
+from .consorcio import ConsorcioInput, ConsorcioResultado, simular_consorcio
+from . import centavos
+from .leitura import Entrada, entrada_de_dict
+from .cache import MAX_BYTES_PADRAO, CacheResultados, abrir as abrir_cache
+
+Registro = Union[str, Dict[str, Any]]
+CHUNKSIZE_PADRAO = 16
+POOLS = {"processos": ProcessPoolExecutor, "threads": ThreadPoolExecutor}
+T = TypeVar("T")
+
+# O resumo só lê a coluna de parcelas; o lote não guarda as demais
+COLUNAS_RESUMO = ("parcela",)
+
+def simular_entrada(e: Entrada, engine: str = "decimal", verificar: bool = False,
+                    colunas: Optional[Iterable[str]] = None,
+                    cache: Optional[CacheResultados] = None) -> Union[Resultado, ConsorcioResultado]:
+    # Com cache, devolve o resultado guardado (verificar=True sempre recalcula)
+    if cache is not None and not verificar:
+        r = cache.obter(e, engine, colunas)
+        if r is None:
+            r = simular_entrada(e, engine, colunas=colunas)
+            cache.guardar(e, engine, r)
+        return r
+    if engine == "fast":
+        from . import fast
+        if isinstance(e, ConsorcioInput):
+            return fast.simular_consorcio(e, verificar=verificar).para_decimal()
+        if isinstance(e, EntradaValor):
+            return fast.simular_sac_por_valor(e, verificar=verificar).para_decimal()
+        return fast.simular_sac_por_prazo(e, verificar=verificar).para_decimal()
+    if engine == "centavos":
+        if isinstance(e, ConsorcioInput):
+            return centavos.simular_consorcio(e, colunas)
+        if isinstance(e, EntradaValor):
+            return centavos.simular_sac_por_valor(e, colunas)
+        return centavos.simular_sac_por_prazo(e, colunas)
+    if engine != "decimal":
+        raise ValueError(f"Motor inválido: {engine!r}")
+    if isinstance(e, ConsorcioInput):
+        return simular_consorcio(e, colunas)
+    if isinstance(e, EntradaValor):
+        return simular_sac_por_valor(e, colunas)
+    return simular_sac_por_prazo(e, colunas)
+
+def resumo(r: Union[Resultado, ConsorcioResultado]) -> Dict[str, Any]:
+    if isinstance(r, ConsorcioResultado):
+        return {
+            "tipo": "consorcio",
+            "mes_contemplacao": r.mes_contemplacao,
+            "primeira_parcela": str(r.parcelas[0]["parcela"]),
+            "ultima_parcela": str(r.parcelas[-1]["parcela"]),
+            "total_pago": str(r.total_pago),
+            "total_pago_liquido": str(r.total_pago_liquido),
+        }
+    return {
+        "tipo": "sac",
+        "prazo_utilizado": r.prazo_utilizado,
+        "primeira_parcela": str(r.primeira_parcela),
+        "ultima_parcela": str(r.ultima_parcela),
+        "total_pago": str(r.valor_total_pago),
+    }
+
+def _processar(item: Tuple[int, Registro], engine: str = "decimal",
+               cache_dir: Optional[str] = None, cache_max_bytes: int = MAX_BYTES_PADRAO) -> Dict[str, Any]:
+    linha, registro = item
+    try:
+        dados = json.loads(registro) if isinstance(registro, str) else registro
+        if not isinstance(dados, dict):
+            raise ValueError("Registro deve ser um objeto JSON")
+        cache = abrir_cache(cache_dir, cache_max_bytes) if cache_dir else None
+        r = simular_entrada(entrada_de_dict(dados), engine, colunas=COLUNAS_RESUMO, cache=cache)
+        return {"linha": linha, **resumo(r)}
+    except Exception as exc:     # qualquer falha fica na linha: o lote não para
+        return {"linha": linha, "erro": f"{type(exc).__name__}: {exc}"}
+
+def ler_lote(path: str, formato: Optional[str] = None) -> Iterator[Tuple[int, Registro]]:
+    # Lê sob demanda; JSONL é decodificado no worker para isolar linhas malformadas
+    formato = formato or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if formato == "csv":
+            for n, row in enumerate(csv.DictReader(f), start=1):
+                yield n, row
+        else:
+            for n, texto in enumerate(f, start=1):
+                texto = texto.strip()
+                if texto:
+                    yield n, texto
+
+def simular_lote(registros: Iterable[Tuple[int, Registro]], workers: Optional[int] = None,
+                 chunksize: int = CHUNKSIZE_PADRAO, engine: str = "decimal",
+                 cache_dir: Optional[str] = None, cache_max_bytes: int = MAX_BYTES_PADRAO,
+                 pool: str = "processos") -> Iterator[Dict[str, Any]]:
+    """
+    Simula cada registro (linha, dict ou texto JSON) e devolve os resumos na
+    ordem de entrada. workers=1 roda no próprio processo; caso contrário,
+    usa um pool de processos (ou de threads, com pool="threads": sem custo
+    de serialização, e paralelo de fato em Python sem GIL, 3.13t+), consumindo
+    a entrada em janelas para não carregar o arquivo inteiro. Com cache_dir,
+    cada worker consulta o cache de resultados (simfin.cache) nesse diretório.
+    """
+    fn = partial(_processar, engine=engine, cache_dir=cache_dir, cache_max_bytes=cache_max_bytes)
+    return _mapear(fn, registros, workers, chunksize, pool)
+
+def _mapear(fn: Callable[[Tuple[int, Registro]], T], registros: Iterable[Tuple[int, Registro]],
+            workers: Optional[int], chunksize: int, pool: str) -> Iterator[T]:
+    # map(fn, registros) no pool, em janelas, na ordem de entrada (também usado por simfin.carteira)
+    if pool not in POOLS:
+        raise ValueError(f"Pool inválido: {pool!r} (use {' ou '.join(POOLS)})")
+    if workers == 1:
+        yield from map(fn, registros)
+        return
+    workers = workers or os.cpu_count() or 1
+    with POOLS[pool](max_workers=workers) as ex:
+        janela = max(1, chunksize) * workers * 4
+        it = iter(registros)
+        while True:
+            bloco = list(islice(it, janela))
+            if not bloco:
+                break
+            yield from ex.map(fn, bloco, chunksize=max(1, chunksize))
@@ -0,0 +1,175 @@
+# src/simfin/bench.py
+"""
+Benchmarks de cargas representativas, com baseline em JSON.
+
+Cada carga é medida ``repeticoes`` vezes (guardamos o mínimo e a mediana do
+tempo) e uma vez sob tracemalloc para o pico de memória, que é medido à parte
+porque o rastreamento distorce o tempo. ``comparar`` aponta as cargas que
+ficaram mais lentas (tempo mínimo) ou mais pesadas (pico) que a baseline além
+do limite.
+"""
+from __future__ import annotations
+import io, json, os, platform, statistics, tempfile, time, tracemalloc
+from contextlib import redirect_stdout
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .models import EntradaPrazo, EntradaValor
+from .sac import simular_sac_por_prazo, simular_sac_por_valor
+from .consorcio import ConsorcioInput, Hipoteses, Lance, simular_consorcio
+from .cronograma import CAMPOS_CONSORCIO, Cronograma
+from . import centavos
+from .export import exportar_csv_consorcio
+
+VERSAO_BASELINE = 1
+LIMITE_PADRAO = 0.20        # 20% acima da baseline
+REPETICOES_PADRAO = 5
+
+def _entrada_sac(**kw) -> dict:
+    base = dict(valor_imovel=Decimal("250000"), entrada=Decimal("87500"), juros_anual=Decimal("0.0847"),
+                tr_anual=Decimal("0.01"), ipca_anual=Decimal("0.04"), encargos_fixos_mensais=Decimal("120"))
+    base.update(kw)
+    return base
+
+def _consorcio(prazo: int = 200) -> ConsorcioInput:
+    return ConsorcioInput(
+        administradora="Bench", grupo="1", cota="1", carta_credito_inicial=Decimal("300000"),
+        prazo_total_meses=prazo, correcao_anual=Decimal("0.05"), fundo_reserva_pct=Decimal(2),
+        seguro_mensal_valor=Decimal("45.90"), taxas_contemplacao_valor=Decimal(800),
+        parcela_reduzida=True, parcela_reduzida_pct=Decimal(70), parcela_reduzida_meses=12,
+        lance=Lance(percent_carta=Decimal(25)), mes_contemplacao_alvo=24,
+        hipoteses=Hipoteses(aluguel_mensal_enquanto_espera=Decimal(1800), taxa_desconto_anual=Decimal("0.10")),
+    )
+
+# Cada carga recebe um diretório temporário e devolve a função medida
+# (o preparo fica fora da medição)
+
+def _sac_prazo_360(_dir: str) -> Callable[[], object]:
+    e = EntradaPrazo(prazo=360, prazo_oficial=360, **_entrada_sac())
+    return lambda: simular_sac_por_prazo(e)
+
+def _sac_valor(_dir: str) -> Callable[[], object]:
+    e = EntradaValor(valor_maximo=Decimal("330000"), prazo_oficial=420, **_entrada_sac())
+    return lambda: simular_sac_por_valor(e)
+
+def _consorcio_200_lance(_dir: str) -> Callable[[], object]:
+    ci = _consorcio(200)
+    return lambda: simular_consorcio(ci)
+
+def _sac_prazo_360_centavos(_dir: str) -> Callable[[], object]:
+    e = EntradaPrazo(prazo=360, prazo_oficial=360, **_entrada_sac())
+    return lambda: centavos.simular_sac_por_prazo(e)
+
+def _sac_valor_centavos(_dir: str) -> Callable[[], object]:
+    e = EntradaValor(valor_maximo=Decimal("330000"), prazo_oficial=420, **_entrada_sac())
+    return lambda: centavos.simular_sac_por_valor(e)
+
+def _consorcio_200_lance_centavos(_dir: str) -> Callable[[], object]:
+    ci = _consorcio(200)
+    return lambda: centavos.simular_consorcio(ci)
+
+def _exportar_100k(d: str) -> Callable[[], object]:
+    meses = 100_000
+    linha = list(simular_consorcio(_consorcio(200)).parcelas.centavos("parcela"))
+    colunas = {c: [linha[i % len(linha)] for i in range(meses)] for c in CAMPOS_CONSORCIO}
+    colunas["mes"] = list(range(1, meses + 1))
+    cron = Cronograma.de_colunas(CAMPOS_CONSORCIO, colunas)
+    path = os.path.join(d, "parcelas.csv")
+    return lambda: exportar_csv_consorcio(cron, path)
+
+def _cli_comparacao(d: str) -> Callable[[], object]:
+    from .cli import main
+    path = os.path.join(d, "consorcio.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"administradora": "Bench", "grupo": "1", "cota": "1", "carta_credito_inicial": 250000,
+                   "prazo_total_meses": 180, "correcao_anual": 0.05, "fundo_reserva_pct": 2,
+                   "taxas_contemplacao_valor": 800, "lance": {"percent_carta": 25}, "mes_contemplacao_alvo": 3,
+                   "hipoteses": {"aluguel_mensal_enquanto_espera": 1800, "taxa_desconto_anual": 0.10}}, f)
+    argv = ["--tipo", "prazo", "--valor-imovel", "250000", "--entrada", "87500", "--juros-anual", "8.47",
+            "--juros-em-percent", "--prazo", "360", "--encargos", "120", "--consorcio-json", path,
+            "--csv", os.path.join(d, "fin.csv"), "--csv-consorcio", os.path.join(d, "cons.csv")]
+
+    def rodar():
+        with redirect_stdout(io.StringIO()):
+            main(argv)
+    return rodar
+
+CARGAS: Dict[str, Callable[[str], Callable[[], object]]] = {
+    "sac_prazo_360": _sac_prazo_360,
+    "sac_valor": _sac_valor,
+    "consorcio_200_lance": _consorcio_200_lance,
+    "sac_prazo_360_centavos": _sac_prazo_360_centavos,
+    "sac_valor_centavos": _sac_valor_centavos,
+    "consorcio_200_lance_centavos": _consorcio_200_lance_centavos,
+    "exportar_csv_100k": _exportar_100k,
+    "cli_comparacao": _cli_comparacao,
+}
+
+def medir(f: Callable[[], object], repeticoes: int = REPETICOES_PADRAO) -> Dict[str, float]:
+    f()     # aquecimento (caches de taxas, imports)
+    tempos = []
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        f()
+        tempos.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        f()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"tempo_s": min(tempos), "mediana_s": statistics.median(tempos), "pico_bytes": pico}
+
+def executar(nomes: Optional[Iterable[str]] = None, repeticoes: int = REPETICOES_PADRAO) -> Dict[str, object]:
+    nomes = list(nomes or CARGAS)
+    desconhecidas = [n for n in nomes if n not in CARGAS]
+    if desconhecidas:
+        raise ValueError(f"Cargas desconhecidas: {desconhecidas} (disponíveis: {', '.join(CARGAS)})")
+    with tempfile.TemporaryDirectory(prefix="simfin-bench-") as d:
+        cargas = {n: medir(CARGAS[n](d), repeticoes) for n in nomes}
+    return {
+        "versao": VERSAO_BASELINE,
+        "python": platform.python_version(),
+        "maquina": platform.machine(),
+        "repeticoes": repeticoes,
+        "cargas": cargas,
+    }
+
+def comparar(atual: Dict[str, object], baseline: Dict[str, object], limite: float = LIMITE_PADRAO) -> List[str]:
+    # Uma mensagem por regressão (tempo mínimo ou pico de memória acima de baseline * (1 + limite))
+    regressoes = []
+    base = baseline.get("cargas", {})
+    for nome, m in atual["cargas"].items():
+        b = base.get(nome)
+        if not b:
+            continue
+        for chave, rotulo in (("tempo_s", "tempo"), ("pico_bytes", "memória")):
+            if b.get(chave) and m[chave] > b[chave] * (1 + limite):
+                regressoes.append(f"{nome}: {rotulo} {m[chave] / b[chave] - 1:+.0%} "
+                                  f"({_fmt(chave, b[chave])} -> {_fmt(chave, m[chave])})")
+    return regressoes
+
+def _fmt(chave: str, v: float) -> str:
+    return f"{v * 1000:.2f} ms" if chave.endswith("_s") else f"{v / 1024:.0f} KiB"
+
+def carregar(path: str) -> Dict[str, object]:
+    with open(path, "r", encoding="utf-8") as f:
+        dados = json.load(f)
+    if dados.get("versao") != VERSAO_BASELINE:
+        raise ValueError(f"Baseline {path} com versão {dados.get('versao')!r}; esperado {VERSAO_BASELINE}")
+    return dados
+
+def salvar(resultado: Dict[str, object], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+def tabela(resultado: Dict[str, object], baseline: Optional[Dict[str, object]] = None) -> str:
+    linhas = [f"{'carga':<30}{'mín':>12}{'mediana':>12}{'pico':>12}{'vs base':>10}"]
+    base = (baseline or {}).get("cargas", {})
+    for nome, m in resultado["cargas"].items():
+        b = base.get(nome)
+        delta = f"{m['tempo_s'] / b['tempo_s'] - 1:+.0%}" if b and b.get("tempo_s") else "-"
+        linhas.append(f"{nome:<30}{_fmt('tempo_s', m['tempo_s']):>12}{_fmt('tempo_s', m['mediana_s']):>12}"
+                      f"{_fmt('pico_bytes', m['pico_bytes']):>12}{delta:>10}")
+    return "\n".join(linhas)
@@ -0,0 +1,216 @@
+# src/simfin/cache.py
+"""
+Cache persistente de resultados, endereçado pelo conteúdo da entrada.
+
+A chave é o SHA-256 do JSON canônico da entrada (dataclass com Decimals
+normalizados: 0.10 e 0.1 dão a mesma chave), do motor e de ``VERSAO_MOTOR``;
+entradas que usam séries do repositório incluem também o tamanho e o mtime
+do arquivo da série, então reimportar a série invalida os resultados.
+
+Os resultados ficam num SQLite (modo WAL, seguro para os processos do lote)
+como um cabeçalho JSON seguido das colunas inteiras do Cronograma, comprimido
+com zlib. Só as colunas calculadas são guardadas: um resultado de resumo
+(``colunas=("parcela",)``) atende pedidos de resumo, e um pedido com mais
+colunas recalcula e substitui a entrada. Acima de ``max_bytes`` os menos
+usados recentemente são descartados.
+"""
+from __future__ import annotations
+import dataclasses, hashlib, json, os, sqlite3, threading, time, zlib
+from array import array
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from .consorcio import ConsorcioInput, ConsorcioResultado
+from .cronograma import CAMPOS_CONSORCIO, CAMPOS_SAC, TIPO_ARRAY, Cronograma
+from .models import Resultado
+from .series import caminho_serie
+from . import perf
+
+VERSAO_MOTOR = 1            # incremente quando o cálculo mudar: invalida todas as entradas
+MAX_BYTES_PADRAO = 256 << 20
+ARQUIVO = "resultados.sqlite"
+
+ResultadoQualquer = Union[Resultado, ConsorcioResultado]
+
+def diretorio_cache() -> str:
+    return os.environ.get("SIMFIN_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".simfin", "cache")
+
+def _canonico(x: Any) -> Any:
+    if dataclasses.is_dataclass(x):
+        return {f.name: _canonico(getattr(x, f.name)) for f in dataclasses.fields(x)}
+    if isinstance(x, Decimal):
+        return str(x.normalize())
+    if isinstance(x, (list, tuple)):
+        return [_canonico(v) for v in x]
+    return x
+
+def _series(e: Any) -> Dict[str, Optional[Tuple[int, int]]]:
+    # (tamanho, mtime) de cada série referenciada; None se ainda não existe
+    nomes = [getattr(e, a, None) for a in ("tr_serie", "ipca_serie", "correcao_serie_nome")]
+    saida = {}
+    for nome in filter(None, nomes):
+        path = caminho_serie(nome)
+        try:
+            st = os.stat(path)
+            saida[path] = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            saida[path] = None
+    return saida
+
+def chave(e: Any, engine: str = "decimal") -> str:
+    dados = {"tipo": type(e).__name__, "entrada": _canonico(e), "engine": engine,
+             "versao": VERSAO_MOTOR, "series": _series(e)}
+    texto = json.dumps(dados, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+# --- serialização: cabeçalho JSON, "\0", colunas int64 na ordem de "campos"
+
+def _codificar(r: ResultadoQualquer) -> Tuple[bytes, Tuple[str, ...]]:
+    if isinstance(r, ConsorcioResultado):
+        cron = r.parcelas
+        escalares = {"total_pago": str(r.total_pago), "total_pago_liquido": str(r.total_pago_liquido),
+                     "mes_contemplacao": r.mes_contemplacao}
+    else:
+        cron = r.parcelas_detalhadas
+        escalares = {"valor_total_pago": str(r.valor_total_pago), "primeira_parcela": str(r.primeira_parcela),
+                     "ultima_parcela": str(r.ultima_parcela), "prazo_utilizado": r.prazo_utilizado}
+    campos = tuple(cron.campos)
+    topo = {"tipo": type(r).__name__, "escalares": escalares, "campos": campos, "n": cron.meses}
+    partes = [json.dumps(topo, separators=(",", ":")).encode("utf-8"), b"\0"]
+    for c in campos:
+        col = cron.centavos(c)
+        partes.append((col if isinstance(col, array) else array(TIPO_ARRAY, col)).tobytes())
+    return zlib.compress(b"".join(partes), 1), campos
+
+def _decodificar(blob: bytes) -> ResultadoQualquer:
+    dados = zlib.decompress(blob)
+    fim = dados.index(b"\0")
+    topo = json.loads(dados[:fim])
+    n, campos, esc = topo["n"], topo["campos"], topo["escalares"]
+    colunas, pos = {}, fim + 1
+    for c in campos:
+        col = array(TIPO_ARRAY)
+        col.frombytes(dados[pos:pos + n * col.itemsize])
+        pos += n * col.itemsize
+        colunas[c] = col
+    if topo["tipo"] == "ConsorcioResultado":
+        cron = Cronograma.de_colunas(CAMPOS_CONSORCIO, colunas, n)
+        return ConsorcioResultado(parcelas=cron, total_pago=Decimal(esc["total_pago"]),
+                                  total_pago_liquido=Decimal(esc["total_pago_liquido"]),
+                                  mes_contemplacao=esc["mes_contemplacao"])
+    cron = Cronograma.de_colunas(CAMPOS_SAC, colunas, n)
+    return Resultado(valor_total_pago=Decimal(esc["valor_total_pago"]),
+                     primeira_parcela=Decimal(esc["primeira_parcela"]),
+                     ultima_parcela=Decimal(esc["ultima_parcela"]),
+                     prazo_utilizado=esc["prazo_utilizado"], parcelas_detalhadas=cron)
+
+class CacheResultados:
+    """
+    ``obter(e, engine, colunas)`` devolve o resultado guardado ou None;
+    ``guardar(e, engine, r)`` grava. ``colunas=None`` pede o cronograma
+    completo. Com ``somente_resumo`` só a coluna de parcelas é gravada.
+    """
+    def __init__(self, diretorio: Optional[str] = None, max_bytes: int = MAX_BYTES_PADRAO,
+                 somente_resumo: bool = False):
+        self.diretorio = diretorio or diretorio_cache()
+        self.max_bytes = max_bytes
+        self.somente_resumo = somente_resumo
+        os.makedirs(self.diretorio, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(self.diretorio, ARQUIVO), timeout=30, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS resultados (
+                chave TEXT PRIMARY KEY, campos TEXT NOT NULL, dados BLOB NOT NULL,
+                tamanho INTEGER NOT NULL, acesso REAL NOT NULL);
+            CREATE INDEX IF NOT EXISTS resultados_acesso ON resultados (acesso);
+            CREATE TABLE IF NOT EXISTS contadores (nome TEXT PRIMARY KEY, valor INTEGER NOT NULL);
+        """)
+        self.acertos = self.faltas = 0
+
+    def _contar(self, nome: str) -> None:
+        self._db.execute("INSERT INTO contadores VALUES (?, 1) "
+                         "ON CONFLICT (nome) DO UPDATE SET valor = valor + 1", (nome,))
+
+    def obter(self, e: Any, engine: str = "decimal",
+              colunas: Optional[Iterable[str]] = None) -> Optional[ResultadoQualquer]:
+        k = chave(e, engine)
+        linha = self._db.execute("SELECT campos, dados FROM resultados WHERE chave = ?", (k,)).fetchone()
+        todos = CAMPOS_CONSORCIO if isinstance(e, ConsorcioInput) else CAMPOS_SAC
+        pedidos = set(todos if colunas is None else colunas)
+        if linha is None or not pedidos <= set(linha[0].split(",")) - {""}:
+            self.faltas += 1
+            self._contar("faltas")
+            perf.contar("cache.faltas")
+            return None
+        self._db.execute("UPDATE resultados SET acesso = ? WHERE chave = ?", (time.time(), k))
+        self.acertos += 1
+        self._contar("acertos")
+        perf.contar("cache.acertos")
+        return _decodificar(linha[1])
+
+    def guardar(self, e: Any, engine: str, r: ResultadoQualquer) -> None:
+        if self.somente_resumo:
+            r = _resumir(r)
+        blob, campos = _codificar(r)
+        self._db.execute("INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?, ?)",
+                         (chave(e, engine), ",".join(campos), blob, len(blob), time.time()))
+        self._despejar()
+
+    def _despejar(self) -> None:
+        # LRU por tamanho: remove os acessos mais antigos até caber em max_bytes
+        total = self._db.execute("SELECT COALESCE(SUM(tamanho), 0) FROM resultados").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        removidos = 0
+        for k, tamanho in self._db.execute("SELECT chave, tamanho FROM resultados ORDER BY acesso").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM resultados WHERE chave = ?", (k,))
+            total -= tamanho
+            removidos += 1
+        self._db.execute("INSERT INTO contadores VALUES ('despejos', ?) "
+                         "ON CONFLICT (nome) DO UPDATE SET valor = valor + ?", (removidos, removidos))
+
+    def estatisticas(self) -> Dict[str, Any]:
+        # Acumuladas no arquivo (todas as execuções e processos)
+        n, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM resultados").fetchone()
+        cont = dict(self._db.execute("SELECT nome, valor FROM contadores").fetchall())
+        acertos, faltas = cont.get("acertos", 0), cont.get("faltas", 0)
+        return {"diretorio": self.diretorio, "entradas": n, "bytes": total, "max_bytes": self.max_bytes,
+                "acertos": acertos, "faltas": faltas, "despejos": cont.get("despejos", 0),
+                "taxa_acerto": acertos / (acertos + faltas) if acertos + faltas else 0.0}
+
+    def limpar(self) -> None:
+        self._db.execute("DELETE FROM resultados")
+        self._db.execute("DELETE FROM contadores")
+        self._db.execute("VACUUM")
+
+    def fechar(self) -> None:
+        self._db.close()
+
+def _resumir(r: ResultadoQualquer) -> ResultadoQualquer:
+    cron = r.parcelas if isinstance(r, ConsorcioResultado) else r.parcelas_detalhadas
+    if "parcela" not in cron.campos:
+        return r
+    campos = CAMPOS_CONSORCIO if isinstance(r, ConsorcioResultado) else CAMPOS_SAC
+    resumo = Cronograma.de_colunas(campos, {"parcela": cron.centavos("parcela")})
+    return dataclasses.replace(r, **{"parcelas" if isinstance(r, ConsorcioResultado) else "parcelas_detalhadas": resumo})
+
+_abertos = threading.local()
+_herdados: list = []
+
+def abrir(diretorio: Optional[str] = None, max_bytes: int = MAX_BYTES_PADRAO) -> CacheResultados:
+    # Uma conexão por diretório, processo e thread (sqlite3 não compartilha conexões
+    # entre threads); os workers do lote reaproveitam a sua. Um processo filho de
+    # fork herda o dict do pai: as conexões herdadas não podem ser usadas (nem
+    # fechadas) no filho, então ficam guardadas e o filho abre as suas.
+    if getattr(_abertos, "pid", None) != os.getpid():
+        if getattr(_abertos, "caches", None):
+            _herdados.append(_abertos.caches)
+        _abertos.caches, _abertos.pid = {}, os.getpid()
+    abertos = _abertos.caches
+    c = abertos.get((diretorio, max_bytes))
+    if c is None:
+        c = abertos[(diretorio, max_bytes)] = CacheResultados(diretorio, max_bytes)
+    return c
@@ -0,0 +1,157 @@
+# src/simfin/carteira.py
+"""
+Fluxo de caixa agregado de uma carteira de contratos (SAC e consórcio).
+
+Cada contrato é uma linha no formato do lote (``simfin.batch``), mais o mês
+da primeira parcela em ``inicio`` (AAAA-MM; padrão: ``serie_inicio`` ou
+``correcao_serie_inicio``). Os cronogramas são montados no pool do lote e
+somados, na ordem em que ficam prontos, num agregado por mês de calendário:
+cada worker devolve só as colunas dos componentes em centavos, e o agregado
+é o único estado que cresce com a carteira (não com o número de contratos).
+
+Componentes: juros, amortização (no consórcio, a contribuição ao fundo
+comum), taxa_adm, fundo_reserva, seguro e "outros" (o resto da parcela:
+encargos do SAC; taxas pontuais, aluguel e lance do consórcio). A devolução
+do fundo de reserva no fim do grupo não entra: o motor não a aloca num mês.
+"""
+from __future__ import annotations
+import csv, json
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional, TextIO, Tuple
+
+from .batch import CHUNKSIZE_PADRAO, Registro, _mapear, simular_entrada
+from .consorcio import ConsorcioInput
+from .contexto import contexto
+from .cronograma import Cronograma, de_centavos
+from .leitura import entrada_de_dict
+from .series import formatar_mes, indice_mes
+from .valuation import vpl as _vpl
+from . import perf
+
+COMPONENTES = ["juros", "amortizacao", "taxa_adm", "fundo_reserva", "seguro", "outros"]
+CAMPOS_CARTEIRA = ["mes", "parcela"] + COMPONENTES
+# Coluna do motor -> componente
+_ORIGEM = {"sac": {"juros": "juros", "amortizacao": "amortizacao"},
+           "consorcio": {"contribuicao_base": "amortizacao", "taxa_adm": "taxa_adm",
+                         "fundo_reserva": "fundo_reserva", "seguro": "seguro"}}
+
+Fluxos = Tuple[int, Optional[int], Any]     # (linha, mês de início ou None, colunas ou mensagem de erro)
+
+@dataclass
+class ResultadoCarteira:
+    inicio: Optional[str]                # mês de calendário da linha 1 de ``fluxos`` (AAAA-MM)
+    fluxos: Cronograma                   # um mês por linha, mes = 1, 2, ... a partir de ``inicio``
+    contratos: int
+    erros: List[Dict[str, Any]] = field(default_factory=list)
+    vpl: Optional[Decimal] = None        # descontado ao mês anterior a ``inicio``
+
+def totais(r: ResultadoCarteira) -> Dict[str, Decimal]:
+    # Soma de cada coluna (parcela e componentes) no horizonte inteiro
+    return {c: de_centavos(sum(r.fluxos.centavos(c))) for c in CAMPOS_CARTEIRA[1:]}
+
+def _colunas_contrato(dados: Dict[str, Any], engine: str) -> Tuple[int, Dict[str, List[int]]]:
+    inicio = dados.get("inicio") or dados.get("serie_inicio") or dados.get("correcao_serie_inicio")
+    if not inicio:
+        raise ValueError("Contrato sem mês de início (campo inicio, AAAA-MM)")
+    if not isinstance(inicio, (str, date)):
+        # Um inteiro iria direto como índice de mês (ano*12 + mês) e jogaria o contrato milênios à frente
+        raise ValueError(f"Mês de início inválido: {inicio!r} (use AAAA-MM)")
+    mes_inicio = indice_mes(inicio)
+    e = entrada_de_dict(dados)
+    tipo = "consorcio" if isinstance(e, ConsorcioInput) else "sac"
+    origem = _ORIGEM[tipo]
+    r = simular_entrada(e, engine, colunas=["parcela", *origem])
+    cron = r.parcelas if tipo == "consorcio" else r.parcelas_detalhadas
+    parcela = list(cron.centavos("parcela"))
+    if not parcela:
+        raise ValueError("Contrato sem parcelas (prazo vazio)")
+    colunas = {"parcela": parcela}
+    outros = parcela[:]
+    for campo, comp in origem.items():
+        col = list(cron.centavos(campo))
+        if any(col):
+            colunas[comp] = col
+            outros = [o - c for o, c in zip(outros, col)]
+    if any(outros):
+        colunas["outros"] = outros
+    return mes_inicio, colunas
+
+def _fluxos(item: Tuple[int, Registro], engine: str = "decimal") -> Fluxos:
+    # Roda no worker; só as colunas em centavos voltam ao processo principal
+    linha, registro = item
+    try:
+        dados = json.loads(registro) if isinstance(registro, str) else dict(registro)
+        if not isinstance(dados, dict):
+            raise ValueError("Registro deve ser um objeto JSON")
+        inicio, colunas = _colunas_contrato(dados, engine)
+        return linha, inicio, colunas
+    except Exception as exc:     # como no lote: a falha fica no contrato, a carteira segue
+        return linha, None, f"{type(exc).__name__}: {exc}"
+
+class _Agregado:
+    # Colunas em centavos indexadas por mês de calendário a partir de ``base``
+    def __init__(self):
+        self.base: Optional[int] = None
+        self.colunas: Dict[str, List[int]] = {c: [] for c in CAMPOS_CARTEIRA[1:]}
+
+    def somar(self, inicio: int, colunas: Dict[str, List[int]]) -> None:
+        if self.base is None:
+            self.base = inicio
+        elif inicio < self.base:
+            for c, col in self.colunas.items():
+                col[:0] = [0] * (self.base - inicio)
+            self.base = inicio
+        ini = inicio - self.base
+        fim = ini + len(colunas["parcela"])
+        for c, valores in colunas.items():
+            col = self.colunas[c]
+            if len(col) < fim:
+                col.extend([0] * (fim - len(col)))
+            for i, v in enumerate(valores, start=ini):
+                col[i] += v
+
+    def cronograma(self) -> Cronograma:
+        n = max(map(len, self.colunas.values()))
+        colunas = {c: col + [0] * (n - len(col)) for c, col in self.colunas.items()}
+        colunas["mes"] = list(range(1, n + 1))
+        return Cronograma.de_colunas(CAMPOS_CARTEIRA, colunas)
+
+def agregar_carteira(registros: Iterable[Tuple[int, Registro]], taxa_desconto_anual: Optional[Decimal] = None,
+                     engine: str = "decimal", workers: Optional[int] = None,
+                     chunksize: int = CHUNKSIZE_PADRAO, pool: str = "processos") -> ResultadoCarteira:
+    """
+    Simula cada contrato (linha, dict ou texto JSON, como em ``batch.ler_lote``)
+    e soma os fluxos por mês de calendário. Linhas com erro vão para ``erros``
+    e não interrompem a carteira. Com taxa de desconto, ``vpl`` é o VPL do
+    fluxo agregado.
+    """
+    agregado = _Agregado()
+    erros: List[Dict[str, Any]] = []
+    contratos = 0
+    with perf.fase("carteira"):
+        for linha, inicio, colunas in _mapear(partial(_fluxos, engine=engine), registros, workers, chunksize, pool):
+            if inicio is None:
+                erros.append({"linha": linha, "erro": colunas})
+                continue
+            with perf.fase("carteira.somar"):
+                agregado.somar(inicio, colunas)
+            contratos += 1
+        perf.contar("carteira.contratos", contratos)
+        fluxos = agregado.cronograma()
+        with contexto():
+            valor = _vpl(fluxos, taxa_desconto_anual).quantize(Decimal("0.01")) if taxa_desconto_anual else None
+    return ResultadoCarteira(
+        inicio=formatar_mes(agregado.base) if agregado.base is not None else None,
+        fluxos=fluxos, contratos=contratos, erros=erros, vpl=valor,
+    )
+
+def escrever_csv(r: ResultadoCarteira, f: TextIO) -> None:
+    # Uma linha por mês de calendário: competencia (AAAA-MM), parcela e componentes
+    w = csv.writer(f)
+    w.writerow(["competencia"] + CAMPOS_CARTEIRA[1:])
+    base = indice_mes(r.inicio) if r.inicio else 0
+    for i, linha in enumerate(r.fluxos):
+        w.writerow([formatar_mes(base + i)] + [str(linha[c]) for c in CAMPOS_CARTEIRA[1:]])
@@ -0,0 +1,355 @@
+# src/simfin/centavos.py
+"""
+Motor de ponto fixo em inteiros para SAC e consórcio.
+
+Dinheiro vira inteiro em centavos escalados por ``UM`` (2**64) e taxas,
+inteiros escalados pelo mesmo ``UM``: o laço mensal só faz somas, comparações,
+produtos e deslocamentos de inteiros, com o produto reescalado por
+arredondamento (erro de até 2**-65 centavo). O arredondamento a centavos é
+explícito: ``(x + MEIO) >> BITS``, o ROUND_HALF_UP de ``para_centavos``.
+
+As constantes de cada simulação (taxa mensal, fatores de correção, parcelas
+fixas) são calculadas uma vez em Decimal, como no motor exato, e convertidas
+sem perda. O erro acumulado no laço fica muitas ordens abaixo de ``FOLGA``;
+um valor a menos de ``FOLGA`` do meio centavo (empates exatos, como saldos em
+,xx5) é decidido pelo arredondamento a 28 dígitos do motor Decimal, que é
+avançado sob demanda até aquele mês (contador ``centavos.desempates``). Assim
+os cronogramas são sempre os do motor Decimal. Seleção: ``engine="centavos"``
+em ``batch.simular_entrada`` ou ``--engine centavos`` na CLI.
+"""
+from __future__ import annotations
+from decimal import Decimal
+from itertools import repeat
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .models import Resultado, EntradaPrazo, EntradaValor
+from .contexto import contexto, em_contexto
+from .cronograma import CAMPOS_SAC, CAMPOS_CONSORCIO, Cronograma, de_centavos, para_centavos
+from .indices import taxa_mensal
+from .consorcio import (ConsorcioInput, ConsorcioResultado, _fr_total, _mes_contemplacao, _q2,
+                        _serie_correcao_mensal)
+from . import sac as _sac
+from . import consorcio as _consorcio
+from . import perf
+
+BITS = 64
+UM = 1 << BITS
+MEIO = UM >> 1
+_MASCARA = UM - 1
+FOLGA = UM // 10 ** 6        # 1e-6 centavo: bem acima do erro acumulado dos dois motores
+_FAIXA = 2 * FOLGA
+
+class _Desempate:
+    # Linhas do motor Decimal sob demanda (só avança), para os valores a menos de
+    # FOLGA do meio centavo: ali quem decide é o arredondamento a 28 dígitos dele.
+    # Sem ``converter``, as linhas já vêm em centavos; com ele, em Decimal
+    __slots__ = ("_fabrica", "_converter", "_passos", "_linha")
+
+    def __init__(self, fabrica: Callable[[], Iterator[tuple]], converter: Optional[Callable] = None):
+        self._fabrica = fabrica
+        self._converter = converter
+        self._passos: Optional[Iterator[tuple]] = None
+        self._linha: tuple = (0,)
+
+    def __call__(self, mes: int, pos: int) -> int:
+        perf.contar("centavos.desempates")
+        if self._passos is None:
+            self._passos = self._fabrica()
+        while self._linha[0] < mes:
+            self._linha = next(self._passos)
+        if self._converter is None:
+            return self._linha[pos]
+        with contexto():
+            return self._converter(self._linha[pos])
+
+def _escalar(v: Decimal, fator: int) -> int:
+    # round(v * fator * UM), exato (sem passar pelo contexto Decimal)
+    n, d = v.as_integer_ratio()
+    return (2 * n * fator * UM + d) // (2 * d)
+
+def taxa(v: Decimal) -> int:
+    return _escalar(v, 1)
+
+def dinheiro(v: Decimal) -> int:
+    return _escalar(v, 100)
+
+def _decidir(t: int, desempate: _Desempate, mes: int, pos: int) -> int:
+    # t = valor + MEIO; fora da FOLGA, (valor + MEIO) >> BITS é o ROUND_HALF_UP a centavos
+    if ((t + FOLGA) & _MASCARA) < _FAIXA:
+        return desempate(mes, pos)
+    return t >> BITS
+
+def _div(x: int, n: int) -> int:
+    return (2 * x + n) // (2 * n)
+
+def _cronograma(campos: List[str], colunas: Optional[Iterable[str]], valores: Dict[str, Sequence[int]],
+                n: int) -> Cronograma:
+    manter = Cronograma(campos, colunas).campos       # valida os nomes pedidos
+    return Cronograma.de_colunas(campos, {c: valores[c] for c in manter}, n)
+
+# --- SAC ---
+
+FatoresFixos = Union[int, Sequence[int]]
+
+def _fatores_fixos(e: Union[EntradaPrazo, EntradaValor], meses: int) -> FatoresFixos:
+    with contexto():
+        f = _sac._fatores(e, meses)
+    return taxa(f) if isinstance(f, Decimal) else [taxa(x) for x in f]
+
+def _constantes_sac(e: Union[EntradaPrazo, EntradaValor]) -> Tuple[int, int, int]:
+    with contexto():
+        return (dinheiro(e.valor_imovel - e.entrada), taxa(taxa_mensal(e.juros_anual)),
+                dinheiro(e.encargos_fixos_mensais))
+
+def _desempate_sac(e: Union[EntradaPrazo, EntradaValor], prazo: int) -> _Desempate:
+    # O laço Decimal do SAC sem arredondar é barato; só o valor pedido vira centavos
+    def passos():
+        with contexto():
+            args = (e.valor_imovel - e.entrada, taxa_mensal(e.juros_anual), _sac._fatores(e, prazo),
+                    e.encargos_fixos_mensais, prazo)
+        return em_contexto(_sac._passos_sac(*args))
+    return _Desempate(passos, para_centavos)
+
+def _amortizacao_centavos(e: Union[EntradaPrazo, EntradaValor], prazo: int) -> int:
+    # Cota constante em centavos, arredondada a partir do mesmo Decimal do motor exato
+    with contexto():
+        return para_centavos((e.valor_imovel - e.entrada) / Decimal(prazo))
+
+def _meses_sac(valor_financiado: int, juros_m: int, fatores: FatoresFixos, encargos: int, prazo: int,
+               amortizacao_c: int, desempate: _Desempate) -> Tuple[List[int], List[int], List[int], List[int]]:
+    # Mesmo laço de sac._passos_sac; devolve as colunas em centavos
+    # (parcela, juros, amortizacao, saldo_devedor)
+    fs = repeat(fatores, prazo) if isinstance(fatores, int) else fatores[:prazo]
+    amortizacao = _div(valor_financiado, prazo)
+    parcelas: List[int] = []
+    juros_l: List[int] = []
+    amorts: List[int] = []
+    saldos: List[int] = []
+    saldo = valor_financiado
+    for mes, fator in enumerate(fs, 1):
+        saldo_corrigido = (saldo * fator + MEIO) >> BITS
+        juros = (saldo_corrigido * juros_m + MEIO) >> BITS
+        if saldo_corrigido > amortizacao:
+            amort, amort_c = amortizacao, amortizacao_c
+        else:
+            amort = saldo_corrigido
+            amort_c = _decidir(amort + MEIO, desempate, mes, 3)
+        saldo = saldo_corrigido - amort
+        p = amort + juros + encargos + MEIO
+        j = juros + MEIO
+        s = saldo + MEIO
+        if (((p + FOLGA) & _MASCARA) < _FAIXA or ((j + FOLGA) & _MASCARA) < _FAIXA
+                or ((s + FOLGA) & _MASCARA) < _FAIXA):
+            parcelas.append(_decidir(p, desempate, mes, 1))
+            juros_l.append(_decidir(j, desempate, mes, 2))
+            saldos.append(_decidir(s, desempate, mes, 4))
+        else:
+            parcelas.append(p >> BITS)
+            juros_l.append(j >> BITS)
+            saldos.append(s >> BITS)
+        amorts.append(amort_c)
+    return parcelas, juros_l, amorts, saldos
+
+def _total_sac(valor_financiado: int, juros_m: int, fatores: FatoresFixos, encargos: int, prazo: int,
+               desempate: _Desempate) -> int:
+    # Só a soma das parcelas em centavos (busca por valor)
+    fs = repeat(fatores, prazo) if isinstance(fatores, int) else fatores[:prazo]
+    amortizacao = _div(valor_financiado, prazo)
+    total = 0
+    saldo = valor_financiado
+    for mes, fator in enumerate(fs, 1):
+        saldo_corrigido = (saldo * fator + MEIO) >> BITS
+        amort = amortizacao if saldo_corrigido > amortizacao else saldo_corrigido
+        p = amort + ((saldo_corrigido * juros_m + MEIO) >> BITS) + encargos + MEIO
+        if ((p + FOLGA) & _MASCARA) < _FAIXA:
+            total += desempate(mes, 1)
+        else:
+            total += p >> BITS
+        saldo = saldo_corrigido - amort
+    return total
+
+def simular_sac_por_prazo(e: EntradaPrazo, colunas: Optional[Iterable[str]] = None) -> Resultado:
+    # Mesmo contrato (e resultado) de sac.simular_sac_por_prazo
+    _sac._validar_prazo(e)
+    valor, juros_m, encargos = _constantes_sac(e)
+    fatores = _fatores_fixos(e, e.prazo)
+    with perf.fase("centavos.sac.meses"):
+        parcelas, juros, amorts, saldos = _meses_sac(valor, juros_m, fatores, encargos, e.prazo,
+                                                     _amortizacao_centavos(e, e.prazo), _desempate_sac(e, e.prazo))
+    perf.contar("cronogramas")
+    perf.contar("meses_simulados", e.prazo)
+
+    valores = {"mes": range(1, e.prazo + 1), "parcela": parcelas, "juros": juros,
+               "amortizacao": amorts, "saldo_devedor": saldos}
+    return Resultado(
+        valor_total_pago=de_centavos(sum(parcelas)),
+        primeira_parcela=de_centavos(parcelas[0]),
+        ultima_parcela=de_centavos(parcelas[-1]),
+        prazo_utilizado=e.prazo,
+        parcelas_detalhadas=_cronograma(CAMPOS_SAC, colunas, valores, e.prazo),
+    )
+
+def _simular_sac_por_valor_linear(e: EntradaValor, colunas: Optional[Iterable[str]]) -> Resultado:
+    melhor: Optional[Resultado] = None
+    for prazo in range(_sac.PRAZO_MINIMO_BUSCA, e.prazo_oficial + 1):
+        r = simular_sac_por_prazo(_sac._entrada_prazo(e, prazo), colunas=())
+        if r.valor_total_pago <= e.valor_maximo:
+            melhor = r
+    prazo = melhor.prazo_utilizado if melhor is not None else _sac.PRAZO_MINIMO_BUSCA
+    return simular_sac_por_prazo(_sac._entrada_prazo(e, prazo), colunas)
+
+def simular_sac_por_valor(e: EntradaValor, colunas: Optional[Iterable[str]] = None) -> Resultado:
+    # Mesma busca de sac.simular_sac_por_valor (bisseção quando o total é monotônico)
+    with perf.fase("centavos.sac.busca_valor"):
+        if e.prazo_oficial < _sac.PRAZO_MINIMO_BUSCA:
+            return _simular_sac_por_valor_linear(e, colunas)
+        with contexto():
+            fatores_dec = _sac._fatores(e, e.prazo_oficial)
+            monotono = _sac._total_monotono(e, taxa_mensal(e.juros_anual), fatores_dec)
+        if not monotono:
+            return _simular_sac_por_valor_linear(e, colunas)
+        fatores = taxa(fatores_dec) if isinstance(fatores_dec, Decimal) else [taxa(f) for f in fatores_dec]
+        valor, juros_m, encargos = _constantes_sac(e)
+
+        def cabe(prazo: int) -> bool:
+            perf.contar("sac.totais_busca")
+            perf.contar("meses_simulados", prazo)
+            total = _total_sac(valor, juros_m, fatores, encargos, prazo, _desempate_sac(e, prazo))
+            return de_centavos(total) <= e.valor_maximo
+
+        lo, hi = _sac.PRAZO_MINIMO_BUSCA, e.prazo_oficial
+        if not cabe(lo):
+            return simular_sac_por_prazo(_sac._entrada_prazo(e, lo), colunas)
+        while lo < hi:
+            meio = (lo + hi + 1) // 2
+            if cabe(meio):
+                lo = meio
+            else:
+                hi = meio - 1
+        return simular_sac_por_prazo(_sac._entrada_prazo(e, lo), colunas)
+
+# --- Consórcio ---
+
+_POS = {c: i for i, c in enumerate(CAMPOS_CONSORCIO)}
+
+def _fatores_consorcio(ci: ConsorcioInput) -> List[int]:
+    # fator = 1 + idx de cada mês, somado em Decimal como no motor exato
+    series = _serie_correcao_mensal(ci)
+    memo: Dict[Decimal, int] = {}
+    fatores = []
+    um = Decimal(1)
+    for mes in range(ci.prazo_total_meses):
+        idx = series[mes] if mes < len(series) else series[-1]
+        f = memo.get(idx)
+        if f is None:
+            f = memo[idx] = taxa(um + idx)
+        fatores.append(f)
+    return fatores
+
+def _cartas_decimal(ci: ConsorcioInput) -> Iterator[Tuple[int, Decimal]]:
+    # Só a cadeia da carta do motor Decimal (carta *= 1 + idx), sem arredondar
+    series = _serie_correcao_mensal(ci)
+    carta = ci.carta_credito_inicial
+    for mes in range(1, ci.prazo_total_meses + 1):
+        idx = series[mes-1] if mes-1 < len(series) else series[-1]
+        carta = carta * (Decimal(1) + idx)
+        yield mes, carta
+
+def _meses_consorcio(ci: ConsorcioInput) -> Dict[str, Sequence[int]]:
+    # Mesmo laço de consorcio._passos_consorcio; devolve as colunas em centavos
+    n = ci.prazo_total_meses
+    cem = Decimal(100)
+    with contexto():
+        adm_d = (ci.taxa_adm_total_pct / cem) * ci.carta_credito_inicial / Decimal(n)
+        fr_d = _fr_total(ci) / Decimal(n)
+        base_inicial = dinheiro(ci.carta_credito_inicial / Decimal(n))
+        reduzida = taxa(ci.parcela_reduzida_pct / cem)
+        lance_pct = taxa(ci.lance.percent_carta / cem) if ci.lance and ci.lance.fonte == "proprio" else None
+        fatores = _fatores_consorcio(ci)
+        # Valores constantes: centavos direto do Decimal do motor exato
+        adm_c, fr_c = para_centavos(adm_d), para_centavos(fr_d)
+        seguro_c = para_centavos(ci.seguro_mensal_valor)
+        aluguel_c = para_centavos(ci.hipoteses.aluguel_mensal_enquanto_espera)
+    adesao = dinheiro(ci.taxa_adesao_valor)
+    taxa_contemplacao = dinheiro(ci.taxas_contemplacao_valor)
+    aluguel_espera = dinheiro(ci.hipoteses.aluguel_mensal_enquanto_espera)
+    carta = dinheiro(ci.carta_credito_inicial)
+    fixas = dinheiro(adm_d) + dinheiro(fr_d) + dinheiro(ci.seguro_mensal_valor)
+
+    desempate = _Desempate(lambda: _consorcio._centavos_consorcio(ci))
+    desempate_carta = _Desempate(lambda: em_contexto(_cartas_decimal(ci)), para_centavos)
+    meses_reduzidos = ci.parcela_reduzida_meses if ci.parcela_reduzida else 0
+    mes_contemplacao = _mes_contemplacao(ci)
+    saldo = carta
+    reducao = 0
+
+    cartas: List[int] = []
+    contribs: List[int] = []
+    parcelas: List[int] = []
+    saldos: List[int] = []
+    pontuais_l = [0] * n
+    lances = [0] * n
+    for mes, fator in zip(range(1, n + 1), fatores):
+        carta = (carta * fator + MEIO) >> BITS
+        base = (base_inicial * fator + MEIO) >> BITS
+        if mes <= meses_reduzidos:
+            base = (base * reduzida + MEIO) >> BITS
+        if reducao > 0 and mes > mes_contemplacao:
+            base = base - reducao if base > reducao else 0
+
+        pontuais = lance = 0
+        if mes == 1 or mes == mes_contemplacao:
+            if mes == 1:
+                pontuais += adesao
+            if mes == mes_contemplacao:
+                pontuais += taxa_contemplacao
+                if lance_pct is not None:
+                    lance = (lance_pct * carta + MEIO) >> BITS
+                    saldo = saldo - lance if saldo > lance else 0
+                    reducao = _div(lance, max(1, n - mes))
+                    lances[mes-1] = _decidir(lance + MEIO, desempate, mes, _POS["lance"])
+            pontuais_l[mes-1] = _decidir(pontuais + MEIO, desempate, mes, _POS["taxas_pontuais"])
+        aluguel = aluguel_espera if mes < mes_contemplacao else 0
+
+        contrib = base if base < saldo else saldo
+        saldo = saldo - contrib if saldo > contrib else 0
+        parcela = contrib + fixas + pontuais + aluguel + lance
+
+        c = carta + MEIO
+        b = contrib + MEIO
+        p = parcela + MEIO
+        s = saldo + MEIO
+        if (((c + FOLGA) & _MASCARA) < _FAIXA or ((b + FOLGA) & _MASCARA) < _FAIXA
+                or ((p + FOLGA) & _MASCARA) < _FAIXA or ((s + FOLGA) & _MASCARA) < _FAIXA):
+            cartas.append(_decidir(c, desempate_carta, mes, 1))
+            contribs.append(_decidir(b, desempate, mes, _POS["contribuicao_base"]))
+            parcelas.append(_decidir(p, desempate, mes, _POS["parcela"]))
+            saldos.append(_decidir(s, desempate, mes, _POS["saldo_a_contribuir"]))
+        else:
+            cartas.append(c >> BITS)
+            contribs.append(b >> BITS)
+            parcelas.append(p >> BITS)
+            saldos.append(s >> BITS)
+
+    espera = min(mes_contemplacao - 1, n)
+    return {"mes": range(1, n + 1), "carta_atualizada": cartas, "contribuicao_base": contribs,
+            "taxa_adm": [adm_c] * n, "fundo_reserva": [fr_c] * n, "seguro": [seguro_c] * n,
+            "taxas_pontuais": pontuais_l, "aluguel": [aluguel_c] * espera + [0] * (n - espera),
+            "lance": lances, "parcela": parcelas, "saldo_a_contribuir": saldos}
+
+def simular_consorcio(ci: ConsorcioInput, colunas: Optional[Iterable[str]] = None) -> ConsorcioResultado:
+    # Mesmo contrato (e resultado) de consorcio.simular_consorcio
+    with perf.fase("centavos.consorcio.meses"):
+        valores = _meses_consorcio(ci)
+    n = ci.prazo_total_meses
+    perf.contar("cronogramas")
+    perf.contar("meses_simulados", n)
+
+    with contexto():
+        total = de_centavos(sum(valores["parcela"]))
+        return ConsorcioResultado(
+            parcelas=_cronograma(CAMPOS_CONSORCIO, colunas, valores, n),
+            total_pago=_q2(total),
+            total_pago_liquido=_q2(total - _fr_total(ci)),
+            mes_contemplacao=_mes_contemplacao(ci),
+        )
@@ -1,36 +1,53 @@
 # src/simfin/cli.py
 from __future__ import annotations
-import argparse, json, csv
+import argparse, cProfile, json, os, sys
 from decimal import Decimal
 
 from .models import EntradaPrazo, EntradaValor
 from .sac import simular_sac_por_prazo, simular_sac_por_valor
-from .export import exportar_csv
-from .consorcio import ConsorcioInput, Hipoteses, Lance, simular_consorcio
-from .indices import taxa_mensal
+from .export import CAMPOS_CSV_CONSORCIO, exportar
+from .cronograma import CAMPOS_SAC
+from .valuation import cet, vpl_lote
+from . import perf
+from .leitura import _D, _as_rate, consorcio_de_dict
+from .batch import CHUNKSIZE_PADRAO, ler_lote, simular_entrada, simular_lote
+from .cache import MAX_BYTES_PADRAO, CacheResultados, abrir as abrir_cache
 
+# Formato gravado por export.exportar -> nome nas mensagens
+_NOME_FORMATO = {"csv": "CSV", "colunar": "Cronograma colunar (.sfc)"}
 
 def _as_decimal(v: str) -> Decimal:
     v = v.replace(",", ".").strip()
     return Decimal(v)
 
-def _D(x):
-    if x is None:
-        return Decimal(0)
-    if isinstance(x, (int, float)):
-        return Decimal(str(x))
-    return Decimal(str(x).replace(",", ".").strip())
-
-def _as_rate(v: Decimal) -> Decimal:
-    """
-    Normaliza taxa anual:
-      - Se v >= 1, assume que veio em porcentagem (ex.: 10 -> 0.10).
-      - Se v  < 1, assume que já está em fração (ex.: 0.10 -> 0.10).
-    """
-    return (v / Decimal(100)) if v >= 1 else v
-
-def main() -> None:
-    p = argparse.ArgumentParser(prog="simfin", description="Simulador SAC (TR/IPCA, encargos, CSV)")
+def _lista(v: str, tipo=_as_decimal) -> list:
+    # "8,9,10" ou faixas inclusivas "120:360:12" (podem ser combinadas: "6,12:36:12")
+    valores = []
+    for parte in v.split(","):
+        parte = parte.strip()
+        if ":" in parte:
+            ini, fim, passo = (tipo(x) for x in parte.split(":"))
+            if passo <= 0:
+                raise argparse.ArgumentTypeError(f"Passo inválido em {parte!r}")
+            x = ini
+            while x <= fim:
+                valores.append(x)
+                x += passo
+        elif parte:
+            valores.append(tipo(parte))
+    return valores
+
+SUBCOMANDOS = ("sweep", "contemplacao", "otimizar", "carteira", "series", "bench", "serve", "cache")
+
+def main(argv=None) -> None:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in SUBCOMANDOS:
+        {"sweep": _sweep, "contemplacao": _contemplacao, "otimizar": _otimizar, "carteira": _carteira,
+         "series": _series, "bench": _bench, "serve": _serve, "cache": _cache}[argv[0]](argv[1:])
+        return
+
+    p = argparse.ArgumentParser(prog="simfin", description="Simulador SAC (TR/IPCA, encargos, CSV)",
+                                epilog="Subcomandos: " + ", ".join(SUBCOMANDOS))
     p.add_argument("--interactive", action="store_true", help="Modo interativo via terminal")
 
     p.add_argument("--tipo", choices=["prazo", "valor"], help="Tipo de simulação")
@@ -41,22 +58,91 @@ def main() -> None:
     p.add_argument("--tr-anual", type=str, default="0.0", help="TR anual (ex.: 0.0 ou 0.02)")
     p.add_argument("--ipca-anual", type=str, default="0.0", help="IPCA anual (ex.: 0.0 ou 0.06)")
     p.add_argument("--encargos", type=str, default="0.0", help="Encargos fixos mensais")
+    p.add_argument("--tr-serie", type=str, help="Série mensal de TR do repositório (substitui --tr-anual)")
+    p.add_argument("--ipca-serie", type=str, help="Série mensal de IPCA do repositório (substitui --ipca-anual)")
+    p.add_argument("--serie-inicio", type=str, help="Mês da 1ª parcela nas séries (ex.: 2015-03)")
+    p.add_argument("--series-dir", type=str, help="Diretório do repositório de séries (padrão: $SIMFIN_SERIES_DIR ou ~/.simfin/series)")
     p.add_argument("--prazo", type=int, help="Prazo em meses (para tipo=prazo)")
     p.add_argument("--prazo-oficial", type=int, default=360, help="Prazo oficial do banco (máximo)")
     p.add_argument("--valor-max", type=str, help="Valor máximo total a pagar (para tipo=valor)")
-    p.add_argument("--csv", type=str, help="Exportar parcelas em CSV para o caminho informado")
+    p.add_argument("--csv", type=str, help="Exportar parcelas em CSV para o caminho informado (extensão .sfc: formato colunar binário)")
+    p.add_argument("--engine", choices=["decimal", "centavos", "fast"], default="decimal",
+                   help="Motor de cálculo: decimal (exato, padrão), centavos (inteiros em ponto fixo, "
+                        "mesmo resultado do decimal, mais rápido) ou fast (NumPy, float64)")
+    p.add_argument("--verificar", action="store_true",
+                   help="Com --engine fast, confere o resultado contra o motor Decimal")
+    p.add_argument("--sensibilidades", action="store_true",
+                   help="Efeito de +1 p.p. em juros/TR/IPCA/correção/desconto (1ª ordem, sem re-simular)")
+    p.add_argument("--cet", action="store_true",
+                   help="Mostra o CET do financiamento (TIR das parcelas com encargos, ao ano)")
 
     # Consórcio
     p.add_argument("--consorcio-json", type=str, help="JSON com dados do consórcio para comparar")
-    p.add_argument("--csv-consorcio", type=str, help="Exportar cronograma do consórcio em CSV")
+    p.add_argument("--csv-consorcio", type=str, help="Exportar cronograma do consórcio em CSV (extensão .sfc: formato colunar binário)")
     p.add_argument("--taxa-desconto-anual", type=str, help="(Opcional) Taxa de desconto anual para VPL; se presente, sobrescreve a do JSON")
 
-    args = p.parse_args()
+    # Lote
+    p.add_argument("--batch", type=str, help="Arquivo JSONL ou CSV com um cenário por linha (campo tipo: prazo|valor|consorcio)")
+    p.add_argument("--batch-formato", choices=["jsonl", "csv"], help="Formato do lote (padrão: pela extensão)")
+    p.add_argument("--workers", type=int, help="Processos do lote (padrão: nº de CPUs; 1 = sem pool)")
+    p.add_argument("--pool", choices=["processos", "threads"], default="processos",
+                   help="Workers do lote: processos (padrão) ou threads (sem serialização; paralelo em Python sem GIL)")
+    p.add_argument("--chunksize", type=int, default=CHUNKSIZE_PADRAO, help="Cenários por tarefa enviada a cada processo")
+    p.add_argument("--saida", type=str, help="Arquivo JSONL para os resumos do lote (padrão: stdout)")
+
+    # Cache de resultados
+    p.add_argument("--cache-dir", type=str, help="Diretório do cache de resultados (reaproveita simulações já feitas)")
+    p.add_argument("--cache-max-mb", type=float, default=MAX_BYTES_PADRAO / 2**20,
+                   help="Tamanho máximo do cache; acima disso descarta os menos usados")
+
+    # Instrumentação
+    p.add_argument("--profile", nargs="?", const="-", metavar="ARQ",
+                   help="Tempos por fase e contadores (stderr); com ARQ .json grava o relatório, "
+                        "outra extensão grava as estatísticas do cProfile (ex.: perfil.prof)")
+
+    args = p.parse_args(argv)
+    if args.profile is None:
+        _executar(p, args)
+    else:
+        _com_profile(p, args)
+
+def _com_profile(p: argparse.ArgumentParser, args) -> None:
+    destino = args.profile
+    prof = cProfile.Profile() if destino != "-" and not destino.lower().endswith(".json") else None
+    perf.ativar()
+    try:
+        with perf.fase("cli.total"):
+            if prof is not None:
+                prof.runcall(_executar, p, args)
+            else:
+                _executar(p, args)
+    finally:
+        perf.desativar()
+        if prof is not None:
+            prof.dump_stats(destino)
+            print(f"Perfil cProfile gravado em: {destino} (veja com: python -m pstats {destino})", file=sys.stderr)
+        elif destino == "-":
+            print("\n" + perf.formatar(), file=sys.stderr)
+        else:
+            with open(destino, "w", encoding="utf-8") as f:
+                json.dump(perf.relatorio(), f, indent=2, ensure_ascii=False)
+            print(f"Relatório de perfil gravado em: {destino}", file=sys.stderr)
+
+def _executar(p: argparse.ArgumentParser, args) -> None:
+    if args.series_dir:
+        # Via ambiente, para valer também nos processos do lote
+        os.environ["SIMFIN_SERIES_DIR"] = args.series_dir
 
     if args.interactive:
         _interactive()
         return
 
+    if args.batch:
+        _batch(args)
+        return
+
+    cache = abrir_cache(args.cache_dir, int(args.cache_max_mb * 2**20)) if args.cache_dir else None
+
     if not args.tipo:
         p.error("--tipo é obrigatório (prazo|valor) quando não estiver em modo interativo.")
 
@@ -69,6 +155,9 @@ def main() -> None:
     tr = _as_decimal(args.tr_anual)
     ipca = _as_decimal(args.ipca_anual)
     encargos = _as_decimal(args.encargos)
+    series = dict(tr_serie=args.tr_serie, ipca_serie=args.ipca_serie, serie_inicio=args.serie_inicio)
+    if (args.tr_serie or args.ipca_serie) and not args.serie_inicio:
+        p.error("--serie-inicio é obrigatório com --tr-serie/--ipca-serie")
 
     if args.tipo == "prazo":
         if not args.prazo:
@@ -76,95 +165,60 @@ def main() -> None:
         entrada_prazo = EntradaPrazo(
             valor_imovel=valor_imovel, entrada=entrada, juros_anual=juros,
             tr_anual=tr, ipca_anual=ipca, encargos_fixos_mensais=encargos,
-            prazo=args.prazo, prazo_oficial=args.prazo_oficial
+            prazo=args.prazo, prazo_oficial=args.prazo_oficial, **series
         )
-        res = simular_sac_por_prazo(entrada_prazo)
+        res = simular_entrada(entrada_prazo, args.engine, args.verificar, cache=cache)
     else:
         if not args.valor_max:
             p.error("--valor-max é obrigatório para tipo=valor")
         entrada_valor = EntradaValor(
             valor_imovel=valor_imovel, entrada=entrada, juros_anual=juros,
             tr_anual=tr, ipca_anual=ipca, encargos_fixos_mensais=encargos,
-            valor_maximo=_as_decimal(args.valor_max), prazo_oficial=args.prazo_oficial
+            valor_maximo=_as_decimal(args.valor_max), prazo_oficial=args.prazo_oficial, **series
         )
-        res = simular_sac_por_valor(entrada_valor)
+        res = simular_entrada(entrada_valor, args.engine, args.verificar, cache=cache)
 
     print("\nResultado da simulação")
     print(f"Prazo utilizado: {res.prazo_utilizado} meses")
     print(f"Primeira parcela: R$ {res.primeira_parcela}")
     print(f"Última parcela: R$ {res.ultima_parcela}")
     print(f"Total pago: R$ {res.valor_total_pago}")
+    if args.cet:
+        _imprimir_cet(valor_imovel - entrada, res)
+    if args.sensibilidades:
+        from .sac import _entrada_prazo
+        from .sensibilidade import sensibilidades_sac
+        e = entrada_prazo if args.tipo == "prazo" else _entrada_prazo(entrada_valor, res.prazo_utilizado)
+        disc = _as_rate(_D(args.taxa_desconto_anual)) if args.taxa_desconto_anual else None
+        _imprimir_sensibilidades(sensibilidades_sac(e, disc))
 
     if args.csv:
-        exportar_csv(res.parcelas_detalhadas, args.csv)
-        print(f"CSV exportado em: {args.csv}")
+        formato = exportar(res.parcelas_detalhadas, args.csv, CAMPOS_SAC)
+        print(f"{_NOME_FORMATO[formato]} exportado em: {args.csv}")
 
     # ===== Comparação com Consórcio (somente no modo por flags) =====
     if args.consorcio_json:
         with open(args.consorcio_json, "r", encoding="utf-8") as f:
             data = json.load(f)
 
-        lance = data.get("lance", {})
-        hip = data.get("hipoteses", {})
-
-        ci = ConsorcioInput(
-            administradora=data.get("administradora", ""),
-            grupo=data.get("grupo", ""),
-            cota=data.get("cota", ""),
-            carta_credito_inicial=_D(data["carta_credito_inicial"]),
-            prazo_total_meses=int(data["prazo_total_meses"]),
-            indice_correcao=data.get("indice_correcao", "INCC"),
-            correcao_modo=data.get("correcao_modo", "anual_constante"),
-            correcao_anual=_D(data.get("correcao_anual", 0)),
-            correcao_serie_mensal=[_D(x) for x in data.get("correcao_serie_mensal", [])] or None,
-            taxa_adm_total_pct=_D(data.get("taxa_adm_total_pct", 16)),
-            taxa_adm_forma=data.get("taxa_adm_forma", "diluida"),
-            fundo_reserva_pct=_D(data.get("fundo_reserva_pct", 0)),
-            seguro_mensal_valor=_D(data.get("seguro_mensal_valor", 0)),
-            taxa_adesao_valor=_D(data.get("taxa_adesao_valor", 0)),
-            taxas_contemplacao_valor=_D(data.get("taxas_contemplacao_valor", 0)),
-            parcela_reduzida=bool(data.get("parcela_reduzida", False)),
-            parcela_reduzida_pct=_D(data.get("parcela_reduzida_pct", 100)),
-            parcela_reduzida_meses=int(data.get("parcela_reduzida_meses", 0)),
-            lance=Lance(
-                tipo=lance.get("tipo", "livre"),
-                percent_carta=_D(lance.get("percent_carta", 0)),
-                fonte=lance.get("fonte", "proprio"),
-            ),
-            mes_contemplacao_alvo=int(data.get("mes_contemplacao_alvo", 12)),
-            hipoteses=Hipoteses(
-                aluguel_mensal_enquanto_espera=_D(hip.get("aluguel_mensal_enquanto_espera", 0)),
-                taxa_desconto_anual=_as_rate(_D(hip.get("taxa_desconto_anual", 0))),
-                crescimento_preco_imovel_anual=_D(hip.get("crescimento_preco_imovel_anual", 0)),
-            ),
-        )
+        ci = consorcio_de_dict(data)
 
         if args.taxa_desconto_anual:
             ci.hipoteses.taxa_desconto_anual = _as_rate(_D(args.taxa_desconto_anual))
 
-        cres = simular_consorcio(ci)
+        with perf.fase("cli.consorcio"):
+            cres = simular_entrada(ci, args.engine, args.verificar, cache=cache)
 
         if args.csv_consorcio:
-            campos = ["mes","parcela","contribuicao_base","taxa_adm","fundo_reserva","seguro","taxas_pontuais","aluguel","lance","saldo_a_contribuir","carta_atualizada"]
-            with open(args.csv_consorcio, "w", newline="") as f:
-                w = csv.DictWriter(f, fieldnames=campos)
-                w.writeheader()
-                for p in cres.parcelas:
-                    w.writerow({k: str(p.get(k, "")) for k in campos})
-            print(f"CSV (consórcio) exportado em: {args.csv_consorcio}")
+            formato = exportar(cres.parcelas, args.csv_consorcio, CAMPOS_CSV_CONSORCIO)
+            print(f"{_NOME_FORMATO[formato]} (consórcio) exportado em: {args.csv_consorcio}")
 
         # Comparação: totais e VPL (se taxa de desconto informada)
         disc_a = ci.hipoteses.taxa_desconto_anual
         vpl_fin = vpl_con = None
         if disc_a and disc_a != Decimal(0):
-            disc_m = taxa_mensal(disc_a)
-            def vpl(parcelas):
-                s = Decimal(0)
-                for i, p in enumerate(parcelas, start=1):
-                    s += p["parcela"] / ((Decimal(1)+disc_m) ** Decimal(i))
-                return s
-            vpl_fin = vpl(res.parcelas_detalhadas)
-            vpl_con = vpl(cres.parcelas)
+            # Um vetor de desconto para os dois cronogramas
+            vpl_fin, vpl_con = vpl_lote([res.parcelas_detalhadas, cres.parcelas], disc_a)
 
         print("\n== Comparação com Consórcio ==")
         print(f"Consórcio: {ci.administradora} | grupo {ci.grupo} cota {ci.cota}")
@@ -174,6 +228,299 @@ def main() -> None:
         print(f"Total nominal Financiamento: R$ {res.valor_total_pago}")
         if vpl_fin is not None:
             print(f"VPL (taxa desc. {disc_a*100:.2f}% a.a.) — Consórcio: R$ {vpl_con.quantize(Decimal('0.01'))} | Financiamento: R$ {vpl_fin.quantize(Decimal('0.01'))}")
+        if args.sensibilidades:
+            from .sensibilidade import sensibilidades_consorcio
+            _imprimir_sensibilidades(sensibilidades_consorcio(ci))
+
+def _imprimir_sensibilidades(s) -> None:
+    # Derivadas × 0,01: variação de cada medida com o parâmetro 1 p.p. maior
+    if not s.parametros:
+        return
+    pp = Decimal("0.01")
+    print("Sensibilidades (+1 p.p., 1ª ordem):")
+    for param in s.parametros:
+        partes = [f"{rotulo} R$ {(s.derivadas[m][param] * pp).quantize(pp):+}"
+                  for m, rotulo in (("total_pago", "total"), ("primeira_parcela", "1ª parcela"), ("vpl", "VPL"))
+                  if m in s.derivadas]
+        print(f"  {param}: " + " | ".join(partes))
+
+def _imprimir_cet(valor_financiado: Decimal, res) -> None:
+    # CET: TIR de (-valor financiado, parcelas com encargos), anualizada
+    if valor_financiado <= 0:
+        return
+    try:
+        c = cet(valor_financiado, res.parcelas_detalhadas)
+    except ValueError:
+        return
+    print(f"CET: {(c * 100).quantize(Decimal('0.01'))}% a.a.")
+
+def _sweep(argv) -> None:
+    p = argparse.ArgumentParser(prog="simfin sweep",
+                                description="Grade SAC juros × TR × IPCA × prazo × entrada (CSV)")
+    p.add_argument("--valor-imovel", type=_as_decimal, required=True, help="Valor do imóvel")
+    p.add_argument("--entradas", type=_lista, required=True, help="Entradas (ex.: 50000,75000 ou 50000:100000:5000)")
+    p.add_argument("--juros", type=_lista, required=True, help="Juros anuais (ex.: 8:12:0.5; valores >= 1 são %%)")
+    p.add_argument("--juros-em-percent", action="store_true", help="Interpreta todos os juros em %% (inclusive valores < 1)")
+    p.add_argument("--prazos", type=lambda v: _lista(v, int), required=True, help="Prazos em meses (ex.: 120:360:12)")
+    p.add_argument("--tr-anual", type=_lista, default=[Decimal(0)], help="TR anual (um ou mais valores; >= 1 são %%)")
+    p.add_argument("--ipca-anual", type=_lista, default=[Decimal(0)], help="IPCA anual (um ou mais valores; >= 1 são %%)")
+    p.add_argument("--encargos", type=_as_decimal, default=Decimal(0), help="Encargos fixos mensais")
+    p.add_argument("--taxa-desconto-anual", type=str, help="Taxa de desconto anual para a coluna VPL")
+    p.add_argument("--exato", action="store_true", help="Arredonda cada parcela como o motor (mais lento)")
+    p.add_argument("--csv", type=str, help="Arquivo de saída (padrão: stdout)")
+    args = p.parse_args(argv)
+
+    from .sweep import varrer_sac, escrever_csv
+    # Taxas como no modo principal e em --taxa-desconto-anual: >= 1 é percentual
+    juros = [j / Decimal(100) for j in args.juros] if args.juros_em_percent else [_as_rate(j) for j in args.juros]
+    tr_anuais = [_as_rate(t) for t in args.tr_anual]
+    ipca_anuais = [_as_rate(t) for t in args.ipca_anual]
+    disc = _as_rate(_D(args.taxa_desconto_anual)) if args.taxa_desconto_anual else None
+    try:
+        linhas = varrer_sac(args.valor_imovel, args.entradas, juros, args.prazos,
+                            tr_anuais=tr_anuais, ipca_anuais=ipca_anuais,
+                            encargos=args.encargos, taxa_desconto_anual=disc, exato=args.exato)
+    except ValueError as exc:
+        p.error(str(exc))
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            escrever_csv(linhas, f)
+        print(f"Grade com {len(linhas)} cenários exportada em: {args.csv}")
+    else:
+        escrever_csv(linhas, sys.stdout)
+
+def _contemplacao(argv) -> None:
+    p = argparse.ArgumentParser(prog="simfin contemplacao",
+                                description="Totais e VPL do consórcio por mês de contemplação × lance (CSV)")
+    p.add_argument("--consorcio-json", type=str, required=True, help="JSON com dados do consórcio")
+    p.add_argument("--meses", type=lambda v: _lista(v, int), help="Meses de contemplação (padrão: todos; ex.: 1:60:1)")
+    p.add_argument("--lances", type=_lista, help="Lances em %% da carta (padrão: o do JSON; ex.: 0:50:10)")
+    p.add_argument("--taxa-desconto-anual", type=str, help="Taxa de desconto anual para a coluna VPL (padrão: a do JSON)")
+    p.add_argument("--exato", action="store_true", help="Arredonda cada parcela como o motor (mais lento)")
+    p.add_argument("--csv", type=str, help="Arquivo de saída (padrão: stdout)")
+    args = p.parse_args(argv)
+
+    from .contemplacao import varrer_contemplacao, escrever_csv
+    with open(args.consorcio_json, "r", encoding="utf-8") as f:
+        ci = consorcio_de_dict(json.load(f))
+    disc = _as_rate(_D(args.taxa_desconto_anual)) if args.taxa_desconto_anual else None
+    try:
+        linhas = varrer_contemplacao(ci, args.meses, args.lances, taxa_desconto_anual=disc, exato=args.exato)
+    except ValueError as exc:
+        p.error(str(exc))
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            escrever_csv(linhas, f)
+        print(f"Tabela com {len(linhas)} cenários exportada em: {args.csv}")
+    else:
+        escrever_csv(linhas, sys.stdout)
+
+def _reducoes(v: str) -> list:
+    # "sem,70:12": sem parcela reduzida e 70% por 12 meses
+    reducoes = []
+    for parte in v.split(","):
+        parte = parte.strip()
+        if parte == "sem":
+            reducoes.append(None)
+        elif parte:
+            pct, _, meses = parte.partition(":")
+            if not meses:
+                raise argparse.ArgumentTypeError(f"Parcela reduzida inválida: {parte!r} (use pct:meses ou sem)")
+            reducoes.append((_as_decimal(pct), int(meses)))
+    return reducoes
+
+def _curva(v: str) -> dict:
+    # "1:45,12:20,36:0": lance mínimo (% da carta) a partir de cada mês
+    curva = {}
+    for parte in v.split(","):
+        if parte.strip():
+            mes, _, pct = parte.partition(":")
+            if not pct:
+                raise argparse.ArgumentTypeError(f"Ponto inválido: {parte!r} (use mes:pct)")
+            curva[int(mes)] = _as_decimal(pct)
+    return curva
+
+def _otimizar(argv) -> None:
+    p = argparse.ArgumentParser(prog="simfin otimizar",
+                                description="Fronteira custo × desembolso do lance do consórcio")
+    p.add_argument("--consorcio-json", type=str, required=True, help="JSON com dados do consórcio")
+    p.add_argument("--objetivo", choices=["vpl", "total_pago_liquido"],
+                   help="Custo a minimizar (padrão: vpl se houver taxa de desconto)")
+    p.add_argument("--caixa", type=_as_decimal, help="Máximo de lance pago do próprio bolso")
+    p.add_argument("--carta-minima", type=_as_decimal, help="Carta líquida mínima (descontado o lance embutido)")
+    p.add_argument("--meses", type=lambda v: _lista(v, int), help="Meses de contemplação (padrão: todos)")
+    p.add_argument("--lances", type=_lista, help="Lances em %% da carta (padrão: 0:50:5)")
+    p.add_argument("--fontes", type=lambda v: [x.strip() for x in v.split(",") if x.strip()],
+                   default=["proprio", "embutido"], help="Fontes do lance (padrão: proprio,embutido)")
+    p.add_argument("--reducoes", type=_reducoes,
+                   help="Opções de parcela reduzida, ex.: sem,70:12 (padrão: sem e a do JSON)")
+    p.add_argument("--lance-minimo", type=_curva,
+                   help="Lance exigido pelo grupo a partir de cada mês, ex.: 1:45,12:20,36:0 (padrão: qualquer)")
+    p.add_argument("--taxa-desconto-anual", type=str, help="Taxa de desconto anual (padrão: a do JSON)")
+    p.add_argument("--tempo-max", type=float, help="Limite de tempo da busca em segundos")
+    p.add_argument("--csv", type=str, help="Exporta a fronteira em CSV")
+    args = p.parse_args(argv)
+
+    from .otimizador import escrever_csv, otimizar_lance
+    with open(args.consorcio_json, "r", encoding="utf-8") as f:
+        ci = consorcio_de_dict(json.load(f))
+    disc = _as_rate(_D(args.taxa_desconto_anual)) if args.taxa_desconto_anual else None
+    try:
+        res = otimizar_lance(ci, args.objetivo, caixa=args.caixa, carta_minima=args.carta_minima, meses=args.meses,
+                             lances_pct=args.lances, fontes=args.fontes, reducoes=args.reducoes,
+                             lance_minimo=args.lance_minimo, taxa_desconto_anual=disc, tempo_max_s=args.tempo_max)
+    except ValueError as exc:
+        p.error(str(exc))
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            escrever_csv(res.fronteira, f)
+        print(f"Fronteira com {len(res.fronteira)} ofertas exportada em: {args.csv}")
+    else:
+        print(f"Fronteira ({len(res.fronteira)} ofertas; {res.avaliados} avaliadas, {res.podados} podadas"
+              f"{'' if res.completo else '; busca interrompida pelo tempo'}):")
+        for c in res.fronteira:
+            red = f"{c.reducao[0]}% por {c.reducao[1]}m" if c.reducao else "sem"
+            print(f"  mês {c.mes_contemplacao:>3}  lance {c.lance_pct}% ({c.fonte})  reduzida {red}  "
+                  f"desembolso R$ {c.desembolso}  carta R$ {c.carta_liquida}  custo R$ {c.custo}")
+    if res.melhor is None:
+        print("Nenhuma oferta viável.")
+    else:
+        m = res.melhor
+        print(f"Melhor: mês {m.mes_contemplacao}, lance {m.lance_pct}% ({m.fonte}), custo R$ {m.custo}")
+
+def _carteira(argv) -> None:
+    p = argparse.ArgumentParser(prog="simfin carteira",
+                                description="Fluxo de caixa mensal agregado de uma carteira de contratos")
+    p.add_argument("arquivo", help="JSONL ou CSV no formato do lote, com o mês da 1ª parcela em inicio (AAAA-MM)")
+    p.add_argument("--formato", choices=["jsonl", "csv"], help="Formato do arquivo (padrão: pela extensão)")
+    p.add_argument("--engine", choices=["decimal", "centavos", "fast"], default="decimal", help="Motor de cálculo")
+    p.add_argument("--workers", type=int, help="Processos (padrão: nº de CPUs; 1 = sem pool)")
+    p.add_argument("--pool", choices=["processos", "threads"], default="processos", help="Tipo de pool")
+    p.add_argument("--chunksize", type=int, default=CHUNKSIZE_PADRAO, help="Contratos por tarefa enviada a cada worker")
+    p.add_argument("--taxa-desconto-anual", type=str, help="Taxa de desconto anual para o VPL da carteira")
+    p.add_argument("--csv", type=str, help="Exporta o fluxo mensal (competência × componentes) em CSV")
+    args = p.parse_args(argv)
+
+    from .carteira import agregar_carteira, escrever_csv, totais
+    disc = _as_rate(_D(args.taxa_desconto_anual)) if args.taxa_desconto_anual else None
+    r = agregar_carteira(ler_lote(args.arquivo, args.formato), disc, engine=args.engine, workers=args.workers,
+                         chunksize=args.chunksize, pool=args.pool)
+    for erro in r.erros:
+        print(f"linha {erro['linha']}: {erro['erro']}", file=sys.stderr)
+    print(f"Contratos: {r.contratos} ({len(r.erros)} com erro)")
+    if r.inicio:
+        print(f"Horizonte: {len(r.fluxos)} meses a partir de {r.inicio}")
+        for campo, valor in totais(r).items():
+            print(f"  {campo}: R$ {valor}")
+    if r.vpl is not None:
+        print(f"VPL (taxa desc. {disc*100:.2f}% a.a.): R$ {r.vpl}")
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            escrever_csv(r, f)
+        print(f"Fluxo mensal exportado em: {args.csv}")
+
+def _series(argv) -> None:
+    p = argparse.ArgumentParser(prog="simfin series", description="Repositório local de séries mensais (TR, IPCA, INCC)")
+    p.add_argument("--dir", type=str, help="Diretório do repositório (padrão: $SIMFIN_SERIES_DIR ou ~/.simfin/series)")
+    sub = p.add_subparsers(dest="acao", required=True)
+    imp = sub.add_parser("importar", help="Importa (ou substitui) uma série a partir de CSV mês;taxa")
+    imp.add_argument("arquivo", help="CSV com mês (AAAA-MM, MM/AAAA ou DD/MM/AAAA) e taxa mensal")
+    imp.add_argument("--nome", required=True, help="Nome da série (ex.: IPCA)")
+    imp.add_argument("--em-percent", action="store_true", help="Taxas em % (0,45 => 0.0045), como no SGS/BCB")
+    sub.add_parser("listar", help="Lista as séries do repositório")
+    fat = sub.add_parser("fator", help="Correção acumulada entre dois meses")
+    fat.add_argument("nome", help="Nome da série")
+    fat.add_argument("--de", required=True, help="Primeiro mês (inclusive), ex.: 2020-01")
+    fat.add_argument("--ate", required=True, help="Último mês (exclusive), ex.: 2021-01")
+    args = p.parse_args(argv)
+
+    from .series import abrir_serie, formatar_mes, importar_csv, listar_series
+    try:
+        if args.acao == "importar":
+            s = importar_csv(args.arquivo, args.nome, args.dir, em_percent=args.em_percent)
+            print(f"Série {s.nome} importada: {formatar_mes(s.inicio)} a {formatar_mes(s.fim - 1)} ({len(s)} meses)")
+        elif args.acao == "listar":
+            for nome in listar_series(args.dir):
+                s = abrir_serie(nome, args.dir)
+                print(f"{s.nome}\t{formatar_mes(s.inicio)}\t{formatar_mes(s.fim - 1)}\t{len(s)} meses")
+        else:
+            f = abrir_serie(args.nome, args.dir).fator(args.de, args.ate)
+            print(f"{f:.10f} ({(f - 1) * 100:.4f}%)")
+    except ValueError as exc:
+        p.error(str(exc))
+
+def _bench(argv) -> None:
+    from . import bench
+    p = argparse.ArgumentParser(prog="simfin bench", description="Benchmarks com baseline JSON e detecção de regressão")
+    p.add_argument("--cargas", type=lambda v: _lista(v, str), help=f"Cargas a rodar (padrão: todas: {', '.join(bench.CARGAS)})")
+    p.add_argument("--repeticoes", type=int, default=bench.REPETICOES_PADRAO, help="Medições por carga")
+    p.add_argument("--salvar", type=str, help="Grava os resultados como baseline JSON")
+    p.add_argument("--comparar", type=str, help="Baseline JSON; termina com código 1 se houver regressão")
+    p.add_argument("--limite", type=float, default=bench.LIMITE_PADRAO,
+                   help="Regressão tolerada sobre a baseline (0.2 = 20%%)")
+    args = p.parse_args(argv)
+
+    try:
+        baseline = bench.carregar(args.comparar) if args.comparar else None
+        resultado = bench.executar(args.cargas, args.repeticoes)
+    except (OSError, ValueError) as exc:
+        p.error(str(exc))
+    print(bench.tabela(resultado, baseline))
+    if args.salvar:
+        bench.salvar(resultado, args.salvar)
+        print(f"Baseline gravada em: {args.salvar}")
+    if baseline is not None:
+        regressoes = bench.comparar(resultado, baseline, args.limite)
+        for r in regressoes:
+            print(f"REGRESSÃO {r}")
+        if regressoes:
+            raise SystemExit(1)
+
+def _serve(argv) -> None:
+    from . import serve
+    p = argparse.ArgumentParser(prog="simfin serve", description="Serviço HTTP local (JSON) para as simulações")
+    p.add_argument("--host", type=str, default=serve.HOST_PADRAO, help="Endereço de escuta")
+    p.add_argument("--porta", type=int, default=serve.PORTA_PADRAO, help="Porta (0 = qualquer livre)")
+    p.add_argument("--workers", type=int, help="Processos de cálculo (padrão: nº de CPUs)")
+    p.add_argument("--max-pendentes", type=int, default=serve.MAX_PENDENTES_PADRAO,
+                   help="Cálculos distintos em andamento antes de responder 503")
+    p.add_argument("--engine", choices=["decimal", "centavos", "fast"], default="decimal", help="Motor de cálculo")
+    args = p.parse_args(argv)
+    if args.max_pendentes < 1:
+        p.error("--max-pendentes deve ser >= 1")
+    serve.servir(args.host, args.porta, workers=args.workers, max_pendentes=args.max_pendentes, engine=args.engine)
+
+def _cache(argv) -> None:
+    p = argparse.ArgumentParser(prog="simfin cache", description="Cache persistente de resultados")
+    p.add_argument("acao", choices=["stats", "limpar"], help="stats: uso e taxa de acerto; limpar: apaga tudo")
+    p.add_argument("--dir", type=str, help="Diretório do cache (padrão: $SIMFIN_CACHE_DIR ou ~/.simfin/cache)")
+    args = p.parse_args(argv)
+
+    c = CacheResultados(args.dir)
+    try:
+        if args.acao == "limpar":
+            c.limpar()
+            print(f"Cache limpo: {c.diretorio}")
+            return
+        st = c.estatisticas()
+        print(f"Diretório: {st['diretorio']}")
+        print(f"Entradas: {st['entradas']} ({st['bytes'] / 2**20:.2f} MiB)")
+        print(f"Acertos: {st['acertos']} | Faltas: {st['faltas']} | Taxa de acerto: {st['taxa_acerto']:.1%}")
+        print(f"Descartadas por tamanho: {st['despejos']}")
+    finally:
+        c.fechar()
+
+def _batch(args) -> None:
+    saida = open(args.saida, "w", encoding="utf-8") if args.saida else sys.stdout
+    try:
+        for r in simular_lote(ler_lote(args.batch, args.batch_formato), workers=args.workers,
+                              chunksize=args.chunksize, engine=args.engine, cache_dir=args.cache_dir,
+                              cache_max_bytes=int(args.cache_max_mb * 2**20), pool=args.pool):
+            saida.write(json.dumps(r, ensure_ascii=False) + "\n")
+            saida.flush()
+    finally:
+        if saida is not sys.stdout:
+            saida.close()
 
 def _ask_decimal(prompt: str) -> Decimal:
     return _as_decimal(input(prompt).strip())
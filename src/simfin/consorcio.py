@@ -1,9 +1,14 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from decimal import Decimal, ROUND_HALF_UP, getcontext
-from typing import List, Dict, Optional
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .indices import taxa_mensal
+from .series import taxas_serie
+from . import perf
+from .contexto import contexto, em_contexto
+from .cronograma import CAMPOS_CONSORCIO, Cronograma, para_centavos, de_centavos
 
-getcontext().prec = 28
 Q = Decimal("0.01")
 
 def _q2(v: Decimal) -> Decimal:
@@ -12,7 +17,7 @@ def _q2(v: Decimal) -> Decimal:
 def _taxa_mensal_equivalente(taxa_anual: Decimal) -> Decimal:
     if taxa_anual == 0:
         return Decimal(0)
-    return (Decimal(1) + taxa_anual) ** (Decimal(1) / Decimal(12)) - Decimal(1)
+    return taxa_mensal(taxa_anual)
 
 @dataclass
 class Lance:
@@ -38,6 +43,8 @@ class ConsorcioInput:
     correcao_modo: str = "anual_constante"  # "anual_constante" | "serie_mensal"
     correcao_anual: Decimal = Decimal(0)
     correcao_serie_mensal: Optional[List[Decimal]] = None  # taxas mensais (0.004, 0.003, ...)
+    correcao_serie_nome: Optional[str] = None     # série do repositório (simfin.series), ex.: "INCC"
+    correcao_serie_inicio: Optional[str] = None   # mês da 1ª parcela na série, ex.: "2019-07"
 
     taxa_adm_total_pct: Decimal = Decimal(16)   # % sobre a carta (total no grupo)
     taxa_adm_forma: str = "diluida"            # simplificação: diluída
@@ -59,35 +66,66 @@ class ConsorcioInput:
 
 @dataclass
 class ConsorcioResultado:
-    parcelas: List[Dict[str, Decimal]]
+    parcelas: Cronograma
     total_pago: Decimal
     total_pago_liquido: Decimal  # descontando devolução do FR no fim (se houver)
     mes_contemplacao: int
 
 def _serie_correcao_mensal(ci: ConsorcioInput) -> List[Decimal]:
+    if ci.correcao_serie_nome:
+        return taxas_serie(ci.correcao_serie_nome, ci.correcao_serie_inicio, ci.prazo_total_meses)
     if ci.correcao_modo == "serie_mensal" and ci.correcao_serie_mensal:
         return list(ci.correcao_serie_mensal)
     m = _taxa_mensal_equivalente(ci.correcao_anual)
     return [m] * ci.prazo_total_meses
 
-def simular_consorcio(ci: ConsorcioInput) -> ConsorcioResultado:
+def _fr_total(ci: ConsorcioInput) -> Decimal:
+    return (ci.fundo_reserva_pct / Decimal(100)) * ci.carta_credito_inicial
+
+def _mes_contemplacao(ci: ConsorcioInput) -> int:
+    return min(max(1, ci.mes_contemplacao_alvo), ci.prazo_total_meses)
+
+def _centavos_consorcio(ci: ConsorcioInput) -> Iterator[Tuple[int, ...]]:
+    # Laço mensal do consórcio; cada mês sai em inteiros na ordem de CAMPOS_CONSORCIO
+    # (mes sem escala, demais em centavos arredondados com ROUND_HALF_UP)
+    return em_contexto(_passos_consorcio(ci, saida=perf.medido("consorcio.arredondamento", para_centavos)))
+
+def _identidade(x):
+    return x
+
+def _passos_consorcio(ci: ConsorcioInput, series: Optional[List] = None,
+                      saida=para_centavos, contemplacao: Optional[int] = None,
+                      lance_pct: Optional[Decimal] = None,
+                      inicio: Optional[Tuple[int, Decimal, Decimal]] = None,
+                      estado: bool = False) -> Iterator[Tuple[int, ...]]:
+    # series: taxas de correção por mês (padrão: as de ci); saida converte cada
+    # campo (padrão: centavos; sensibilidade passa a identidade para ler os duais).
+    # contemplacao e lance_pct trocam o mês e o % do lance de ci (prazo + 1: sem
+    # contemplação); inicio = (mês, carta, saldo) retoma o laço depois desse mês,
+    # que deve ser anterior à contemplação; estado=True acrescenta a cada mês a
+    # base antes da redução pelo lance e a redução vigente (simfin.contemplacao)
     taxa_adm_total = (ci.taxa_adm_total_pct / Decimal(100)) * ci.carta_credito_inicial
     adm_mensal = taxa_adm_total / Decimal(ci.prazo_total_meses)
 
-    fr_total = (ci.fundo_reserva_pct / Decimal(100)) * ci.carta_credito_inicial
+    fr_total = _fr_total(ci)
     fr_mensal = fr_total / Decimal(ci.prazo_total_meses)
 
     base_mensal_inicial = ci.carta_credito_inicial / Decimal(ci.prazo_total_meses)
-    series = _serie_correcao_mensal(ci)
+    if series is None:
+        series = _serie_correcao_mensal(ci)
 
     carta_atualizada = ci.carta_credito_inicial
     saldo_a_contribuir = ci.carta_credito_inicial
-    parcelas: List[Dict[str, Decimal]] = []
+    primeiro = 1
+    if inicio is not None:
+        primeiro, carta_atualizada, saldo_a_contribuir = inicio
+        primeiro += 1
 
     reducao_base_por_lance = Decimal(0)
-    mes_contemplacao_real = min(max(1, ci.mes_contemplacao_alvo), ci.prazo_total_meses)
+    mes_contemplacao_real = _mes_contemplacao(ci) if contemplacao is None else contemplacao
+    lance_pct = ci.lance.percent_carta if lance_pct is None and ci.lance else lance_pct
 
-    for mes in range(1, ci.prazo_total_meses + 1):
+    for mes in range(primeiro, ci.prazo_total_meses + 1):
         idx = series[mes-1] if mes-1 < len(series) else series[-1]
         fator = (Decimal(1) + idx)
         carta_atualizada = carta_atualizada * fator
@@ -96,6 +134,7 @@ def simular_consorcio(ci: ConsorcioInput) -> ConsorcioResultado:
 
         if ci.parcela_reduzida and mes <= ci.parcela_reduzida_meses:
             base_mensal *= (ci.parcela_reduzida_pct / Decimal(100))
+        base_antes_lance = base_mensal
 
         if reducao_base_por_lance > 0 and mes > mes_contemplacao_real:
             base_mensal = max(Decimal(0), base_mensal - reducao_base_por_lance)
@@ -116,7 +155,7 @@ def simular_consorcio(ci: ConsorcioInput) -> ConsorcioResultado:
 
         lance_mes = Decimal(0)
         if mes == mes_contemplacao_real and ci.lance and ci.lance.fonte == "proprio":
-            lance_mes = (ci.lance.percent_carta / Decimal(100)) * carta_atualizada
+            lance_mes = (lance_pct / Decimal(100)) * carta_atualizada
             saldo_a_contribuir = max(Decimal(0), saldo_a_contribuir - lance_mes)
             meses_restantes = max(1, ci.prazo_total_meses - mes)
             reducao_base_por_lance = (lance_mes / Decimal(meses_restantes))
@@ -126,26 +165,52 @@ def simular_consorcio(ci: ConsorcioInput) -> ConsorcioResultado:
 
         parcela = contrib_base + taxa_adm_do_mes + fr_do_mes + seguro + taxas_pontuais + aluguel + lance_mes
 
-        parcelas.append({
-            "mes": Decimal(mes),
-            "carta_atualizada": _q2(carta_atualizada),
-            "contribuicao_base": _q2(contrib_base),
-            "taxa_adm": _q2(taxa_adm_do_mes),
-            "fundo_reserva": _q2(fr_do_mes),
-            "seguro": _q2(seguro),
-            "taxas_pontuais": _q2(taxas_pontuais),
-            "aluguel": _q2(aluguel),
-            "lance": _q2(lance_mes),
-            "parcela": _q2(parcela),
-            "saldo_a_contribuir": _q2(saldo_a_contribuir),
-        })
-
-    total_pago = sum(p["parcela"] for p in parcelas)
-    total_pago_liquido = total_pago - fr_total
-
-    return ConsorcioResultado(
-        parcelas=parcelas,
-        total_pago=_q2(total_pago),
-        total_pago_liquido=_q2(total_pago_liquido),
-        mes_contemplacao=mes_contemplacao_real,
-    )
+        linha = (
+            mes,
+            saida(carta_atualizada),
+            saida(contrib_base),
+            saida(taxa_adm_do_mes),
+            saida(fr_do_mes),
+            saida(seguro),
+            saida(taxas_pontuais),
+            saida(aluguel),
+            saida(lance_mes),
+            saida(parcela),
+            saida(saldo_a_contribuir),
+        )
+        yield linha + (base_antes_lance, reducao_base_por_lance) if estado else linha
+
+_POS_PARCELA = CAMPOS_CONSORCIO.index("parcela")
+
+def iter_consorcio(ci: ConsorcioInput) -> Iterator[Dict[str, Decimal]]:
+    # Meses sob demanda, como dicts (mesmas chaves e valores das linhas do cronograma)
+    for valores in _centavos_consorcio(ci):
+        linha = {c: de_centavos(v) for c, v in zip(CAMPOS_CONSORCIO, valores)}
+        linha["mes"] = Decimal(valores[0])
+        yield linha
+
+def simular_consorcio(ci: ConsorcioInput, colunas: Optional[Iterable[str]] = None) -> ConsorcioResultado:
+    # colunas: campos do cronograma a guardar (padrão: todos; () = só o resumo)
+    parcelas = Cronograma(CAMPOS_CONSORCIO, colunas)
+    total_pago = 0
+    with perf.fase("consorcio.meses"):
+        for valores in _centavos_consorcio(ci):
+            total_pago += valores[_POS_PARCELA]
+            parcelas.append(valores)
+    perf.contar("cronogramas")
+    perf.contar("meses_simulados", parcelas.meses)
+
+    with contexto():
+        total_pago = de_centavos(total_pago)
+        total_pago_liquido = total_pago - _fr_total(ci)
+
+        return ConsorcioResultado(
+            parcelas=parcelas,
+            total_pago=_q2(total_pago),
+            total_pago_liquido=_q2(total_pago_liquido),
+            mes_contemplacao=_mes_contemplacao(ci),
+        )
+
+def resumir_consorcio(ci: ConsorcioInput) -> ConsorcioResultado:
+    # Só os totais, em memória constante (cronograma sem colunas)
+    return simular_consorcio(ci, colunas=())
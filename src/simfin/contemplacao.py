@@ -0,0 +1,266 @@
+# src/simfin/contemplacao.py
+"""
+Tabela de totais e VPL do consórcio por mês de contemplação × percentual de lance.
+
+Até o mês k - 1 o grupo é o mesmo para todo k (a carta corrige igual, paga-se
+aluguel e nada de lance), então esse prefixo é simulado uma vez, pelo próprio
+laço do motor (``consorcio._passos_consorcio``) sem contemplação: o estado ao
+fim de cada mês (carta, saldo a contribuir) e as somas acumuladas das parcelas
+em centavos ficam guardados. Para cada (k, lance) o mesmo laço é retomado do
+estado do mês k - 1.
+
+Com ``exato=True`` o laço segue até o fim do grupo (os totais batem com
+simular_consorcio). Sem ``exato``, só o mês k passa pelo laço e o sufixo sai
+em forma fechada: depois do lance a contribuição é ``max(0, base - redução)``
+limitada pelo saldo, então o total contribuído é ``min(saldo, soma das bases
+reduzidas)``. Com somas acumuladas das bases (e das bases descontadas), cada
+linha custa O(log N); quando o lance zera a contribuição de alguns meses do
+sufixo, uma árvore de segmentos com as bases ordenadas limita a linha a
+O(log² N), mesmo com uma base diferente por mês (``serie_mensal``). O total
+pode diferir do motor em até 0,005 por mês do sufixo, como na grade do SAC.
+"""
+from __future__ import annotations
+import csv
+from bisect import bisect_right
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from .consorcio import (ConsorcioInput, _POS_PARCELA, _fr_total, _identidade, _passos_consorcio, _q2,
+                        _serie_correcao_mensal)
+from .contexto import contexto
+from .cronograma import CAMPOS_CONSORCIO, de_centavos, para_centavos
+from .valuation import fatores_desconto
+from . import perf
+
+CAMPOS = ["mes_contemplacao", "lance_pct", "lance", "total_pago", "total_pago_liquido", "vpl"]
+_ZERO = Decimal(0)
+_POS_LANCE = CAMPOS_CONSORCIO.index("lance")
+_POS_SALDO = CAMPOS_CONSORCIO.index("saldo_a_contribuir")
+
+@dataclass
+class _Prefixo:
+    # Índices por mês m = 0..N (posição 0: antes do 1º mês)
+    carta: List[Decimal]        # carta atualizada no mês m
+    base: List[Decimal]         # contribuição base do mês m, antes da redução pelo lance
+    saldo: List[Decimal]        # saldo a contribuir ao fim do mês m, sem contemplação
+    centavos: List[int]         # soma das parcelas (centavos) dos meses 1..m, sem contemplação
+    vpl: List[Decimal]          # mesma soma descontada (centavos × v^mes)
+    fixo: Decimal               # taxa de adm + fundo de reserva + seguro (todo mês)
+    series: List[Decimal]       # taxas de correção do laço, reaproveitadas ao retomar
+
+def _prefixo(ci: ConsorcioInput, desconto: Optional[Sequence[Decimal]]) -> _Prefixo:
+    # Laço do motor com contemplação "nunca" (prazo + 1): aluguel todo mês, sem lance
+    series = _serie_correcao_mensal(ci)
+    p = _Prefixo(carta=[ci.carta_credito_inicial], base=[_ZERO], saldo=[ci.carta_credito_inicial],
+                 centavos=[0], vpl=[_ZERO], fixo=_ZERO, series=series)
+    total, vp = 0, _ZERO
+    passos = _passos_consorcio(ci, series, saida=_identidade, contemplacao=ci.prazo_total_meses + 1, estado=True)
+    for mes, carta, _, adm, fr, seguro, _, _, _, parcela, saldo, base, _ in passos:
+        c = para_centavos(parcela)
+        total += c
+        if desconto:
+            vp += c * desconto[mes - 1]
+        p.carta.append(carta)
+        p.base.append(base)
+        p.saldo.append(saldo)
+        p.centavos.append(total)
+        p.vpl.append(vp)
+        p.fixo = adm + fr + seguro
+    return p
+
+def _retomar(ci: ConsorcioInput, p: _Prefixo, k: int, pct: Decimal, estado: bool) -> Iterator[Tuple]:
+    # Laço do motor dos meses k..N, contemplado em k com lance pct, a partir do estado do mês k - 1
+    return _passos_consorcio(ci, p.series, saida=_identidade, contemplacao=k, lance_pct=pct,
+                             inicio=(k - 1, p.carta[k - 1], p.saldo[k - 1]), estado=estado)
+
+def _sufixo_exato(passos: Iterator[Tuple], desconto: Optional[Sequence[Decimal]]):
+    # Meses k+1..N pelo laço do motor, arredondando cada parcela como ele
+    total, vp = 0, _ZERO
+    for linha in passos:
+        c = para_centavos(linha[_POS_PARCELA])
+        total += c
+        if desconto:
+            vp += c * desconto[linha[0] - 1]
+    return de_centavos(total), vp.scaleb(-2)
+
+class _Somas:
+    """
+    Somas acumuladas das bases (B), das bases descontadas (BV) e dos descontos
+    (V) por mês, o mínimo das bases de cada sufixo e uma árvore de segmentos
+    sobre os meses: cada nó guarda as bases do seu trecho em ordem crescente,
+    com as somas acumuladas (base, base × v, v) nessa ordem, de modo que a
+    soma de ``max(0, base - redução)`` num nó sai de uma busca binária.
+    """
+    def __init__(self, p: _Prefixo, desconto: Optional[Sequence[Decimal]]):
+        n = self.n = len(p.base) - 1
+        d = [_ZERO] + (list(desconto[:n]) if desconto else [_ZERO] * n)
+        self.b, self.bv, self.v = [_ZERO], [_ZERO], [_ZERO]
+        for mes in range(1, n + 1):
+            self.b.append(self.b[-1] + p.base[mes])
+            self.bv.append(self.bv[-1] + p.base[mes] * d[mes])
+            self.v.append(self.v[-1] + d[mes])
+        self.min_base = [_ZERO] * (n + 1)       # min(base[k+1..N]); sufixo vazio: 0
+        m = None
+        for k in range(n - 1, -1, -1):
+            m = p.base[k + 1] if m is None else min(m, p.base[k + 1])
+            self.min_base[k] = m
+        self.nos: Dict[int, Tuple[List[Decimal], List[Decimal], List[Decimal], List[Decimal]]] = {}
+        if n:
+            self._montar(1, 1, n, p.base, d)
+
+    def _montar(self, no: int, lo: int, hi: int, base: List[Decimal], d: List[Decimal]) -> None:
+        chaves, b, bv, v = [], [_ZERO], [_ZERO], [_ZERO]
+        for mes in sorted(range(lo, hi + 1), key=base.__getitem__):
+            chaves.append(base[mes])
+            b.append(b[-1] + base[mes])
+            bv.append(bv[-1] + base[mes] * d[mes])
+            v.append(v[-1] + d[mes])
+        self.nos[no] = (chaves, b, bv, v)
+        if lo < hi:
+            meio = (lo + hi) // 2
+            self._montar(2 * no, lo, meio, base, d)
+            self._montar(2 * no + 1, meio + 1, hi, base, d)
+
+    def contribuido(self, ini: int, fim: int, reducao: Decimal) -> Decimal:
+        # soma de (base - reducao) nos meses ini..fim
+        return self.b[fim] - self.b[ini - 1] - reducao * (fim - ini + 1)
+
+    def descontado(self, ini: int, fim: int, reducao: Decimal) -> Decimal:
+        return self.bv[fim] - self.bv[ini - 1] - reducao * (self.v[fim] - self.v[ini - 1])
+
+    def esgota(self, ini: int, fim: int, reducao: Decimal, saldo: Decimal) -> int:
+        # Primeiro mês j em ini..fim com contribuido(ini, j) >= saldo (soma não decrescente)
+        lo, hi = ini, fim
+        while lo < hi:
+            meio = (lo + hi) // 2
+            if self.contribuido(ini, meio, reducao) >= saldo:
+                hi = meio
+            else:
+                lo = meio + 1
+        return lo
+
+    def trecho(self, ini: int, reducao: Decimal, saldo: Decimal) -> Tuple[Decimal, Decimal]:
+        # (contribuído, descontado) nos meses ini..N sem base abaixo da redução
+        soma = self.contribuido(ini, self.n, reducao)
+        if soma < saldo:
+            return soma, self.descontado(ini, self.n, reducao)
+        # Saldo acaba no mês j: parcial em j, nada depois
+        j = self.esgota(ini, self.n, reducao, saldo)
+        falta = saldo - self.contribuido(ini, j - 1, reducao)
+        return saldo, self.descontado(ini, j - 1, reducao) + falta * (self.v[j] - self.v[j - 1])
+
+    def _no(self, no: int, reducao: Decimal) -> Tuple[Decimal, Decimal]:
+        # (soma, soma descontada) de max(0, base - reducao) nos meses do nó
+        chaves, b, bv, v = self.nos[no]
+        i = bisect_right(chaves, reducao)
+        return b[-1] - b[i] - reducao * (len(chaves) - i), bv[-1] - bv[i] - reducao * (v[-1] - v[i])
+
+    def _cobertura(self, no: int, lo: int, hi: int, ini: int):
+        # Nós que cobrem os meses ini..hi, da esquerda para a direita (O(log N))
+        if ini <= lo:
+            yield no, lo, hi
+            return
+        meio = (lo + hi) // 2
+        if ini <= meio:
+            yield from self._cobertura(2 * no, lo, meio, ini)
+        yield from self._cobertura(2 * no + 1, meio + 1, hi, ini)
+
+    def limiar(self, ini: int, reducao: Decimal, saldo: Decimal) -> Tuple[Decimal, Decimal]:
+        # (contribuído, descontado) nos meses ini..N com contribuição max(0, base - reducao)
+        restante, vp = saldo, _ZERO
+        for no, lo, hi in self._cobertura(1, 1, self.n, ini):
+            soma, desc = self._no(no, reducao)
+            if soma < restante:
+                restante -= soma
+                vp += desc
+                continue
+            # O saldo acaba dentro do nó: desce até o mês, um filho por nível
+            while lo < hi:
+                meio = (lo + hi) // 2
+                soma, desc = self._no(2 * no, reducao)
+                if soma < restante:
+                    restante -= soma
+                    vp += desc
+                    no, lo = 2 * no + 1, meio + 1
+                else:
+                    no, hi = 2 * no, meio
+            vp += restante * (self.v[lo] - self.v[lo - 1])
+            return saldo, vp
+        return saldo - restante, vp
+
+def _sufixo_rapido(p: _Prefixo, s: _Somas, k: int, saldo: Decimal, reducao: Decimal, n: int,
+                   com_vpl: bool):
+    """
+    Total e VPL (sem arredondar) dos meses k+1..N. Sem base abaixo da redução
+    o sufixo é um trecho só, pelas somas acumuladas; senão, a árvore de
+    segmentos pula os meses que zeram (max(0, base - redução) = 0).
+    """
+    if k == n:
+        return _ZERO, _ZERO
+    if reducao <= s.min_base[k]:
+        contribuido, vp = s.trecho(k + 1, reducao, saldo)
+    else:
+        contribuido, vp = s.limiar(k + 1, reducao, saldo)
+    total = contribuido + p.fixo * (n - k)
+    if not com_vpl:
+        return total, None
+    return total, vp + p.fixo * (s.v[n] - s.v[k])
+
+def _avaliar(ci: ConsorcioInput, p: _Prefixo, somas: Optional[_Somas], k: int, pct: Decimal,
+             desconto: Optional[Sequence[Decimal]]):
+    # (lance, total pago, VPL sem arredondar) de uma linha; somas=None percorre o sufixo mês a mês
+    passos = _retomar(ci, p, k, pct, estado=somas is not None)
+    mes_k = next(passos)
+    lance, c = mes_k[_POS_LANCE], para_centavos(mes_k[_POS_PARCELA])
+    ate_k = p.centavos[k - 1] + c
+    vp_ate_k = p.vpl[k - 1] + (c * desconto[k - 1] if desconto else 0)
+    if somas is None:
+        suf = _sufixo_exato(passos, desconto)
+    else:
+        saldo, reducao = mes_k[_POS_SALDO], mes_k[-1]
+        suf = _sufixo_rapido(p, somas, k, saldo, reducao, ci.prazo_total_meses, bool(desconto))
+    vpl = vp_ate_k.scaleb(-2) + suf[1] if desconto else None
+    return lance, de_centavos(ate_k) + suf[0], vpl
+
+def varrer_contemplacao(ci: ConsorcioInput, meses: Optional[Iterable[int]] = None,
+                        lances_pct: Optional[Iterable[Decimal]] = None,
+                        taxa_desconto_anual: Optional[Decimal] = None,
+                        exato: bool = False) -> List[Dict[str, Decimal]]:
+    """
+    Uma linha por (mês de contemplação, % de lance), na ordem mês, lance.
+    Padrões: todos os meses do grupo e o lance de ``ci.lance``. A taxa de
+    desconto (padrão: a das hipóteses) acrescenta o VPL das parcelas.
+    """
+    n = ci.prazo_total_meses
+    meses = list(range(1, n + 1) if meses is None else meses)
+    lances_pct = [Decimal(x) for x in (lances_pct if lances_pct is not None else [ci.lance.percent_carta])]
+    if any(not 1 <= k <= n for k in meses):
+        raise ValueError(f"Mês de contemplação inválido: deve ser entre 1 e {n}.")
+    if taxa_desconto_anual is None:
+        taxa_desconto_anual = ci.hipoteses.taxa_desconto_anual
+    desconto = fatores_desconto(taxa_desconto_anual, n) if taxa_desconto_anual else None
+
+    with contexto():
+        with perf.fase("contemplacao.prefixo"):
+            p = _prefixo(ci, desconto)
+            somas = None if exato else _Somas(p, desconto)
+        fr_total = _fr_total(ci)
+        linhas = []
+        with perf.fase("contemplacao.sufixos"):
+            for k in meses:
+                for pct in lances_pct:
+                    lance, total, vpl = _avaliar(ci, p, somas, k, pct, desconto)
+                    total = _q2(total)
+                    linhas.append({
+                        "mes_contemplacao": k, "lance_pct": pct, "lance": _q2(lance),
+                        "total_pago": total, "total_pago_liquido": _q2(total - fr_total),
+                        "vpl": _q2(vpl) if desconto else None,
+                    })
+        perf.contar("contemplacao.linhas", len(linhas))
+        return linhas
+
+def escrever_csv(linhas: Iterable[Dict[str, Decimal]], f: TextIO) -> None:
+    w = csv.writer(f)
+    w.writerow(CAMPOS)
+    w.writerows([("" if l[c] is None else str(l[c])) for c in CAMPOS] for l in linhas)
@@ -0,0 +1,33 @@
+# src/simfin/contexto.py
+"""
+Contexto Decimal dos motores, sem tocar no contexto global.
+
+Todo cálculo roda em ``with contexto():``, uma cópia local (por thread e por
+tarefa asyncio) de ``CONTEXTO``: 28 dígitos, arredondamento bancário e as
+armadilhas padrão, independentes do que o programa hospedeiro configurou.
+
+Geradores não podem manter o ``with`` aberto entre yields (o contexto vazaria
+para quem consome). ``em_contexto`` avança o gerador em blocos de meses dentro
+do contexto e entrega cada bloco já fora dele.
+"""
+from __future__ import annotations
+from decimal import Context, DivisionByZero, InvalidOperation, Overflow, ROUND_HALF_EVEN, localcontext
+from itertools import islice
+from typing import Iterator, TypeVar
+
+PRECISAO = 28
+CONTEXTO = Context(prec=PRECISAO, rounding=ROUND_HALF_EVEN, traps=[InvalidOperation, DivisionByZero, Overflow])
+MESES_POR_BLOCO = 32
+
+T = TypeVar("T")
+
+def contexto():
+    return localcontext(CONTEXTO)
+
+def em_contexto(passos: Iterator[T], bloco: int = MESES_POR_BLOCO) -> Iterator[T]:
+    while True:
+        with localcontext(CONTEXTO):
+            itens = list(islice(passos, bloco))
+        if not itens:
+            return
+        yield from itens
@@ -0,0 +1,169 @@
+# src/simfin/cronograma.py
+"""
+Cronograma colunar: um array compacto de inteiros por campo (centavos; "mes"
+como inteiro) em vez de uma lista de dicts com Decimals por mês.
+
+As linhas são visões leves (``__slots__``) que se comportam como o dict de
+antes: ``linha["parcela"]``, ``linha.get(...)``, ``linha.items()`` devolvem
+Decimals com 2 casas, e ``mes`` volta como ``Decimal(mes)``. Iterar, indexar
+e comparar com listas de dicts continua funcionando.
+"""
+from __future__ import annotations
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence as Seq, Union
+
+from .contexto import CONTEXTO, contexto
+
+CAMPOS_SAC = ["mes", "parcela", "juros", "amortizacao", "saldo_devedor"]
+CAMPOS_CONSORCIO = ["mes", "carta_atualizada", "contribuicao_base", "taxa_adm", "fundo_reserva",
+                    "seguro", "taxas_pontuais", "aluguel", "lance", "parcela", "saldo_a_contribuir"]
+CAMPOS_INTEIROS = frozenset({"mes"})   # guardados sem escala (demais: centavos)
+TIPO_ARRAY = "q"
+_CEM = Decimal(100)
+
+def para_centavos(v: Decimal) -> int:
+    # Mesmo arredondamento de quantize(Decimal("0.01"), ROUND_HALF_UP), já em inteiro.
+    # Usa o contexto corrente: os motores chamam dentro de contexto()
+    return int((v * _CEM).to_integral_value(ROUND_HALF_UP))
+
+def de_centavos(c: int) -> Decimal:
+    return Decimal(c).scaleb(-2, CONTEXTO)
+
+def _para_int(nome: str, v) -> int:
+    if nome in CAMPOS_INTEIROS:
+        return int(v)
+    return para_centavos(Decimal(v))
+
+def _de_int(nome: str, v: int) -> Decimal:
+    if nome in CAMPOS_INTEIROS:
+        return Decimal(v)
+    return Decimal(v).scaleb(-2, CONTEXTO)
+
+class Linha(Mapping):
+    __slots__ = ("_cron", "_i")
+
+    def __init__(self, cron: "Cronograma", i: int):
+        self._cron = cron
+        self._i = i
+
+    def __getitem__(self, campo: str) -> Decimal:
+        return _de_int(campo, self._cron._colunas[campo][self._i])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._cron.campos)
+
+    def __len__(self) -> int:
+        return len(self._cron.campos)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+class Cronograma(Sequence):
+    """
+    ``campos`` define a ordem das colunas de cada linha; ``manter`` restringe
+    quais são guardadas (``()`` guarda só a contagem de meses, para quem precisa
+    apenas dos totais). ``meses`` é o número de meses simulados; sem colunas o
+    cronograma não tem linhas (``len`` 0, iteração vazia).
+    """
+    __slots__ = ("campos", "_declarados", "_colunas", "_destinos", "_n")
+
+    def __init__(self, campos: Seq[str], manter: Optional[Iterable[str]] = None):
+        manter_set = set(campos) if manter is None else set(manter)
+        desconhecidos = manter_set - set(campos)
+        if desconhecidos:
+            raise ValueError(f"Campos desconhecidos: {sorted(desconhecidos)}")
+        self._declarados: List[str] = list(campos)
+        self.campos: List[str] = [c for c in campos if c in manter_set]
+        self._colunas: Dict[str, Seq[int]] = {c: array(TIPO_ARRAY) for c in self.campos}
+        self._n = 0
+        self._ligar()
+
+    def _ligar(self) -> None:
+        # (posição no append, coluna) das colunas guardadas
+        self._destinos = [(self._declarados.index(c), self._colunas[c]) for c in self.campos]
+
+    @classmethod
+    def de_linhas(cls, linhas: Iterable[Mapping], campos: Optional[Seq[str]] = None) -> "Cronograma":
+        linhas = list(linhas)
+        cron = cls(campos or (list(linhas[0].keys()) if linhas else []))
+        for linha in linhas:
+            cron.append_dict(linha)
+        return cron
+
+    @classmethod
+    def de_colunas(cls, campos: Seq[str], colunas: Dict[str, Seq[int]], n: Optional[int] = None) -> "Cronograma":
+        # Colunas já em inteiros (centavos/mes); aceita array, memoryview ou lista.
+        # n: número de meses quando não há colunas (cronograma só de resumo)
+        cron = cls(campos, manter=[c for c in campos if c in colunas])
+        for c in cron.campos:
+            col = colunas[c]
+            cron._colunas[c] = col if isinstance(col, (array, memoryview)) else array(TIPO_ARRAY, col)
+        cron._n = len(colunas[cron.campos[0]]) if cron.campos else (n or 0)
+        cron._ligar()
+        return cron
+
+    def append(self, valores: Seq[int]) -> None:
+        # Inteiros (centavos; mes sem escala) na ordem dos campos declarados no construtor
+        self._n += 1
+        for pos, col in self._destinos:
+            col.append(valores[pos])
+
+    def append_dict(self, linha: Mapping) -> None:
+        self._n += 1
+        with contexto():
+            for nome, col in self._colunas.items():
+                col.append(_para_int(nome, linha[nome]))
+
+    @property
+    def meses(self) -> int:
+        return self._n
+
+    def __len__(self) -> int:
+        return self._n if self.campos else 0
+
+    def __getitem__(self, i: Union[int, slice]):
+        if isinstance(i, slice):
+            cron = Cronograma(self.campos)
+            for c in self.campos:
+                cron._colunas[c] = array(TIPO_ARRAY, self._colunas[c][i])
+            cron._n = len(range(*i.indices(self._n)))
+            cron._ligar()
+            return cron
+        if not self.campos:
+            raise IndexError("cronograma guarda apenas o resumo (sem colunas)")
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError("índice fora do cronograma")
+        return Linha(self, i)
+
+    def __iter__(self) -> Iterator[Linha]:
+        return (Linha(self, i) for i in range(len(self)))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Cronograma):
+            return (self._n == other._n and self.campos == other.campos
+                    and all(list(self._colunas[c]) == list(other._colunas[c]) for c in self.campos))
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Cronograma({self._n} meses, campos={self.campos})"
+
+    def coluna(self, campo: str) -> List[Decimal]:
+        return [_de_int(campo, v) for v in self._colunas[campo]]
+
+    def centavos(self, campo: str) -> Seq[int]:
+        # Coluna crua (inteiros), sem conversão para Decimal
+        return self._colunas[campo]
+
+    def para_dicts(self) -> List[Dict[str, Decimal]]:
+        return [dict(l) for l in self]
+
+    def memoria_bytes(self) -> int:
+        return sys.getsizeof(self) + sum(
+            sys.getsizeof(c) if isinstance(c, array) else c.nbytes for c in self._colunas.values())
@@ -1,13 +1,147 @@
 # src/simfin/export.py
+"""
+Exportação de cronogramas (SAC e consórcio).
+
+- CSV: escrita em blocos (``writerows``) num arquivo com buffer grande. Para
+  um Cronograma, cada coluna de centavos é formatada de uma vez, sem montar
+  dicts por linha.
+- Colunar binário (``.sfc``): cabeçalho pequeno + uma coluna contígua de
+  int64 little-endian por campo (centavos, ou o valor puro para "mes").
+  ``ler_colunar`` abre o arquivo via mmap, sem parsear texto; as colunas
+  ficam alinhadas em 8 bytes, prontas para ``numpy.frombuffer``.
+
+As funções aceitam qualquer iterável de linhas (lista, Cronograma ou os
+geradores iter_sac/iter_consorcio).
+"""
 from __future__ import annotations
 from decimal import Decimal
-import csv
-from typing import List, Dict
-
-def exportar_csv(parcelas: List[Dict[str, Decimal]], path: str) -> None:
-    campos = ["mes", "parcela", "juros", "amortizacao", "saldo_devedor"]
-    with open(path, "w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=campos)
-        w.writeheader()
-        for linha in parcelas:
-            w.writerow({k: (str(v) if not isinstance(v, (int, str)) else v) for k, v in linha.items()})
+import csv, mmap, struct, sys
+from array import array
+from itertools import islice
+from typing import Iterable, List, Mapping, Optional, Sequence, Union
+
+from .contexto import contexto
+from .cronograma import CAMPOS_SAC, CAMPOS_INTEIROS, TIPO_ARRAY, Cronograma
+from . import perf
+
+CAMPOS_CSV_CONSORCIO = ["mes", "parcela", "contribuicao_base", "taxa_adm", "fundo_reserva", "seguro",
+                        "taxas_pontuais", "aluguel", "lance", "saldo_a_contribuir", "carta_atualizada"]
+
+BUFFER_BYTES = 1 << 20
+LINHAS_POR_BLOCO = 4096
+
+MAGICO = b"SFC1"
+_CABECALHO = struct.Struct("<4sHQ")      # mágico, nº de colunas, nº de linhas
+_COLUNA = struct.Struct("<BB")           # escala (casas decimais), tamanho do nome
+EXTENSAO_COLUNAR = ".sfc"
+
+_CENTESIMO = Decimal("0.01")
+
+Linhas = Iterable[Mapping[str, Decimal]]
+
+def _texto(v) -> str:
+    return v if isinstance(v, str) else str(v)
+
+def _escrever_csv(parcelas: Linhas, path: str, campos: Sequence[str]) -> None:
+    with open(path, "w", newline="", buffering=BUFFER_BYTES) as f:
+        w = csv.writer(f)
+        w.writerow(campos)
+        if isinstance(parcelas, Cronograma) and all(c in parcelas.campos for c in campos):
+            # Caminho colunar: formata coluna a coluna e escreve em blocos
+            n = len(parcelas)
+            for ini in range(0, n, LINHAS_POR_BLOCO):
+                fim = min(n, ini + LINHAS_POR_BLOCO)
+                colunas = []
+                with contexto():
+                    for c in campos:
+                        bruto = parcelas.centavos(c)[ini:fim]
+                        if c in CAMPOS_INTEIROS:
+                            colunas.append(list(map(str, bruto)))
+                        else:
+                            # centavos × 0,01 é exato e str() dá o mesmo texto de de_centavos
+                            colunas.append(list(map(str, map(_CENTESIMO.__mul__, bruto))))
+                w.writerows(zip(*colunas))
+            perf.contar("linhas_exportadas", n)
+            return
+        it = iter(parcelas)
+        while True:
+            bloco = [[_texto(linha.get(k, "")) for k in campos] for linha in islice(it, LINHAS_POR_BLOCO)]
+            if not bloco:
+                break
+            w.writerows(bloco)
+            perf.contar("linhas_exportadas", len(bloco))
+
+def exportar_colunar(parcelas: Linhas, path: str, campos: Optional[Sequence[str]] = None) -> None:
+    if not isinstance(parcelas, Cronograma):
+        parcelas = Cronograma.de_linhas(parcelas, campos)
+    campos = list(campos or parcelas.campos)
+    n = len(parcelas)
+    cab = bytearray(_CABECALHO.pack(MAGICO, len(campos), n))
+    for c in campos:
+        nome = c.encode("utf-8")
+        cab += _COLUNA.pack(0 if c in CAMPOS_INTEIROS else 2, len(nome)) + nome
+    cab += b"\0" * (-len(cab) % 8)
+    with open(path, "wb", buffering=BUFFER_BYTES) as f:
+        f.write(cab)
+        for c in campos:
+            col = parcelas.centavos(c)
+            col = col if isinstance(col, array) else array(TIPO_ARRAY, col)
+            if sys.byteorder != "little":
+                col = array(TIPO_ARRAY, col)
+                col.byteswap()
+            col.tofile(f)
+    perf.contar("linhas_exportadas", n)
+
+def ler_colunar(path: str) -> Cronograma:
+    """
+    Abre um arquivo .sfc mapeado em memória. As colunas do Cronograma são
+    memoryviews sobre o mmap (nada é copiado nem parseado).
+    """
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magico, n_colunas, n = _CABECALHO.unpack_from(mm, 0)
+    if magico != MAGICO:
+        raise ValueError(f"Arquivo não é um cronograma colunar simfin: {path}")
+    pos = _CABECALHO.size
+    campos: List[str] = []
+    for _ in range(n_colunas):
+        escala, tam = _COLUNA.unpack_from(mm, pos)
+        pos += _COLUNA.size
+        nome = bytes(mm[pos:pos + tam]).decode("utf-8")
+        pos += tam
+        if escala != (0 if nome in CAMPOS_INTEIROS else 2):
+            raise ValueError(f"Escala inesperada para a coluna {nome!r}: {escala}")
+        campos.append(nome)
+    pos += -pos % 8
+    buf = memoryview(mm)
+    colunas = {}
+    for c in campos:
+        col = buf[pos:pos + 8 * n].cast(TIPO_ARRAY)
+        if sys.byteorder != "little":
+            col = array(TIPO_ARRAY, col)
+            col.byteswap()
+        colunas[c] = col
+        pos += 8 * n
+    return Cronograma.de_colunas(campos, colunas)
+
+def exportar(parcelas: Linhas, path: str, campos: Optional[Sequence[str]] = None,
+             formato: Optional[str] = None) -> str:
+    # formato "csv" ou "colunar"; sem formato, decide pela extensão (.sfc => colunar).
+    # Devolve o formato gravado
+    formato = formato or ("colunar" if path.lower().endswith(EXTENSAO_COLUNAR) else "csv")
+    if formato not in ("csv", "colunar"):
+        raise ValueError(f"Formato de exportação inválido: {formato!r}")
+    with perf.fase(f"export.{formato}"):
+        if formato == "colunar":
+            exportar_colunar(parcelas, path, campos)
+        else:
+            if campos is None:
+                campos = parcelas.campos if isinstance(parcelas, Cronograma) else CAMPOS_SAC
+            _escrever_csv(parcelas, path, campos)
+    return formato
+
+def exportar_csv(parcelas: Linhas, path: str) -> None:
+    exportar(parcelas, path, CAMPOS_SAC, formato="csv")
+
+def exportar_csv_consorcio(parcelas: Linhas, path: str) -> None:
+    exportar(parcelas, path, CAMPOS_CSV_CONSORCIO, formato="csv")
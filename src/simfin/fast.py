@@ -0,0 +1,297 @@
+# src/simfin/fast.py
+"""
+Motor vetorizado (NumPy, float64) para SAC e consórcio.
+
+Calcula o cronograma inteiro como arrays, sem laço Python por mês. Os valores
+são arredondados a centavos só na saída e podem divergir do motor Decimal em
+alguns centavos; use ``verificar=True`` para conferir contra o motor exato.
+Requer NumPy (``pip install simfin[fast]``).
+"""
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dependência opcional
+    np = None
+
+from .models import Resultado, EntradaPrazo, EntradaValor
+from .consorcio import ConsorcioInput, ConsorcioResultado
+from .contexto import contexto
+from .cronograma import CAMPOS_SAC, CAMPOS_CONSORCIO, TIPO_ARRAY, Cronograma
+from .indices import taxa_mensal
+from . import sac as _sac
+from . import consorcio as _consorcio
+
+TOLERANCIA_PADRAO = 0.01
+
+class DivergenciaMotor(ValueError):
+    pass
+
+def _exigir_numpy() -> None:
+    if np is None:
+        raise ImportError("simfin.fast requer NumPy: pip install 'simfin[fast]'")
+
+def _taxa_mensal(taxa_anual) -> float:
+    a = float(taxa_anual)
+    return 0.0 if a == 0 else (1.0 + a) ** (1.0 / 12.0) - 1.0
+
+def _centavos(x):
+    return np.round(x, 2)
+
+def colunas_sac(valor_financiado, prazo: int, juros_m: float, encargos: float, fatores) -> Dict[str, "np.ndarray"]:
+    """
+    Cronograma SAC em arrays. ``fatores`` tem forma (..., prazo) com o fator de
+    correção (1 + tr_m)(1 + ipca_m) de cada mês; eixos iniciais (cenários,
+    caminhos) são propagados. Sem arredondamento.
+
+    Com P_k = prod(fatores[:k]), o saldo após k meses é
+    P_k * (V - A * sum_{i<=k} 1/P_i), e o saldo corrigido do mês k usa a soma até k-1.
+    """
+    _exigir_numpy()
+    fatores = np.asarray(fatores, dtype=np.float64)
+    V = np.asarray(valor_financiado, dtype=np.float64)[..., None]
+    A = V / prazo
+    P = np.cumprod(fatores, axis=-1)
+    inv = 1.0 / P
+    inv_ant = np.cumsum(inv, axis=-1) - inv
+    saldo_corr = P * (V - A * inv_ant)
+
+    # Ajuste final: no primeiro mês com saldo corrigido <= amortização, amortiza o
+    # saldo inteiro; a partir daí o saldo é zero.
+    quitado = saldo_corr <= A
+    n_quitados = np.cumsum(quitado, axis=-1)
+    depois = n_quitados >= 2
+    depois |= (n_quitados == 1) & ~quitado
+    saldo_corr = np.where(depois, 0.0, saldo_corr)
+    amort = np.where(quitado | depois, saldo_corr, A)
+    juros = saldo_corr * juros_m
+    parcela = amort + juros + encargos
+    mes = np.broadcast_to(np.arange(1, prazo + 1), parcela.shape)
+    return {
+        "mes": mes,
+        "parcela": parcela,
+        "juros": juros,
+        "amortizacao": amort,
+        "saldo_devedor": saldo_corr - amort,
+    }
+
+def colunas_consorcio(ci: ConsorcioInput, indices) -> Dict[str, "np.ndarray"]:
+    """
+    Cronograma do consórcio em arrays. ``indices`` tem forma (..., prazo) com a
+    taxa de correção de cada mês. Sem arredondamento.
+
+    O saldo a contribuir só é consumido (contribuições e lance), então após o
+    mês k vale max(0, carta - demanda acumulada até k); a contribuição do mês é
+    a diferença entre o saldo antes e depois dela.
+    """
+    _exigir_numpy()
+    n = ci.prazo_total_meses
+    carta = float(ci.carta_credito_inicial)
+    indices = np.asarray(indices, dtype=np.float64)
+    fator = 1.0 + indices
+    meses = np.arange(1, n + 1)
+
+    carta_atualizada = carta * np.cumprod(fator, axis=-1)
+    base = (carta / n) * fator
+    if ci.parcela_reduzida:
+        base = np.where(meses <= ci.parcela_reduzida_meses,
+                        base * (float(ci.parcela_reduzida_pct) / 100.0), base)
+
+    mc = min(max(1, ci.mes_contemplacao_alvo), n)
+    shape = carta_atualizada.shape
+    lance = np.zeros(shape)
+    if ci.lance and ci.lance.fonte == "proprio":
+        valor_lance = (float(ci.lance.percent_carta) / 100.0) * carta_atualizada[..., mc - 1]
+        lance[..., mc - 1] = valor_lance
+        reducao = (valor_lance / max(1, n - mc))[..., None]
+        reduz = (meses > mc) & (reducao > 0)
+        base = np.where(reduz, np.maximum(0.0, base - reducao), base)
+
+    demanda = np.cumsum(base + lance, axis=-1)
+    saldo = np.maximum(0.0, carta - demanda)
+    saldo_antes = np.maximum(0.0, carta - demanda + base)
+    contrib = np.minimum(base, saldo_antes)
+
+    taxa_adm = np.full(shape, float(ci.taxa_adm_total_pct) / 100.0 * carta / n)
+    fundo_reserva = np.full(shape, float(ci.fundo_reserva_pct) / 100.0 * carta / n)
+    seguro = np.full(shape, float(ci.seguro_mensal_valor))
+    taxas_pontuais = np.zeros(shape)
+    taxas_pontuais[..., 0] += float(ci.taxa_adesao_valor)
+    taxas_pontuais[..., mc - 1] += float(ci.taxas_contemplacao_valor)
+    aluguel = np.where(meses < mc, float(ci.hipoteses.aluguel_mensal_enquanto_espera), 0.0)
+    aluguel = np.broadcast_to(aluguel, shape)
+
+    parcela = contrib + taxa_adm + fundo_reserva + seguro + taxas_pontuais + aluguel + lance
+    return {
+        "mes": np.broadcast_to(meses, shape),
+        "carta_atualizada": carta_atualizada,
+        "contribuicao_base": contrib,
+        "taxa_adm": taxa_adm,
+        "fundo_reserva": fundo_reserva,
+        "seguro": seguro,
+        "taxas_pontuais": taxas_pontuais,
+        "aluguel": aluguel,
+        "lance": lance,
+        "parcela": parcela,
+        "saldo_a_contribuir": saldo,
+    }
+
+def indices_consorcio(ci: ConsorcioInput) -> "np.ndarray":
+    # Mesma regra de _serie_correcao_mensal: série mensal completada com o último valor
+    _exigir_numpy()
+    n = ci.prazo_total_meses
+    if ci.correcao_serie_nome:
+        return np.array([float(x) for x in _consorcio._serie_correcao_mensal(ci)], dtype=np.float64)
+    if ci.correcao_modo == "serie_mensal" and ci.correcao_serie_mensal:
+        serie = [float(x) for x in ci.correcao_serie_mensal[:n]]
+        serie += [serie[-1]] * (n - len(serie))
+        return np.array(serie, dtype=np.float64)
+    return np.full(n, _taxa_mensal(ci.correcao_anual))
+
+def _fatores_sac(e, meses: int) -> "np.ndarray":
+    # Fator de correção de cada mês; com séries, os mesmos do motor Decimal
+    if e.tr_serie is None and e.ipca_serie is None:
+        return np.full(meses, (1.0 + _taxa_mensal(e.tr_anual)) * (1.0 + _taxa_mensal(e.ipca_anual)))
+    return np.array([float(f) for f in _sac._fatores(e, meses)], dtype=np.float64)
+
+def _decimal(x) -> Decimal:
+    return Decimal(f"{x:.2f}")
+
+def _cronograma(colunas: Dict[str, "np.ndarray"], campos: List[str]) -> Cronograma:
+    # Colunas já arredondadas a centavos -> inteiros, direto para o cronograma colunar
+    inteiros = {}
+    for c in campos:
+        v = colunas[c] if c == "mes" else np.rint(colunas[c] * 100.0)
+        inteiros[c] = array(TIPO_ARRAY, np.ascontiguousarray(v, dtype=np.int64).tobytes())
+    return Cronograma.de_colunas(campos, inteiros)
+
+@dataclass
+class ResultadoFast:
+    colunas: Dict[str, "np.ndarray"]
+    valor_total_pago: float
+    primeira_parcela: float
+    ultima_parcela: float
+    prazo_utilizado: int
+
+    def para_decimal(self) -> Resultado:
+        return Resultado(
+            valor_total_pago=_decimal(self.valor_total_pago),
+            primeira_parcela=_decimal(self.primeira_parcela),
+            ultima_parcela=_decimal(self.ultima_parcela),
+            prazo_utilizado=self.prazo_utilizado,
+            parcelas_detalhadas=_cronograma(self.colunas, CAMPOS_SAC),
+        )
+
+@dataclass
+class ConsorcioResultadoFast:
+    colunas: Dict[str, "np.ndarray"]
+    total_pago: float
+    total_pago_liquido: float
+    mes_contemplacao: int
+
+    def para_decimal(self) -> ConsorcioResultado:
+        return ConsorcioResultado(
+            parcelas=_cronograma(self.colunas, CAMPOS_CONSORCIO),
+            total_pago=_decimal(self.total_pago),
+            total_pago_liquido=_decimal(self.total_pago_liquido),
+            mes_contemplacao=self.mes_contemplacao,
+        )
+
+def _comparar(colunas: Dict[str, "np.ndarray"], linhas, campos: List[str], tolerancia: float) -> None:
+    for c in campos:
+        esperado = np.array([float(p[c]) for p in linhas])
+        diff = float(np.max(np.abs(colunas[c] - esperado))) if len(esperado) else 0.0
+        if diff > tolerancia:
+            raise DivergenciaMotor(f"Motor rápido diverge do Decimal em '{c}': {diff:.6f} > {tolerancia}")
+
+def _comparar_total(nome: str, valor: float, esperado: Decimal, tolerancia: float) -> None:
+    diff = abs(valor - float(esperado))
+    if diff > tolerancia:
+        raise DivergenciaMotor(f"Motor rápido diverge do Decimal em '{nome}': {diff:.6f} > {tolerancia}")
+
+def _verificar_sac(r: ResultadoFast, ref: Resultado, tolerancia: float) -> None:
+    if r.prazo_utilizado != ref.prazo_utilizado:
+        raise DivergenciaMotor(f"Motor rápido diverge do Decimal em 'prazo_utilizado': "
+                               f"{r.prazo_utilizado} != {ref.prazo_utilizado}")
+    _comparar(r.colunas, ref.parcelas_detalhadas, CAMPOS_SAC, tolerancia)
+    _comparar_total("valor_total_pago", r.valor_total_pago, ref.valor_total_pago, tolerancia * r.prazo_utilizado)
+
+def _sac_por_prazo(e: EntradaPrazo, fatores=None) -> ResultadoFast:
+    bruto = colunas_sac(float(e.valor_imovel - e.entrada), e.prazo, _taxa_mensal(e.juros_anual),
+                        float(e.encargos_fixos_mensais),
+                        _fatores_sac(e, e.prazo) if fatores is None else fatores[:e.prazo])
+    colunas = {c: (v if c == "mes" else _centavos(v)) for c, v in bruto.items()}
+    parcela = colunas["parcela"]
+    return ResultadoFast(
+        colunas=colunas,
+        valor_total_pago=float(parcela.sum()),
+        primeira_parcela=float(parcela[0]),
+        ultima_parcela=float(parcela[-1]),
+        prazo_utilizado=e.prazo,
+    )
+
+def simular_sac_por_prazo(e: EntradaPrazo, verificar: bool = False,
+                          tolerancia: float = TOLERANCIA_PADRAO) -> ResultadoFast:
+    _exigir_numpy()
+    if e.prazo <= 0 or e.prazo > e.prazo_oficial:
+        raise ValueError("Prazo inválido: deve ser entre 1 e prazo_oficial.")
+    r = _sac_por_prazo(e)
+    if verificar:
+        _verificar_sac(r, _sac.simular_sac_por_prazo(e), tolerancia)
+    return r
+
+def simular_sac_por_valor(e: EntradaValor, verificar: bool = False,
+                          tolerancia: float = TOLERANCIA_PADRAO) -> ResultadoFast:
+    # Mesma regra e mesma busca do motor Decimal: maior prazo com total <= valor_maximo
+    # (senão 6 meses), por bisseção quando sac._total_monotono garante que o total cresce
+    # com o prazo; caso contrário, busca linear. Com verificar, o prazo escolhido também
+    # é conferido contra o do motor Decimal (um arredondamento em float64 perto de
+    # valor_maximo pode trocar o prazo).
+    _exigir_numpy()
+    fatores = _fatores_sac(e, max(e.prazo_oficial, _sac.PRAZO_MINIMO_BUSCA))
+    limite = float(e.valor_maximo)
+
+    def cabe(prazo: int) -> bool:
+        return _sac_por_prazo(_sac._entrada_prazo(e, prazo), fatores).valor_total_pago <= limite
+
+    lo, hi = _sac.PRAZO_MINIMO_BUSCA, e.prazo_oficial
+    with contexto():
+        monotono = lo <= hi and _sac._total_monotono(e, taxa_mensal(e.juros_anual), _sac._fatores(e, hi))
+    if monotono:
+        if cabe(lo):
+            # Invariante: total(lo) <= valor_maximo
+            while lo < hi:
+                meio = (lo + hi + 1) // 2
+                if cabe(meio):
+                    lo = meio
+                else:
+                    hi = meio - 1
+    else:
+        lo = max([p for p in range(lo, hi + 1) if cabe(p)], default=_sac.PRAZO_MINIMO_BUSCA)
+    r = _sac_por_prazo(_sac._entrada_prazo(e, lo), fatores)
+    if verificar:
+        _verificar_sac(r, _sac.simular_sac_por_valor(e), tolerancia)
+    return r
+
+def simular_consorcio(ci: ConsorcioInput, verificar: bool = False,
+                      tolerancia: float = TOLERANCIA_PADRAO) -> ConsorcioResultadoFast:
+    _exigir_numpy()
+    bruto = colunas_consorcio(ci, indices_consorcio(ci))
+    colunas = {c: (v if c == "mes" else _centavos(v)) for c, v in bruto.items()}
+    total = float(colunas["parcela"].sum())
+    fr_total = float(ci.fundo_reserva_pct) / 100.0 * float(ci.carta_credito_inicial)
+    r = ConsorcioResultadoFast(
+        colunas=colunas,
+        total_pago=total,
+        total_pago_liquido=total - fr_total,
+        mes_contemplacao=min(max(1, ci.mes_contemplacao_alvo), ci.prazo_total_meses),
+    )
+    if verificar:
+        ref = _consorcio.simular_consorcio(ci)
+        _comparar(colunas, ref.parcelas, CAMPOS_CONSORCIO, tolerancia)
+        _comparar_total("total_pago", r.total_pago, ref.total_pago, tolerancia * ci.prazo_total_meses)
+    return r
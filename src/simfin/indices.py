@@ -1,12 +1,60 @@
 from __future__ import annotations
-from decimal import Decimal, getcontext
+from decimal import Decimal
+from functools import lru_cache
+from typing import List, Optional
+
+from .series import Mes, taxas_serie
+from .contexto import contexto
+from . import perf
+
+# Conversões de taxa se repetem em toda simulação (mesmas taxas anuais a cada mês);
+# cache limitado e compartilhado por todos os motores.
+TAMANHO_CACHE_TAXAS = 256
+
+@lru_cache(maxsize=TAMANHO_CACHE_TAXAS)
+def _taxa_mensal(taxa_anual: Decimal) -> Decimal:
+    # (1 + a)^(1/12) - 1, usando Decimal (sempre com 28 dígitos, para o cache ser estável).
+    # Só roda nas faltas do cache: a fase mede o custo real das conversões
+    with perf.fase("indices.taxa_mensal"), contexto():
+        return (Decimal(1) + taxa_anual) ** (Decimal(1) / Decimal(12)) - Decimal(1)
 
 def taxa_mensal(taxa_anual: Decimal) -> Decimal:
-    # (1 + a)^(1/12) - 1, usando Decimal
-    getcontext().prec = 28
-    return (Decimal(1) + taxa_anual) ** (Decimal(1) / Decimal(12)) - Decimal(1)
+    perf.contar("conversoes_taxa")
+    return _taxa_mensal(taxa_anual)
 
-def aplicar_tr_e_ipca(saldo: Decimal, tr_anual: Decimal, ipca_anual: Decimal) -> Decimal:
+@lru_cache(maxsize=TAMANHO_CACHE_TAXAS)
+def fator_correcao_mensal(tr_anual: Decimal, ipca_anual: Decimal) -> Decimal:
+    # (1 + tr_m) * (1 + ipca_m): fator aplicado ao saldo a cada mês
     tr_m = taxa_mensal(tr_anual) if tr_anual != 0 else Decimal(0)
     ipca_m = taxa_mensal(ipca_anual) if ipca_anual != 0 else Decimal(0)
-    return saldo * (Decimal(1) + tr_m) * (Decimal(1) + ipca_m)
+    with contexto():
+        return (Decimal(1) + tr_m) * (Decimal(1) + ipca_m)
+
+def aplicar_tr_e_ipca(saldo: Decimal, tr_anual: Decimal, ipca_anual: Decimal) -> Decimal:
+    return saldo * fator_correcao_mensal(tr_anual, ipca_anual)
+
+def fatores_correcao_serie(tr_anual: Decimal, ipca_anual: Decimal, meses: int, inicio: Optional[Mes],
+                           tr_serie: Optional[str] = None, ipca_serie: Optional[str] = None) -> List[Decimal]:
+    # Um fator (1 + tr_m) * (1 + ipca_m) por mês: taxas das séries do repositório
+    # a partir de ``inicio``; índice sem série usa a taxa anual constante
+    def taxas(anual: Decimal, serie: Optional[str]) -> List[Decimal]:
+        if serie:
+            return taxas_serie(serie, inicio, meses)
+        return [taxa_mensal(anual) if anual != 0 else Decimal(0)] * meses
+    um = Decimal(1)
+    with contexto():
+        return [(um + t) * (um + i) for t, i in zip(taxas(tr_anual, tr_serie), taxas(ipca_anual, ipca_serie))]
+
+def cache_taxas_info() -> dict:
+    # Acertos/faltas do cache de conversões (para conferir o ganho em produção)
+    taxa = _taxa_mensal.cache_info()
+    fator = fator_correcao_mensal.cache_info()
+    return {
+        "taxa_mensal": {"hits": taxa.hits, "misses": taxa.misses, "tamanho": taxa.currsize},
+        "fator_correcao": {"hits": fator.hits, "misses": fator.misses, "tamanho": fator.currsize},
+        "maxsize": TAMANHO_CACHE_TAXAS,
+    }
+
+def limpar_cache_taxas() -> None:
+    _taxa_mensal.cache_clear()
+    fator_correcao_mensal.cache_clear()
@@ -0,0 +1,126 @@
+# src/simfin/leitura.py
+from __future__ import annotations
+from decimal import Decimal
+from typing import Any, Dict, Optional, Union
+
+from .models import EntradaPrazo, EntradaValor
+from .consorcio import ConsorcioInput, Hipoteses, Lance
+
+Entrada = Union[EntradaPrazo, EntradaValor, ConsorcioInput]
+
+def _D(x):
+    if x is None:
+        return Decimal(0)
+    if isinstance(x, (int, float)):
+        return Decimal(str(x))
+    return Decimal(str(x).replace(",", ".").strip())
+
+def _as_rate(v: Decimal) -> Decimal:
+    """
+    Normaliza taxa anual:
+      - Se v >= 1, assume que veio em porcentagem (ex.: 10 -> 0.10).
+      - Se v  < 1, assume que já está em fração (ex.: 0.10 -> 0.10).
+    """
+    return (v / Decimal(100)) if v >= 1 else v
+
+def _bool(x) -> bool:
+    if isinstance(x, str):
+        return x.strip().lower() in ("1", "true", "s", "sim", "y", "yes")
+    return bool(x)
+
+def _mes(x) -> Optional[str]:
+    return str(x).strip() if x not in (None, "") else None
+
+def _aninhar(d: Dict[str, Any]) -> Dict[str, Any]:
+    # Linhas CSV: "lance.percent_carta" -> {"lance": {"percent_carta": ...}}; células vazias usam o padrão
+    out: Dict[str, Any] = {}
+    for k, v in d.items():
+        if k is None or v is None or v == "":
+            continue
+        alvo = out
+        partes = k.strip().split(".")
+        for parte in partes[:-1]:
+            alvo = alvo.setdefault(parte, {})
+        alvo[partes[-1]] = v
+    return out
+
+def _objeto(data: Dict[str, Any], chave: str) -> Dict[str, Any]:
+    v = data.get(chave, {})
+    if not isinstance(v, dict):
+        raise ValueError(f"Campo {chave!r} deve ser um objeto JSON")
+    return v
+
+def consorcio_de_dict(data: Dict[str, Any]) -> ConsorcioInput:
+    # Mesmo formato do JSON de consórcio aceito pela CLI (ver exemplo_consorcio.json)
+    lance = _objeto(data, "lance")
+    hip = _objeto(data, "hipoteses")
+    if int(data["prazo_total_meses"]) < 1:
+        raise ValueError("Prazo do consórcio inválido: prazo_total_meses deve ser >= 1.")
+    return ConsorcioInput(
+        administradora=data.get("administradora", ""),
+        grupo=data.get("grupo", ""),
+        cota=data.get("cota", ""),
+        carta_credito_inicial=_D(data["carta_credito_inicial"]),
+        prazo_total_meses=int(data["prazo_total_meses"]),
+        indice_correcao=data.get("indice_correcao", "INCC"),
+        correcao_modo=data.get("correcao_modo", "anual_constante"),
+        correcao_anual=_D(data.get("correcao_anual", 0)),
+        correcao_serie_mensal=[_D(x) for x in data.get("correcao_serie_mensal", [])] or None,
+        correcao_serie_nome=data.get("correcao_serie_nome") or None,
+        correcao_serie_inicio=_mes(data.get("correcao_serie_inicio")),
+        taxa_adm_total_pct=_D(data.get("taxa_adm_total_pct", 16)),
+        taxa_adm_forma=data.get("taxa_adm_forma", "diluida"),
+        fundo_reserva_pct=_D(data.get("fundo_reserva_pct", 0)),
+        seguro_mensal_valor=_D(data.get("seguro_mensal_valor", 0)),
+        taxa_adesao_valor=_D(data.get("taxa_adesao_valor", 0)),
+        taxas_contemplacao_valor=_D(data.get("taxas_contemplacao_valor", 0)),
+        parcela_reduzida=_bool(data.get("parcela_reduzida", False)),
+        parcela_reduzida_pct=_D(data.get("parcela_reduzida_pct", 100)),
+        parcela_reduzida_meses=int(data.get("parcela_reduzida_meses", 0)),
+        lance=Lance(
+            tipo=lance.get("tipo", "livre"),
+            percent_carta=_D(lance.get("percent_carta", 0)),
+            fonte=lance.get("fonte", "proprio"),
+        ),
+        mes_contemplacao_alvo=int(data.get("mes_contemplacao_alvo", 12)),
+        hipoteses=Hipoteses(
+            aluguel_mensal_enquanto_espera=_D(hip.get("aluguel_mensal_enquanto_espera", 0)),
+            taxa_desconto_anual=_as_rate(_D(hip.get("taxa_desconto_anual", 0))),
+            crescimento_preco_imovel_anual=_D(hip.get("crescimento_preco_imovel_anual", 0)),
+        ),
+    )
+
+def entrada_de_dict(data: Dict[str, Any]) -> Entrada:
+    """
+    Converte um registro (linha JSONL ou CSV) em EntradaPrazo, EntradaValor ou
+    ConsorcioInput, conforme o campo "tipo" (prazo | valor | consorcio).
+    Campos do SAC seguem as flags da CLI (valor_imovel, entrada, juros_anual,
+    juros_em_percent, tr_anual, ipca_anual, encargos, prazo, prazo_oficial, valor_max,
+    tr_serie, ipca_serie, serie_inicio).
+    """
+    data = _aninhar(data)
+    tipo = str(data.get("tipo", "")).strip().lower()
+    if tipo == "consorcio":
+        return consorcio_de_dict(data)
+    if tipo not in ("prazo", "valor"):
+        raise ValueError(f"Tipo inválido: {tipo!r} (use prazo, valor ou consorcio)")
+
+    juros = _D(data["juros_anual"])
+    if _bool(data.get("juros_em_percent", False)):
+        juros = juros / Decimal(100)
+    comum = dict(
+        valor_imovel=_D(data["valor_imovel"]),
+        entrada=_D(data["entrada"]),
+        juros_anual=juros,
+        tr_anual=_D(data.get("tr_anual", 0)),
+        ipca_anual=_D(data.get("ipca_anual", 0)),
+        encargos_fixos_mensais=_D(data.get("encargos", data.get("encargos_fixos_mensais", 0))),
+        prazo_oficial=int(data.get("prazo_oficial", 360)),
+        tr_serie=data.get("tr_serie") or None,
+        ipca_serie=data.get("ipca_serie") or None,
+        serie_inicio=_mes(data.get("serie_inicio")),
+    )
+    if tipo == "prazo":
+        return EntradaPrazo(prazo=int(data["prazo"]), **comum)
+    valor_max = data["valor_max"] if "valor_max" in data else data["valor_maximo"]
+    return EntradaValor(valor_maximo=_D(valor_max), **comum)
@@ -1,8 +1,10 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
 from typing import List, Dict, Optional
 
+from .cronograma import Cronograma
+
 @dataclass
 class EntradaComum:
     valor_imovel: Decimal
@@ -11,6 +13,10 @@ class EntradaComum:
     tr_anual: Decimal               # 0.0 a 0.02 por ex.
     ipca_anual: Decimal             # 0.0 a 0.06 por ex.
     encargos_fixos_mensais: Decimal # taxas/seguros
+    # Séries mensais do repositório (simfin.series) no lugar de tr_anual/ipca_anual
+    tr_serie: Optional[str] = field(default=None, kw_only=True)     # ex.: "TR"
+    ipca_serie: Optional[str] = field(default=None, kw_only=True)   # ex.: "IPCA"
+    serie_inicio: Optional[str] = field(default=None, kw_only=True) # mês da 1ª parcela, ex.: "2015-03"
 
 @dataclass
 class EntradaPrazo(EntradaComum):
@@ -28,4 +34,4 @@ class Resultado:
     primeira_parcela: Decimal
     ultima_parcela: Decimal
     prazo_utilizado: int
-    parcelas_detalhadas: List[Dict[str, Decimal]]
+    parcelas_detalhadas: Cronograma
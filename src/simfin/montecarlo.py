@@ -0,0 +1,139 @@
+# src/simfin/montecarlo.py
+"""
+Monte Carlo de índices (TR, IPCA, INCC) para SAC e consórcio.
+
+Cada índice segue um AR(1) em taxa mensal, em torno da taxa equivalente à
+média anual, com volatilidade anual e persistência configuráveis. Os
+cronogramas de um bloco inteiro de caminhos são avaliados de uma vez pelos
+kernels de ``simfin.fast``; só as métricas por caminho (pico da parcela,
+total pago, VPL) ficam em memória, então 100k caminhos × 360 meses rodam em
+blocos de tamanho limitado. Sementes geram os mesmos resultados qualquer que
+seja o tamanho do bloco. Requer NumPy.
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, Optional, Sequence, Union
+
+from .models import EntradaPrazo
+from .consorcio import ConsorcioInput
+from . import fast
+from .fast import np, _exigir_numpy, _taxa_mensal
+
+Numero = Union[Decimal, float, int]
+PERCENTIS_PADRAO = (5.0, 25.0, 50.0, 75.0, 95.0)
+BLOCO_PADRAO = 10_000
+METRICAS = ("pico_parcela", "total_pago", "vpl")
+
+@dataclass
+class ModeloIndice:
+    media_anual: Numero = 0                # 0.045 => 4,5% a.a.
+    volatilidade_anual: Numero = 0         # desvio padrão anualizado da taxa mensal
+    persistencia: float = 0.0              # coeficiente do AR(1), 0 <= phi < 1
+    piso_mensal: Optional[float] = None    # ex.: 0.0 para TR não negativa
+
+@dataclass
+class ResultadoMonteCarlo:
+    n_caminhos: int
+    percentis: Dict[str, Dict[float, float]]
+    medias: Dict[str, float]
+    amostras: Dict[str, "np.ndarray"] = field(repr=False, default_factory=dict)
+
+def gerar_caminhos(modelo: ModeloIndice, n_caminhos: int, meses: int, rng) -> "np.ndarray":
+    # Taxas mensais (n_caminhos, meses); AR(1) estacionário começando na média
+    _exigir_numpy()
+    m = _taxa_mensal(modelo.media_anual)
+    sigma = float(modelo.volatilidade_anual) / np.sqrt(12.0)
+    phi = float(modelo.persistencia)
+    if not 0.0 <= phi < 1.0:
+        raise ValueError("Persistência deve estar em [0, 1).")
+    choques = rng.standard_normal((n_caminhos, meses)) * (sigma * np.sqrt(1.0 - phi * phi))
+    if phi == 0.0:
+        x = m + choques
+    else:
+        x = np.empty((n_caminhos, meses))
+        anterior = np.full(n_caminhos, m)
+        for t in range(meses):
+            anterior = m + phi * (anterior - m) + choques[:, t]
+            x[:, t] = anterior
+    if modelo.piso_mensal is not None:
+        np.maximum(x, modelo.piso_mensal, out=x)
+    return x
+
+def _desconto(taxa_anual: Optional[Numero], meses: int) -> Optional["np.ndarray"]:
+    if not taxa_anual:
+        return None
+    return (1.0 + _taxa_mensal(taxa_anual)) ** -np.arange(1, meses + 1, dtype=np.float64)
+
+def _rngs(seed, n: int):
+    return [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(n)]
+
+def _resumir(amostras: Dict[str, "np.ndarray"], percentis: Sequence[float]) -> ResultadoMonteCarlo:
+    amostras = {k: v for k, v in amostras.items() if v is not None}
+    n = len(next(iter(amostras.values())))
+    return ResultadoMonteCarlo(
+        n_caminhos=n,
+        percentis={k: dict(zip(percentis, np.percentile(v, percentis).tolist())) for k, v in amostras.items()},
+        medias={k: float(v.mean()) for k, v in amostras.items()},
+        amostras=amostras,
+    )
+
+def _metricas(parcela: "np.ndarray", desconto: Optional["np.ndarray"], saida: Dict[str, "np.ndarray"],
+              ini: int, fim: int) -> None:
+    saida["pico_parcela"][ini:fim] = parcela.max(axis=-1)
+    saida["total_pago"][ini:fim] = parcela.sum(axis=-1)
+    if desconto is not None:
+        saida["vpl"][ini:fim] = parcela @ desconto
+
+def _alocar(n_caminhos: int, com_vpl: bool) -> Dict[str, Optional["np.ndarray"]]:
+    return {
+        "pico_parcela": np.empty(n_caminhos),
+        "total_pago": np.empty(n_caminhos),
+        "vpl": np.empty(n_caminhos) if com_vpl else None,
+    }
+
+def monte_carlo_sac(e: EntradaPrazo, tr: Optional[ModeloIndice] = None, ipca: Optional[ModeloIndice] = None,
+                    n_caminhos: int = 10_000, seed=None, taxa_desconto_anual: Optional[Numero] = None,
+                    bloco: int = BLOCO_PADRAO, percentis: Sequence[float] = PERCENTIS_PADRAO) -> ResultadoMonteCarlo:
+    """
+    Distribuição de pico da parcela, total pago e VPL do SAC com TR/IPCA
+    estocásticos. Índice sem modelo usa a taxa anual constante da entrada.
+    """
+    _exigir_numpy()
+    if e.prazo <= 0 or e.prazo > e.prazo_oficial:
+        raise ValueError("Prazo inválido: deve ser entre 1 e prazo_oficial.")
+    n = e.prazo
+    V = float(e.valor_imovel - e.entrada)
+    juros_m = _taxa_mensal(e.juros_anual)
+    enc = float(e.encargos_fixos_mensais)
+    desconto = _desconto(taxa_desconto_anual, n)
+    rng_tr, rng_ipca = _rngs(seed, 2)
+    saida = _alocar(n_caminhos, desconto is not None)
+    for ini in range(0, n_caminhos, bloco):
+        k = min(bloco, n_caminhos - ini)
+        tr_m = gerar_caminhos(tr, k, n, rng_tr) if tr else _taxa_mensal(e.tr_anual)
+        ipca_m = gerar_caminhos(ipca, k, n, rng_ipca) if ipca else _taxa_mensal(e.ipca_anual)
+        fatores = np.broadcast_to((1.0 + tr_m) * (1.0 + ipca_m), (k, n))
+        parcela = fast.colunas_sac(np.full(k, V), n, juros_m, enc, fatores)["parcela"]
+        _metricas(parcela, desconto, saida, ini, ini + k)
+    return _resumir(saida, percentis)
+
+def monte_carlo_consorcio(ci: ConsorcioInput, correcao: ModeloIndice, n_caminhos: int = 10_000, seed=None,
+                          taxa_desconto_anual: Optional[Numero] = None, bloco: int = BLOCO_PADRAO,
+                          percentis: Sequence[float] = PERCENTIS_PADRAO) -> ResultadoMonteCarlo:
+    """
+    Idem para o consórcio, com o índice de correção da carta (INCC) estocástico.
+    Sem taxa de desconto explícita, usa a das hipóteses do consórcio.
+    """
+    _exigir_numpy()
+    n = ci.prazo_total_meses
+    if taxa_desconto_anual is None:
+        taxa_desconto_anual = ci.hipoteses.taxa_desconto_anual
+    desconto = _desconto(taxa_desconto_anual, n)
+    (rng,) = _rngs(seed, 1)
+    saida = _alocar(n_caminhos, desconto is not None)
+    for ini in range(0, n_caminhos, bloco):
+        k = min(bloco, n_caminhos - ini)
+        parcela = fast.colunas_consorcio(ci, gerar_caminhos(correcao, k, n, rng))["parcela"]
+        _metricas(parcela, desconto, saida, ini, ini + k)
+    return _resumir(saida, percentis)
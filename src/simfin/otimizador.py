@@ -0,0 +1,243 @@
+# src/simfin/otimizador.py
+"""
+Otimizador de lance e contemplação do consórcio.
+
+Procura, entre percentuais de lance, fonte do lance (próprio ou embutido),
+mês de contemplação e opções de parcela reduzida, as ofertas que minimizam o
+custo (VPL ou total pago líquido) respeitando o caixa disponível para o lance
+e, opcionalmente, uma carta líquida mínima. Devolve a fronteira de Pareto
+custo × desembolso do lance.
+
+Cada opção de parcela reduzida tem um prefixo (``contemplacao._prefixo``)
+compartilhado por todos os meses e lances, e cada candidato custa O(log N)
+(O(log² N) quando o lance zera a contribuição de alguns meses) pela forma
+fechada do sufixo. As regiões (parcela reduzida, mês) são
+visitadas em ordem de limite inferior de custo (prefixo + taxas fixas até o
+fim, que nenhum lance evita); uma região cujo limite já é alcançado por uma
+oferta com desembolso não maior é descartada inteira. Com ``tempo_max_s`` a
+busca para entre regiões e devolve o que achou (``completo=False``). Os
+pontos da fronteira são reavaliados mês a mês no fim, com o arredondamento
+do motor.
+
+O mês de contemplação é escolha livre, a menos que ``lance_minimo`` diga o
+lance (% da carta) que o grupo costuma exigir a partir de cada mês, ex.:
+``{1: 60, 12: 45, 24: 30}``; antes do primeiro mês da curva não há
+contemplação por lance. É essa curva que troca desembolso por meses de
+aluguel a menos.
+
+Lance embutido: abate o saldo como o próprio, sem desembolso; o valor sai da
+carta (``carta_liquida``) e entra no custo como crédito renunciado.
+"""
+from __future__ import annotations
+import csv
+from dataclasses import dataclass, replace
+from decimal import Decimal
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
+
+from .consorcio import ConsorcioInput, Lance, _fr_total, _q2
+from .contemplacao import _Somas, _avaliar, _prefixo
+from .contexto import contexto
+from .valuation import fatores_desconto
+from . import perf
+
+OBJETIVOS = ("vpl", "total_pago_liquido")
+FONTES = ("proprio", "embutido")
+LANCES_PADRAO = [Decimal(x) for x in range(0, 55, 5)]
+CAMPOS = ["mes_contemplacao", "lance_pct", "fonte", "reduzida_pct", "reduzida_meses", "lance",
+          "desembolso", "carta_liquida", "total_pago_liquido", "vpl", "custo"]
+_ZERO = Decimal(0)
+_CEM = Decimal(100)
+_MEIO_CENTAVO = Decimal("0.005")
+
+Reducao = Optional[Tuple[Decimal, int]]     # (percentual pago, meses) ou None: sem parcela reduzida
+
+@dataclass
+class Candidato:
+    mes_contemplacao: int
+    lance_pct: Decimal
+    fonte: str
+    reducao: Reducao
+    lance: Decimal
+    desembolso: Decimal        # lance pago do bolso no mês da contemplação
+    carta_liquida: Decimal     # carta no mês da contemplação, menos o lance embutido
+    total_pago_liquido: Decimal
+    vpl: Optional[Decimal]
+    custo: Decimal             # o objetivo: vpl ou total_pago_liquido
+
+@dataclass
+class ResultadoOtimizacao:
+    fronteira: List[Candidato]          # por desembolso crescente (custo decrescente)
+    melhor: Optional[Candidato]         # menor custo viável
+    avaliados: int
+    podados: int                        # candidatos descartados sem avaliar (caixa, carta ou região dominada)
+    completo: bool                      # False: o tempo acabou antes de visitar todas as regiões
+
+def _domina(a: Candidato, desembolso: Decimal, custo: Decimal) -> bool:
+    return a.desembolso <= desembolso and a.custo <= custo
+
+def _inserir(fronteira: List[Candidato], c: Candidato) -> None:
+    if any(_domina(f, c.desembolso, c.custo) for f in fronteira):
+        return
+    fronteira[:] = [f for f in fronteira if not _domina(c, f.desembolso, f.custo)]
+    fronteira.append(c)
+
+def _variante(ci: ConsorcioInput, reducao: Reducao) -> ConsorcioInput:
+    # Lance "próprio" só para o prefixo/sufixo calcularem o abatimento; a fonte fica no candidato
+    if reducao is None:
+        return replace(ci, parcela_reduzida=False, lance=Lance(fonte="proprio"))
+    pct, meses = reducao
+    return replace(ci, parcela_reduzida=True, parcela_reduzida_pct=Decimal(pct),
+                   parcela_reduzida_meses=int(meses), lance=Lance(fonte="proprio"))
+
+def _exigidos(curva: Optional[Dict[int, Decimal]], n: int) -> List[Optional[Decimal]]:
+    # Lance mínimo (%) por mês 0..N: o do maior mês da curva <= k; None antes do primeiro
+    if curva is None:
+        return [_ZERO] * (n + 1)
+    exigido: List[Optional[Decimal]] = [None] * (n + 1)
+    atual = None
+    for k in range(1, n + 1):
+        if k in curva:
+            atual = Decimal(curva[k])
+        exigido[k] = atual
+    return exigido
+
+def otimizar_lance(ci: ConsorcioInput, objetivo: Optional[str] = None, caixa: Optional[Decimal] = None,
+                   carta_minima: Optional[Decimal] = None, meses: Optional[Iterable[int]] = None,
+                   lances_pct: Optional[Iterable[Decimal]] = None, fontes: Iterable[str] = FONTES,
+                   reducoes: Optional[Iterable[Reducao]] = None,
+                   lance_minimo: Optional[Dict[int, Decimal]] = None,
+                   taxa_desconto_anual: Optional[Decimal] = None,
+                   tempo_max_s: Optional[float] = None) -> ResultadoOtimizacao:
+    """
+    Padrões: objetivo "vpl" com taxa de desconto (a do argumento ou das
+    hipóteses), senão "total_pago_liquido"; todos os meses; lances de 0% a 50%
+    de 5 em 5; as duas fontes; sem parcela reduzida e a opção de ``ci``.
+    """
+    n = ci.prazo_total_meses
+    meses = sorted(set(range(1, n + 1) if meses is None else meses))
+    if any(not 1 <= k <= n for k in meses):
+        raise ValueError(f"Mês de contemplação inválido: deve ser entre 1 e {n}.")
+    lances_pct = sorted({Decimal(x) for x in (LANCES_PADRAO if lances_pct is None else lances_pct)})
+    if any(x < 0 for x in lances_pct):
+        raise ValueError("Lance deve ser >= 0% da carta.")
+    fontes = list(dict.fromkeys(fontes))
+    if not fontes or any(f not in FONTES for f in fontes):
+        raise ValueError(f"Fontes de lance válidas: {', '.join(FONTES)}")
+    if reducoes is None:
+        reducoes = [None] + ([(ci.parcela_reduzida_pct, ci.parcela_reduzida_meses)] if ci.parcela_reduzida else [])
+    reducoes = list(dict.fromkeys(None if r is None else (Decimal(r[0]), int(r[1])) for r in reducoes))
+    if taxa_desconto_anual is None:
+        taxa_desconto_anual = ci.hipoteses.taxa_desconto_anual
+    objetivo = objetivo or ("vpl" if taxa_desconto_anual else "total_pago_liquido")
+    if objetivo not in OBJETIVOS:
+        raise ValueError(f"Objetivo inválido: {objetivo!r} (use {' ou '.join(OBJETIVOS)})")
+    if objetivo == "vpl" and not taxa_desconto_anual:
+        raise ValueError("Objetivo vpl requer taxa de desconto.")
+    desconto = fatores_desconto(taxa_desconto_anual, n) if taxa_desconto_anual else None
+    exigido = _exigidos(lance_minimo, n)
+    limite = None if tempo_max_s is None else perf_counter() + tempo_max_s
+
+    with perf.fase("otimizador"), contexto():
+        fr_total = _fr_total(ci)
+        contemplacao_fixa = ci.taxas_contemplacao_valor or _ZERO
+        # Regiões (parcela reduzida, mês) com o limite inferior do custo
+        regioes = []
+        podados = 0
+        with perf.fase("otimizador.prefixos"):
+            for r in reducoes:
+                cv = _variante(ci, r)
+                p = _prefixo(cv, desconto)
+                somas = _Somas(p, desconto)
+                for k in meses:
+                    if exigido[k] is None:
+                        podados += len(lances_pct) * len(fontes)
+                        continue
+                    adesao = ci.taxa_adesao_valor if k == 1 and ci.taxa_adesao_valor else _ZERO
+                    folga = _MEIO_CENTAVO * (n - k + 1)
+                    if objetivo == "vpl":
+                        lb = (p.vpl[k - 1].scaleb(-2) + p.fixo * (somas.v[n] - somas.v[k - 1])
+                              + (contemplacao_fixa + adesao) * desconto[k - 1] - folga)
+                    else:
+                        lb = (p.centavos[k - 1] * Decimal("0.01") + p.fixo * (n - k + 1)
+                              + contemplacao_fixa + adesao - fr_total - folga)
+                    regioes.append((lb, r, k, cv, p, somas))
+        regioes.sort(key=lambda x: x[0])
+
+        fronteira: List[Candidato] = []
+        avaliados = 0
+        completo = True
+        for lb, r, k, cv, p, somas in regioes:
+            if limite is not None and perf_counter() > limite:
+                completo = False
+                break
+            carta_k = p.carta[k]
+            validos = [pct for pct in lances_pct if pct >= exigido[k]]
+            podados += (len(lances_pct) - len(validos)) * len(fontes)
+            if not validos:
+                continue
+            minimo = _ZERO if "embutido" in fontes or validos[0] == 0 else validos[0] / _CEM * carta_k
+            if any(_domina(f, minimo, lb) for f in fronteira):
+                podados += len(validos) * len(fontes)
+                continue
+            for pct in validos:
+                valor_lance = pct / _CEM * carta_k
+                calculado = None
+                for fonte in fontes:
+                    if pct == 0 and fonte == "embutido":
+                        podados += 1                       # sem lance, a fonte não importa
+                        continue
+                    desembolso = valor_lance if fonte == "proprio" else _ZERO
+                    carta_liquida = carta_k - (valor_lance if fonte == "embutido" else _ZERO)
+                    if (caixa is not None and desembolso > caixa) or \
+                            (carta_minima is not None and carta_liquida < carta_minima):
+                        podados += 1
+                        continue
+                    if calculado is None:                  # as duas fontes custam o mesmo
+                        calculado = _avaliar(cv, p, somas, k, pct, desconto)
+                        avaliados += 1
+                    lance, total, vpl = calculado
+                    total_liq = total - fr_total
+                    _inserir(fronteira, Candidato(
+                        mes_contemplacao=k, lance_pct=pct, fonte=fonte, reducao=r, lance=lance,
+                        desembolso=desembolso, carta_liquida=carta_liquida, total_pago_liquido=total_liq,
+                        vpl=vpl, custo=vpl if objetivo == "vpl" else total_liq))
+
+        with perf.fase("otimizador.exato"):
+            exatos = []
+            prefixos = {}
+            for c in fronteira:
+                if c.reducao not in prefixos:
+                    cv = _variante(ci, c.reducao)
+                    prefixos[c.reducao] = (cv, _prefixo(cv, desconto))
+                cv, p = prefixos[c.reducao]
+                lance, total, vpl = _avaliar(cv, p, None, c.mes_contemplacao, c.lance_pct, desconto)
+                total_liq = _q2(_q2(total) - fr_total)
+                vpl = _q2(vpl) if desconto else None
+                c = replace(c, lance=_q2(lance), desembolso=_q2(c.desembolso), carta_liquida=_q2(c.carta_liquida),
+                            total_pago_liquido=total_liq, vpl=vpl,
+                            custo=vpl if objetivo == "vpl" else total_liq)
+                _inserir(exatos, c)
+        exatos.sort(key=lambda c: (c.desembolso, c.custo))
+        perf.contar("otimizador.avaliados", avaliados)
+        perf.contar("otimizador.podados", podados)
+        return ResultadoOtimizacao(
+            fronteira=exatos,
+            melhor=min(exatos, key=lambda c: (c.custo, c.desembolso)) if exatos else None,
+            avaliados=avaliados, podados=podados, completo=completo,
+        )
+
+def linha(c: Candidato) -> Dict[str, object]:
+    return {
+        "mes_contemplacao": c.mes_contemplacao, "lance_pct": c.lance_pct, "fonte": c.fonte,
+        "reduzida_pct": c.reducao[0] if c.reducao else None, "reduzida_meses": c.reducao[1] if c.reducao else None,
+        "lance": c.lance, "desembolso": c.desembolso, "carta_liquida": c.carta_liquida,
+        "total_pago_liquido": c.total_pago_liquido, "vpl": c.vpl, "custo": c.custo,
+    }
+
+def escrever_csv(candidatos: Sequence[Candidato], f: TextIO) -> None:
+    w = csv.writer(f)
+    w.writerow(CAMPOS)
+    for c in candidatos:
+        d = linha(c)
+        w.writerow(["" if d[k] is None else str(d[k]) for k in CAMPOS])
@@ -0,0 +1,112 @@
+# src/simfin/perf.py
+"""
+Instrumentação opcional: cronômetros por fase e contadores.
+
+Desligada por padrão. ``fase(nome)`` devolve um contexto vazio compartilhado
+e ``contar`` retorna logo no primeiro teste, então o custo desligado é uma
+chamada de função por fase (as fases são por simulação/exportação, nunca por
+mês). Ligue com ``ativar()`` ou ``simfin ... --profile``.
+
+Os tempos são inclusivos (uma fase conta também as fases internas) e valem
+para o processo atual; os processos do lote não reportam de volta.
+
+Para uma etapa de dentro do laço mensal, ``medido(nome, fn)`` devolve ``fn``
+com o tempo de cada chamada somado na fase ``nome`` (uma chamada por uso).
+Desligada, devolve a própria ``fn``: o laço é o mesmo com ou sem perfil.
+"""
+from __future__ import annotations
+from contextlib import nullcontext
+from time import perf_counter
+from typing import Dict
+
+ATIVO = False
+
+_tempos: Dict[str, float] = {}
+_chamadas: Dict[str, int] = {}
+_contadores: Dict[str, int] = {}
+_NADA = nullcontext()
+_cache_inicial: Dict[str, dict] = {}
+
+class _Fase:
+    __slots__ = ("nome", "t0")
+
+    def __init__(self, nome: str):
+        self.nome = nome
+
+    def __enter__(self):
+        self.t0 = perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        dt = perf_counter() - self.t0
+        _tempos[self.nome] = _tempos.get(self.nome, 0.0) + dt
+        _chamadas[self.nome] = _chamadas.get(self.nome, 0) + 1
+
+def fase(nome: str):
+    return _Fase(nome) if ATIVO else _NADA
+
+def medido(nome: str, fn):
+    if not ATIVO:
+        return fn
+
+    def cronometrada(*args):
+        t0 = perf_counter()
+        r = fn(*args)
+        _tempos[nome] = _tempos.get(nome, 0.0) + (perf_counter() - t0)
+        _chamadas[nome] = _chamadas.get(nome, 0) + 1
+        return r
+    return cronometrada
+
+def contar(nome: str, n: int = 1) -> None:
+    if ATIVO:
+        _contadores[nome] = _contadores.get(nome, 0) + n
+
+def zerar() -> None:
+    _tempos.clear()
+    _chamadas.clear()
+    _contadores.clear()
+
+def _cache_taxas() -> Dict[str, dict]:
+    from .indices import cache_taxas_info
+    info = cache_taxas_info()
+    return {k: v for k, v in info.items() if isinstance(v, dict)}
+
+def ativar(zerar_antes: bool = True) -> None:
+    global ATIVO
+    if zerar_antes:
+        zerar()
+        _cache_inicial.clear()
+        _cache_inicial.update(_cache_taxas())
+    ATIVO = True
+
+def desativar() -> None:
+    global ATIVO
+    ATIVO = False
+
+def relatorio() -> dict:
+    # Acertos/faltas do cache de taxas contados desde ativar()
+    cache = {}
+    for nome, atual in _cache_taxas().items():
+        ini = _cache_inicial.get(nome, {})
+        cache[nome] = {k: atual[k] - ini.get(k, 0) for k in ("hits", "misses")}
+    return {
+        "fases": {n: {"segundos": _tempos[n], "chamadas": _chamadas[n]}
+                  for n in sorted(_tempos, key=_tempos.get, reverse=True)},
+        "contadores": dict(sorted(_contadores.items())),
+        "cache_taxas": cache,
+    }
+
+def formatar(r: dict = None) -> str:
+    r = r or relatorio()
+    linhas = [f"{'fase':<28}{'ms':>12}{'chamadas':>10}"]
+    for nome, f in r["fases"].items():
+        linhas.append(f"{nome:<28}{f['segundos'] * 1000:>12.3f}{f['chamadas']:>10}")
+    if r["contadores"]:
+        linhas.append("")
+        linhas.append(f"{'contador':<28}{'valor':>12}")
+        for nome, v in r["contadores"].items():
+            linhas.append(f"{nome:<28}{v:>12}")
+    linhas.append("")
+    for nome, c in r["cache_taxas"].items():
+        linhas.append(f"cache {nome}: {c['hits']} acertos, {c['misses']} faltas")
+    return "\n".join(linhas)
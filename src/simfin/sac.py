@@ -1,83 +1,183 @@
 from __future__ import annotations
-from decimal import Decimal, ROUND_HALF_UP, getcontext
-from typing import List, Dict, Optional
+from decimal import Decimal, ROUND_HALF_UP
+from itertools import repeat
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple, Union
 
 from .models import Resultado, EntradaPrazo, EntradaValor
-from .indices import taxa_mensal, aplicar_tr_e_ipca
+from .contexto import contexto, em_contexto
+from .cronograma import CAMPOS_SAC, Cronograma, para_centavos, de_centavos
+from .indices import taxa_mensal, fator_correcao_mensal, fatores_correcao_serie
+from . import perf
 
 Q = Decimal("0.01")
+PRAZO_MINIMO_BUSCA = 6
 
 def _quant(v: Decimal) -> Decimal:
     return v.quantize(Q, rounding=ROUND_HALF_UP)
 
-def simular_sac_por_prazo(e: EntradaPrazo) -> Resultado:
-    getcontext().prec = 28
-
-    valor_financiado = e.valor_imovel - e.entrada
-    if e.prazo <= 0 or e.prazo > e.prazo_oficial:
-        raise ValueError("Prazo inválido: deve ser entre 1 e prazo_oficial.")
-
-    juros_m = taxa_mensal(e.juros_anual)
-    amortizacao = (valor_financiado / Decimal(e.prazo))
+Fatores = Union[Decimal, Sequence[Decimal]]
 
+def _passos_sac(valor_financiado: Decimal, juros_m: Decimal, fator_correcao: Fatores,
+                encargos: Decimal, prazo: int
+                ) -> Iterator[Tuple[int, Decimal, Decimal, Decimal, Decimal]]:
+    # Laço mensal do SAC: (mes, parcela, juros, amortizacao, novo_saldo), sem arredondar.
+    # fator_correcao = (1 + tr_m) * (1 + ipca_m): constante (calculado uma vez por
+    # simulação) ou um por mês, quando a entrada usa séries históricas.
+    # Usa o contexto Decimal de quem consome: chame dentro de contexto() ou via em_contexto.
+    fatores = repeat(fator_correcao) if isinstance(fator_correcao, Decimal) else fator_correcao
+    amortizacao = (valor_financiado / Decimal(prazo))
     saldo = valor_financiado
-    parcelas: List[Dict[str, Decimal]] = []
-
-    for mes in range(1, e.prazo + 1):
-        saldo_corrigido = aplicar_tr_e_ipca(saldo, e.tr_anual, e.ipca_anual)
+    for mes, fator in zip(range(1, prazo + 1), fatores):
+        saldo_corrigido = saldo * fator
         juros = saldo_corrigido * juros_m
         # Ajuste final para não deixar saldo negativo
         amort = amortizacao if saldo_corrigido > amortizacao else saldo_corrigido
-        parcela = amort + juros + e.encargos_fixos_mensais
+        parcela = amort + juros + encargos
         novo_saldo = saldo_corrigido - amort
+        yield mes, parcela, juros, amort, novo_saldo
+        saldo = novo_saldo
+
+def _validar_prazo(e: EntradaPrazo) -> None:
+    if e.prazo <= 0 or e.prazo > e.prazo_oficial:
+        raise ValueError("Prazo inválido: deve ser entre 1 e prazo_oficial.")
 
-        parcelas.append({
-            "mes": Decimal(mes),
-            "parcela": _quant(parcela),
-            "juros": _quant(juros),
-            "amortizacao": _quant(amort),
-            "saldo_devedor": _quant(novo_saldo),
-        })
+def _fatores(e: Union[EntradaPrazo, EntradaValor], meses: int) -> Fatores:
+    if e.tr_serie is None and e.ipca_serie is None:
+        return fator_correcao_mensal(e.tr_anual, e.ipca_anual)
+    return fatores_correcao_serie(e.tr_anual, e.ipca_anual, meses, e.serie_inicio,
+                                  tr_serie=e.tr_serie, ipca_serie=e.ipca_serie)
 
-        saldo = novo_saldo
+def _passos_centavos_sac(e: EntradaPrazo) -> Iterator[Tuple[int, int, int, int, int]]:
+    valor_financiado = e.valor_imovel - e.entrada
+    juros_m = taxa_mensal(e.juros_anual)
+    centavos = perf.medido("sac.arredondamento", para_centavos)
+    for mes, parcela, juros, amort, novo_saldo in _passos_sac(
+            valor_financiado, juros_m, _fatores(e, e.prazo), e.encargos_fixos_mensais, e.prazo):
+        yield (mes, centavos(parcela), centavos(juros), centavos(amort), centavos(novo_saldo))
+
+def _centavos_sac(e: EntradaPrazo) -> Iterator[Tuple[int, int, int, int, int]]:
+    # Meses em inteiros na ordem de CAMPOS_SAC (mes sem escala, demais em centavos
+    # arredondados com ROUND_HALF_UP, como no cronograma colunar)
+    return em_contexto(_passos_centavos_sac(e))
+
+def iter_sac(e: EntradaPrazo) -> Iterator[Dict[str, Decimal]]:
+    # Meses sob demanda, como dicts (mesmas chaves e valores das linhas do cronograma)
+    _validar_prazo(e)
+    return ({"mes": Decimal(mes), "parcela": de_centavos(p), "juros": de_centavos(j),
+             "amortizacao": de_centavos(a), "saldo_devedor": de_centavos(s)}
+            for mes, p, j, a, s in _centavos_sac(e))
+
+def simular_sac_por_prazo(e: EntradaPrazo, colunas: Optional[Iterable[str]] = None) -> Resultado:
+    # colunas: campos do cronograma a guardar (padrão: todos; () = só o resumo)
+    _validar_prazo(e)
+    parcelas = Cronograma(CAMPOS_SAC, colunas)
+    total_pago = 0
+    primeira = parcela_c = None
 
-    total_pago = sum(p["parcela"] for p in parcelas)
+    with perf.fase("sac.meses"):
+        for valores in _centavos_sac(e):
+            parcela_c = valores[1]
+            if primeira is None:
+                primeira = parcela_c
+            total_pago += parcela_c
+            parcelas.append(valores)
+    perf.contar("cronogramas")
+    perf.contar("meses_simulados", e.prazo)
 
     return Resultado(
-        valor_total_pago=_quant(total_pago),
-        primeira_parcela=parcelas[0]["parcela"],
-        ultima_parcela=parcelas[-1]["parcela"],
+        valor_total_pago=de_centavos(total_pago),
+        primeira_parcela=de_centavos(primeira),
+        ultima_parcela=de_centavos(parcela_c),
         prazo_utilizado=e.prazo,
         parcelas_detalhadas=parcelas,
     )
 
-def simular_sac_por_valor(e: EntradaValor) -> Resultado:
+def resumir_sac(e: Union[EntradaPrazo, EntradaValor]) -> Resultado:
+    # Só os totais, em memória constante (cronograma sem colunas)
+    if isinstance(e, EntradaValor):
+        return simular_sac_por_valor(e, colunas=())
+    return simular_sac_por_prazo(e, colunas=())
+
+def _entrada_prazo(e: EntradaValor, prazo: int) -> EntradaPrazo:
+    return EntradaPrazo(
+        valor_imovel=e.valor_imovel,
+        entrada=e.entrada,
+        juros_anual=e.juros_anual,
+        tr_anual=e.tr_anual,
+        ipca_anual=e.ipca_anual,
+        encargos_fixos_mensais=e.encargos_fixos_mensais,
+        prazo=prazo,
+        prazo_oficial=e.prazo_oficial,
+        tr_serie=e.tr_serie,
+        ipca_serie=e.ipca_serie,
+        serie_inicio=e.serie_inicio,
+    )
+
+def _total_pago_sac(e: EntradaValor, juros_m: Decimal, fatores: Fatores, prazo: int) -> Decimal:
+    # Mesmo total de simular_sac_por_prazo, sem montar o cronograma (dentro de contexto())
+    valor_financiado = e.valor_imovel - e.entrada
+    parcelas = (p for _, p, _, _, _ in _passos_sac(valor_financiado, juros_m, fatores,
+                                                  e.encargos_fixos_mensais, prazo))
+    total = sum(map(perf.medido("sac.arredondamento", para_centavos), parcelas))
+    perf.contar("sac.totais_busca")
+    perf.contar("meses_simulados", prazo)
+    return de_centavos(total)
+
+def _total_monotono(e: EntradaValor, juros_m: Decimal, fatores: Fatores) -> bool:
+    """
+    Garante que o total pago cresce estritamente com o prazo.
+    Sem arredondamento, T(n+1) - T(n) >= valor_financiado * juros_m / 2 + encargos
+    quando juros, TR, IPCA e encargos são não negativos (a correção só aumenta
+    os saldos). O arredondamento de cada parcela desloca T(n) em até 0,005 * n,
+    então exigimos essa folga para todos os prazos até o oficial. Com séries,
+    a correção de cada mês não depende do prazo; basta nenhum fator ser < 1.
+    """
+    valor_financiado = e.valor_imovel - e.entrada
+    if valor_financiado <= 0:
+        return False
+    if min(juros_m, e.encargos_fixos_mensais) < 0:
+        return False
+    if isinstance(fatores, Decimal):
+        if min(e.tr_anual, e.ipca_anual) < 0:
+            return False
+    elif min(fatores) < 1:
+        return False
+    incremento_minimo = valor_financiado * juros_m / Decimal(2) + e.encargos_fixos_mensais
+    erro_arredondamento = Decimal("0.005") * Decimal(2 * e.prazo_oficial + 1)
+    return incremento_minimo > erro_arredondamento
+
+def _simular_sac_por_valor_linear(e: EntradaValor, colunas: Optional[Iterable[str]] = None) -> Resultado:
     # Busca linear simples pelo maior prazo cujo total <= valor_maximo.
-    # Alternativamente, poderíamos usar bisseção. Mantemos simples e previsível.
     melhor: Optional[Resultado] = None
-    for prazo in range(6, e.prazo_oficial + 1):
-        r = simular_sac_por_prazo(EntradaPrazo(
-            valor_imovel=e.valor_imovel,
-            entrada=e.entrada,
-            juros_anual=e.juros_anual,
-            tr_anual=e.tr_anual,
-            ipca_anual=e.ipca_anual,
-            encargos_fixos_mensais=e.encargos_fixos_mensais,
-            prazo=prazo,
-            prazo_oficial=e.prazo_oficial,
-        ))
+    for prazo in range(PRAZO_MINIMO_BUSCA, e.prazo_oficial + 1):
+        r = simular_sac_por_prazo(_entrada_prazo(e, prazo), colunas=())
         if r.valor_total_pago <= e.valor_maximo:
             melhor = r
     # Se não encontrou nenhum prazo viável, retorna o cenário mínimo (6 meses)
-    if melhor is None:
-        melhor = simular_sac_por_prazo(EntradaPrazo(
-            valor_imovel=e.valor_imovel,
-            entrada=e.entrada,
-            juros_anual=e.juros_anual,
-            tr_anual=e.tr_anual,
-            ipca_anual=e.ipca_anual,
-            encargos_fixos_mensais=e.encargos_fixos_mensais,
-            prazo=6,
-            prazo_oficial=e.prazo_oficial,
-        ))
-    return melhor
+    prazo = melhor.prazo_utilizado if melhor is not None else PRAZO_MINIMO_BUSCA
+    return simular_sac_por_prazo(_entrada_prazo(e, prazo), colunas)
+
+def simular_sac_por_valor(e: EntradaValor, colunas: Optional[Iterable[str]] = None) -> Resultado:
+    # Maior prazo cujo total <= valor_maximo. Com total monotônico no prazo,
+    # bisseção sobre os totais (sem montar cronogramas) e só o vencedor é
+    # simulado por completo; caso contrário, mantém a busca linear.
+    with perf.fase("sac.busca_valor"), contexto():
+        juros_m = taxa_mensal(e.juros_anual)
+        if e.prazo_oficial < PRAZO_MINIMO_BUSCA:
+            return _simular_sac_por_valor_linear(e, colunas)
+        fatores = _fatores(e, e.prazo_oficial)
+        if not _total_monotono(e, juros_m, fatores):
+            return _simular_sac_por_valor_linear(e, colunas)
+
+        lo, hi = PRAZO_MINIMO_BUSCA, e.prazo_oficial
+        if _total_pago_sac(e, juros_m, fatores, lo) > e.valor_maximo:
+            # Nenhum prazo viável: cenário mínimo (6 meses)
+            return simular_sac_por_prazo(_entrada_prazo(e, lo), colunas)
+        # Invariante: total(lo) <= valor_maximo
+        while lo < hi:
+            meio = (lo + hi + 1) // 2
+            if _total_pago_sac(e, juros_m, fatores, meio) <= e.valor_maximo:
+                lo = meio
+            else:
+                hi = meio - 1
+        return simular_sac_por_prazo(_entrada_prazo(e, lo), colunas)
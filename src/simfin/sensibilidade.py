@@ -0,0 +1,207 @@
+# src/simfin/sensibilidade.py
+"""
+Sensibilidades de primeira ordem sem re-simular.
+
+O laço mensal do motor (``sac._passos_sac``, ``consorcio._passos_consorcio``)
+roda uma vez com números duais: cada valor carrega, além do Decimal, suas
+derivadas em relação aos parâmetros (modo direto). Juros, TR, IPCA, correção
+e taxa de desconto entram como duais a partir da taxa mensal equivalente,
+d/da [(1 + a)^(1/12) - 1] = (1 + m) / (12 (1 + a)). Uma passada substitui as
+2k simulações com parâmetros deslocados.
+
+Os valores saem iguais aos do motor (mesmas operações, arredondamento por
+parcela). As derivadas são as do cronograma sem arredondar: o arredondamento
+a centavos é constante por partes e não tem derivada útil.
+
+Índices vindos de séries (``tr_serie``, ``ipca_serie``, ``correcao_serie_*``)
+não são parâmetros: a taxa anual correspondente não entra no cálculo.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from decimal import Decimal
+from itertools import repeat
+from operator import add, sub
+from typing import Dict, List, Optional, Tuple, Union
+
+from .consorcio import (ConsorcioInput, _POS_PARCELA, _passos_consorcio, _serie_correcao_mensal,
+                        _taxa_mensal_equivalente)
+from .contexto import contexto
+from .cronograma import de_centavos, para_centavos
+from .indices import taxa_mensal
+from .models import EntradaPrazo
+from .sac import _passos_sac, _validar_prazo
+from .series import taxas_serie
+from . import perf
+
+MEDIDAS = ("total_pago", "primeira_parcela", "vpl")
+_UM = Decimal(1)
+_ZERO = Decimal(0)
+_DOZE = Decimal(12)
+
+class Dual:
+    """Valor Decimal com o gradiente em relação aos parâmetros (tupla, um por parâmetro)."""
+    __slots__ = ("v", "d")
+
+    def __init__(self, v: Decimal, d: Tuple[Decimal, ...]):
+        self.v = v
+        self.d = d
+
+    def __add__(self, o):
+        if isinstance(o, Dual):
+            return Dual(self.v + o.v, tuple(map(add, self.d, o.d)))
+        return Dual(self.v + o, self.d)
+
+    def __radd__(self, o):
+        return Dual(o + self.v, self.d)
+
+    def __sub__(self, o):
+        if isinstance(o, Dual):
+            return Dual(self.v - o.v, tuple(map(sub, self.d, o.d)))
+        return Dual(self.v - o, self.d)
+
+    def __rsub__(self, o):
+        return Dual(o - self.v, tuple(-x for x in self.d))
+
+    def __mul__(self, o):
+        if isinstance(o, Dual):
+            v, ov = self.v, o.v
+            return Dual(v * ov, tuple(a * ov + v * b for a, b in zip(self.d, o.d)))
+        return Dual(self.v * o, tuple(a * o for a in self.d))
+
+    def __rmul__(self, o):
+        return Dual(o * self.v, tuple(o * a for a in self.d))
+
+    def __truediv__(self, o):
+        if isinstance(o, Dual):
+            v, ov = self.v, o.v
+            return Dual(v / ov, tuple((a * ov - v * b) / (ov * ov) for a, b in zip(self.d, o.d)))
+        return Dual(self.v / o, tuple(a / o for a in self.d))
+
+    def __rtruediv__(self, o):
+        v = self.v
+        return Dual(o / v, tuple(-o * a / (v * v) for a in self.d))
+
+    def __neg__(self):
+        return Dual(-self.v, tuple(-a for a in self.d))
+
+    # Comparações pelo valor (ramos do laço: ajuste final, min/max)
+    def __lt__(self, o):
+        return self.v < _valor(o)
+
+    def __le__(self, o):
+        return self.v <= _valor(o)
+
+    def __gt__(self, o):
+        return self.v > _valor(o)
+
+    def __ge__(self, o):
+        return self.v >= _valor(o)
+
+    def __repr__(self):
+        return f"Dual({self.v}, {self.d})"
+
+Numero = Union[Decimal, Dual]
+
+def _valor(x: Numero) -> Decimal:
+    return x.v if isinstance(x, Dual) else x
+
+def _derivadas(x: Numero, n: int) -> Tuple[Decimal, ...]:
+    # Zeros saem como 0 (produtos de zeros acumulam expoentes como 0E-623)
+    return tuple(a or _ZERO for a in x.d) if isinstance(x, Dual) else (_ZERO,) * n
+
+def _taxa_dual(taxa_anual: Decimal, mensal: Decimal, i: int, n: int) -> Dual:
+    # Taxa mensal como dual da i-ésima variável; o valor é o do motor (mesmo cache)
+    d = [_ZERO] * n
+    d[i] = (_UM + mensal) / (_DOZE * (_UM + taxa_anual))
+    return Dual(mensal, tuple(d))
+
+@dataclass
+class Sensibilidades:
+    parametros: List[str]
+    valores: Dict[str, Optional[Decimal]]            # total_pago, primeira_parcela, vpl (iguais ao motor)
+    derivadas: Dict[str, Dict[str, Decimal]]         # medida -> parâmetro -> d medida / d parâmetro
+
+def _desconto_dual(taxa_anual: Decimal, i: int, n: int) -> Dual:
+    # v = 1 / (1 + m): mesmo valor de valuation.fatores_desconto
+    return _UM / (_UM + _taxa_dual(taxa_anual, taxa_mensal(taxa_anual), i, n))
+
+def _acumular(parcelas, nomes: List[str], desconto_anual: Optional[Decimal]) -> Sensibilidades:
+    # Soma as parcelas duais: valores em centavos como o motor, derivadas sem arredondar
+    n = len(nomes)
+    v = _desconto_dual(desconto_anual, nomes.index("taxa_desconto_anual"), n) if desconto_anual else None
+    fator = _UM
+    total_c = vpl_c = 0
+    total = vpl = _ZERO
+    primeira = None
+    for parcela in parcelas:
+        c = para_centavos(_valor(parcela))
+        total_c += c
+        total = total + parcela
+        if primeira is None:
+            primeira = parcela
+        if v is not None:
+            fator = fator * v
+            vpl_c += fator.v * c
+            vpl = vpl + parcela * fator
+    valores = {"total_pago": de_centavos(total_c), "primeira_parcela": de_centavos(para_centavos(_valor(primeira))),
+               "vpl": Decimal(vpl_c).scaleb(-2) if v is not None else None}
+    medidas = {"total_pago": total, "primeira_parcela": primeira, "vpl": vpl if v is not None else None}
+    derivadas = {m: dict(zip(nomes, _derivadas(x, n))) for m, x in medidas.items() if x is not None}
+    return Sensibilidades(parametros=nomes, valores=valores, derivadas=derivadas)
+
+def sensibilidades_sac(e: EntradaPrazo, taxa_desconto_anual: Optional[Decimal] = None) -> Sensibilidades:
+    """
+    Derivadas de total pago, primeira parcela e VPL (com taxa de desconto) do
+    SAC por prazo em relação a juros_anual, tr_anual e ipca_anual (os que não
+    vêm de série) e à taxa de desconto, numa passada do laço mensal.
+    """
+    _validar_prazo(e)
+    nomes = ["juros_anual"] + [nome for nome, serie in (("tr_anual", e.tr_serie), ("ipca_anual", e.ipca_serie))
+                               if not serie]
+    if taxa_desconto_anual:
+        nomes.append("taxa_desconto_anual")
+    n = len(nomes)
+    with perf.fase("sensibilidade.sac"), contexto():
+        juros_m = _taxa_dual(e.juros_anual, taxa_mensal(e.juros_anual), 0, n)
+
+        def taxas(anual: Decimal, nome: str, serie: Optional[str]):
+            if serie:
+                return taxas_serie(serie, e.serie_inicio, e.prazo)
+            mensal = taxa_mensal(anual) if anual != 0 else _ZERO
+            return repeat(_taxa_dual(anual, mensal, nomes.index(nome), n), e.prazo)
+        fatores = [(_UM + t) * (_UM + i) for t, i in zip(taxas(e.tr_anual, "tr_anual", e.tr_serie),
+                                                         taxas(e.ipca_anual, "ipca_anual", e.ipca_serie))]
+        passos = _passos_sac(e.valor_imovel - e.entrada, juros_m, fatores, e.encargos_fixos_mensais, e.prazo)
+        return _acumular((p for _, p, _, _, _ in passos), nomes, taxa_desconto_anual)
+
+def sensibilidades_consorcio(ci: ConsorcioInput, taxa_desconto_anual: Optional[Decimal] = None) -> Sensibilidades:
+    """
+    Derivadas de total pago, primeira parcela e VPL do consórcio em relação a
+    correcao_anual (modo anual constante) e à taxa de desconto (padrão: a das
+    hipóteses), numa passada do laço mensal. A devolução do fundo de reserva
+    não depende desses parâmetros: o total líquido tem as derivadas do total.
+    """
+    if taxa_desconto_anual is None:
+        taxa_desconto_anual = ci.hipoteses.taxa_desconto_anual
+    series = _serie_correcao_mensal(ci)
+    constante = not ci.correcao_serie_nome and not (ci.correcao_modo == "serie_mensal" and ci.correcao_serie_mensal)
+    nomes = (["correcao_anual"] if constante else []) + (["taxa_desconto_anual"] if taxa_desconto_anual else [])
+    n = len(nomes)
+    with perf.fase("sensibilidade.consorcio"), contexto():
+        if constante:
+            series = [_taxa_dual(ci.correcao_anual, _taxa_mensal_equivalente(ci.correcao_anual), 0, n)] * len(series)
+        passos = _passos_consorcio(ci, series, saida=lambda x: x)
+        return _acumular((p[_POS_PARCELA] for p in passos), nomes, taxa_desconto_anual)
+
+def estimar(s: Sensibilidades, choques: Dict[str, Decimal]) -> Dict[str, Optional[Decimal]]:
+    """
+    Estimativa de primeira ordem das medidas com os parâmetros deslocados,
+    ex.: ``estimar(s, {"juros_anual": Decimal("0.005")})`` para juros +0,5 p.p.
+    """
+    desconhecidos = set(choques) - set(s.parametros)
+    if desconhecidos:
+        raise ValueError(f"Parâmetros sem sensibilidade: {', '.join(sorted(desconhecidos))}")
+    with contexto():
+        return {m: None if s.valores[m] is None else
+                (s.valores[m] + sum(s.derivadas[m][p] * Decimal(x) for p, x in choques.items())).quantize(Decimal("0.01"))
+                for m in MEDIDAS}
@@ -0,0 +1,241 @@
+# src/simfin/series.py
+"""
+Repositório local de séries históricas mensais (TR, IPCA, INCC, ...).
+
+Cada série é importada uma vez de CSV para um arquivo binário ``<NOME>.sfi``
+indexado por ano-mês: cabeçalho + taxas mensais (float64) + fatores
+acumulados (float64, ``acumulado[k]`` = produto de ``1 + taxa`` dos k
+primeiros meses). O arquivo é aberto via mmap, então abrir e consultar não
+parseia nada; ``fator(a, b)`` é uma divisão entre dois acumulados.
+
+As taxas voltam para os motores como Decimal pelo texto mais curto do float
+(``repr``), que reproduz exatamente os valores publicados (até 15 dígitos).
+Meses além do fim da série repetem a última taxa, como em
+``correcao_serie_mensal``.
+
+O diretório padrão é ``$SIMFIN_SERIES_DIR`` ou ``~/.simfin/series``.
+"""
+from __future__ import annotations
+import csv, mmap, os, re, struct, sys
+from array import array
+from datetime import date
+from decimal import Decimal
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple, Union
+
+from .contexto import contexto
+
+VARIAVEL_DIRETORIO = "SIMFIN_SERIES_DIR"
+EXTENSAO_SERIE = ".sfi"
+MAGICO = b"SFI1"
+_CABECALHO = struct.Struct("<4sIiI")     # mágico, nº de meses, 1º mês (ano*12 + mes-1), reservado
+TAMANHO_CACHE_JANELAS = 256
+
+Mes = Union[str, date, Tuple[int, int], int]
+
+_RE_ISO = re.compile(r"^(\d{4})-(\d{1,2})(?:-\d{1,2})?$")
+_RE_BR = re.compile(r"^(?:\d{1,2}/)?(\d{1,2})/(\d{4})$")
+
+def indice_mes(v: Mes) -> int:
+    # "2020-03", "2020-03-01", "03/2020", "01/03/2020", date ou (ano, mes) -> ano*12 + mes-1
+    if isinstance(v, int):
+        return v
+    if isinstance(v, date):
+        ano, mes = v.year, v.month
+    elif isinstance(v, tuple):
+        ano, mes = v
+    else:
+        s = str(v).strip()
+        m = _RE_ISO.match(s)
+        if m:
+            ano, mes = int(m.group(1)), int(m.group(2))
+        else:
+            m = _RE_BR.match(s)
+            if not m:
+                raise ValueError(f"Mês inválido: {v!r} (use AAAA-MM ou MM/AAAA)")
+            ano, mes = int(m.group(2)), int(m.group(1))
+    if not 1 <= mes <= 12:
+        raise ValueError(f"Mês inválido: {v!r}")
+    return ano * 12 + mes - 1
+
+def formatar_mes(i: int) -> str:
+    return f"{i // 12:04d}-{i % 12 + 1:02d}"
+
+def diretorio_series(diretorio: Optional[str] = None) -> str:
+    return diretorio or os.environ.get(VARIAVEL_DIRETORIO) or os.path.join(os.path.expanduser("~"), ".simfin", "series")
+
+def caminho_serie(nome: str, diretorio: Optional[str] = None) -> str:
+    if not re.match(r"^[A-Za-z0-9_\-]+$", nome):
+        raise ValueError(f"Nome de série inválido: {nome!r}")
+    return os.path.join(diretorio_series(diretorio), nome.upper() + EXTENSAO_SERIE)
+
+class SerieIndice:
+    """
+    Série mensal aberta do repositório. ``taxas_brutas`` e ``acumulado`` são
+    memoryviews de float64 sobre o arquivo mapeado.
+    """
+    __slots__ = ("nome", "inicio", "taxas_brutas", "acumulado", "_mm")
+
+    def __init__(self, nome: str, inicio: int, taxas_brutas, acumulado, mm=None):
+        self.nome = nome
+        self.inicio = inicio
+        self.taxas_brutas = taxas_brutas
+        self.acumulado = acumulado
+        self._mm = mm
+
+    def __len__(self) -> int:
+        return len(self.taxas_brutas)
+
+    def __repr__(self) -> str:
+        return f"SerieIndice({self.nome}, {formatar_mes(self.inicio)}..{formatar_mes(self.fim - 1)})"
+
+    @property
+    def fim(self) -> int:
+        # Primeiro mês após a série (índice ano*12 + mes-1)
+        return self.inicio + len(self.taxas_brutas)
+
+    def _posicao(self, mes: Mes) -> int:
+        k = indice_mes(mes) - self.inicio
+        if k < 0:
+            raise ValueError(f"Série {self.nome} começa em {formatar_mes(self.inicio)}; "
+                             f"sem dados para {formatar_mes(k + self.inicio)}")
+        return k
+
+    def taxa(self, mes: Mes) -> Decimal:
+        k = min(self._posicao(mes), len(self) - 1)
+        return Decimal(repr(self.taxas_brutas[k]))
+
+    def taxas(self, inicio: Mes, meses: int) -> List[Decimal]:
+        # Taxas de ``meses`` meses a partir de ``inicio`` (completadas com a última)
+        return list(_janela(self, self._posicao(inicio), meses))
+
+    def fator(self, inicio: Mes, fim: Mes) -> float:
+        # Correção acumulada dos meses em [inicio, fim), em O(1)
+        a, b = self._posicao(inicio), self._posicao(fim)
+        if b < a:
+            raise ValueError("Fim anterior ao início.")
+        return self._acumulado(b) / self._acumulado(a)
+
+    def _acumulado(self, k: int) -> float:
+        n = len(self)
+        if k <= n:
+            return self.acumulado[k]
+        return self.acumulado[n] * (1.0 + self.taxas_brutas[n - 1]) ** (k - n)
+
+@lru_cache(maxsize=TAMANHO_CACHE_JANELAS)
+def _janela(serie: SerieIndice, k: int, meses: int) -> Tuple[Decimal, ...]:
+    brutas = serie.taxas_brutas
+    n = len(brutas)
+    taxas = [Decimal(repr(x)) for x in brutas[k:min(k + meses, n)]]
+    ultima = taxas[-1] if taxas else Decimal(repr(brutas[n - 1]))
+    return tuple(taxas) + (ultima,) * (meses - len(taxas))
+
+def gravar_serie(nome: str, inicio: Mes, taxas: Sequence[Decimal], diretorio: Optional[str] = None) -> str:
+    # Grava (ou substitui) a série; taxas mensais em fração (0.0045 = 0,45% a.m.)
+    if not taxas:
+        raise ValueError("Série vazia.")
+    path = caminho_serie(nome, diretorio)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    taxas = [Decimal(str(t)) for t in taxas]
+    brutas = array("d", map(float, taxas))
+    acumulado = array("d", [1.0])
+    with contexto():
+        f = Decimal(1)
+        for t in taxas:
+            f *= Decimal(1) + t
+            acumulado.append(float(f))
+    if sys.byteorder != "little":
+        brutas.byteswap()
+        acumulado.byteswap()
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as arq:
+        arq.write(_CABECALHO.pack(MAGICO, len(brutas), indice_mes(inicio), 0))
+        brutas.tofile(arq)
+        acumulado.tofile(arq)
+    os.replace(tmp, path)
+    _abrir.cache_clear()
+    _janela.cache_clear()
+    return path
+
+@lru_cache(maxsize=32)
+def _abrir(path: str, mtime_ns: int, tamanho: int) -> SerieIndice:
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magico, n, inicio, _ = _CABECALHO.unpack_from(mm, 0)
+    if magico != MAGICO or tamanho != _CABECALHO.size + 8 * (2 * n + 1):
+        raise ValueError(f"Arquivo não é uma série simfin: {path}")
+    buf = memoryview(mm)[_CABECALHO.size:]
+    taxas, acumulado = buf[:8 * n].cast("d"), buf[8 * n:].cast("d")
+    if sys.byteorder != "little":
+        taxas, acumulado = array("d", taxas), array("d", acumulado)
+        taxas.byteswap()
+        acumulado.byteswap()
+    nome = os.path.basename(path)[:-len(EXTENSAO_SERIE)]
+    return SerieIndice(nome, inicio, taxas, acumulado, mm)
+
+def abrir_serie(nome: str, diretorio: Optional[str] = None) -> SerieIndice:
+    # Reaproveita o mapeamento enquanto o arquivo não muda
+    path = caminho_serie(nome, diretorio)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        raise ValueError(f"Série {nome!r} não encontrada em {diretorio_series(diretorio)} "
+                         f"(importe com: simfin series importar)") from None
+    return _abrir(path, st.st_mtime_ns, st.st_size)
+
+def listar_series(diretorio: Optional[str] = None) -> List[str]:
+    d = diretorio_series(diretorio)
+    if not os.path.isdir(d):
+        return []
+    return sorted(f[:-len(EXTENSAO_SERIE)] for f in os.listdir(d) if f.endswith(EXTENSAO_SERIE))
+
+def taxas_serie(nome: str, inicio: Optional[Mes], meses: int, diretorio: Optional[str] = None) -> List[Decimal]:
+    if inicio is None:
+        raise ValueError(f"Informe o mês inicial para usar a série {nome!r}.")
+    return abrir_serie(nome, diretorio).taxas(inicio, meses)
+
+def _numero(s: str) -> Decimal:
+    s = s.strip()
+    if "," in s:
+        s = s.replace(".", "").replace(",", ".")
+    return Decimal(s)
+
+def importar_csv(path: str, nome: str, diretorio: Optional[str] = None, em_percent: bool = False) -> SerieIndice:
+    """
+    Importa um CSV de duas colunas (mês; taxa mensal), como o exportado pelo
+    SGS do Banco Central: ``01/01/2000;0,21``. Aceita ``;``, ``,`` ou tab,
+    cabeçalho opcional e meses fora de ordem, mas não meses faltando.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        amostra = f.read(4096)
+        f.seek(0)
+        try:
+            dialeto = csv.Sniffer().sniff(amostra, delimiters=";,\t")
+        except csv.Error:
+            dialeto = csv.excel
+        valores = {}
+        for n, linha in enumerate(csv.reader(f, dialeto), start=1):
+            if not linha or not linha[0].strip():
+                continue
+            try:
+                mes = indice_mes(linha[0])
+            except ValueError:
+                if n == 1:
+                    continue    # cabeçalho
+                raise ValueError(f"{path}:{n}: mês inválido {linha[0]!r}") from None
+            if mes in valores:
+                raise ValueError(f"{path}:{n}: mês repetido {formatar_mes(mes)}")
+            try:
+                taxa = _numero(linha[1])
+            except (IndexError, ArithmeticError):
+                raise ValueError(f"{path}:{n}: taxa inválida") from None
+            valores[mes] = taxa / Decimal(100) if em_percent else taxa
+    if not valores:
+        raise ValueError(f"{path}: nenhum mês encontrado")
+    inicio, fim = min(valores), max(valores)
+    faltando = [formatar_mes(m) for m in range(inicio, fim + 1) if m not in valores]
+    if faltando:
+        raise ValueError(f"{path}: meses faltando na série: {', '.join(faltando[:5])}"
+                         + (" ..." if len(faltando) > 5 else ""))
+    gravar_serie(nome, inicio, [valores[m] for m in range(inicio, fim + 1)], diretorio)
+    return abrir_serie(nome, diretorio)
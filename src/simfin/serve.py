@@ -0,0 +1,246 @@
+# src/simfin/serve.py
+"""
+Serviço HTTP local (asyncio, só biblioteca padrão) para as simulações.
+
+Rotas (POST, corpo JSON no formato das linhas do lote):
+
+- ``/sac/prazo``, ``/sac/valor``: resumo do SAC (com CET);
+- ``/consorcio``: resumo do consórcio (mesmo JSON de ``--consorcio-json``);
+- ``/comparar``: ``{"financiamento": {...}, "consorcio": {...}, "taxa_desconto_anual": 0.10}``;
+- ``GET /saude``: contadores do serviço.
+
+``"parcelas": true`` no corpo inclui o cronograma na resposta. O cálculo roda
+num pool de processos; o laço de eventos só faz E/S. Requisições idênticas
+(mesma rota e mesmo JSON, em qualquer ordem de chaves) em andamento ao mesmo
+tempo compartilham um único cálculo. Acima de ``max_pendentes`` cálculos em
+andamento, o serviço responde 503 com ``Retry-After``.
+"""
+from __future__ import annotations
+import asyncio, json, os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from decimal import Decimal
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Tuple
+
+from .batch import COLUNAS_RESUMO, resumo, simular_entrada
+from .consorcio import ConsorcioResultado
+from .leitura import _D, _as_rate, consorcio_de_dict, entrada_de_dict
+from .valuation import cet, vpl_lote
+
+HOST_PADRAO = "127.0.0.1"
+PORTA_PADRAO = 8765
+MAX_PENDENTES_PADRAO = 256
+MAX_CORPO_BYTES = 1 << 20
+TIMEOUT_LEITURA_S = 30.0
+
+ROTAS = {"/sac/prazo": "prazo", "/sac/valor": "valor", "/consorcio": "consorcio", "/comparar": "comparar"}
+ERROS_ENTRADA = (ValueError, KeyError, TypeError, ArithmeticError)
+
+class Sobrecarga(RuntimeError):
+    pass
+
+class ErroHTTP(Exception):
+    def __init__(self, status: HTTPStatus, mensagem: str):
+        super().__init__(mensagem)
+        self.status = status
+
+# --- cálculo (roda no pool; funções de módulo para poderem ser enviadas a outro processo)
+
+def _parcelas(r) -> list:
+    cron = r.parcelas if isinstance(r, ConsorcioResultado) else r.parcelas_detalhadas
+    return [{k: str(v) for k, v in linha.items()} for linha in cron]
+
+def _simular(dados: Dict[str, Any], tipo: str, engine: str):
+    detalhar = bool(dados.pop("parcelas", False))
+    e = entrada_de_dict({**dados, "tipo": tipo})
+    r = simular_entrada(e, engine, colunas=None if detalhar else COLUNAS_RESUMO)
+    saida = resumo(r)
+    if tipo != "consorcio" and e.valor_imovel > e.entrada:
+        saida["cet"] = str(cet(e.valor_imovel - e.entrada, r.parcelas_detalhadas))
+    if detalhar:
+        saida["parcelas"] = _parcelas(r)
+    return r, saida
+
+def _comparar(dados: Dict[str, Any], engine: str) -> Dict[str, Any]:
+    fin = dict(dados["financiamento"])
+    tipo = str(fin.pop("tipo", "prazo"))
+    if tipo not in ("prazo", "valor"):
+        raise ValueError(f"Tipo de financiamento inválido: {tipo!r}")
+    res, saida_fin = _simular(fin, tipo, engine)
+    ci = consorcio_de_dict(dados["consorcio"])
+    if dados.get("taxa_desconto_anual") is not None:
+        ci.hipoteses.taxa_desconto_anual = _as_rate(_D(dados["taxa_desconto_anual"]))
+    cres = simular_entrada(ci, engine, colunas=COLUNAS_RESUMO)
+    saida = {"financiamento": saida_fin, "consorcio": resumo(cres)}
+    disc = ci.hipoteses.taxa_desconto_anual
+    if disc:
+        vpl_fin, vpl_con = vpl_lote([res.parcelas_detalhadas, cres.parcelas], disc)
+        q = Decimal("0.01")
+        saida["vpl"] = {"taxa_desconto_anual": str(disc), "financiamento": str(vpl_fin.quantize(q)),
+                        "consorcio": str(vpl_con.quantize(q))}
+    return saida
+
+def calcular(tipo: str, texto: str, engine: str = "decimal") -> Dict[str, Any]:
+    dados = json.loads(texto)
+    if tipo == "comparar":
+        return _comparar(dados, engine)
+    return _simular(dados, tipo, engine)[1]
+
+# --- serviço
+
+class Servico:
+    def __init__(self, workers: Optional[int] = None, max_pendentes: int = MAX_PENDENTES_PADRAO,
+                 engine: str = "decimal", executor: Optional[Executor] = None,
+                 max_corpo: int = MAX_CORPO_BYTES, timeout_leitura: float = TIMEOUT_LEITURA_S):
+        self.engine = engine
+        self.max_pendentes = max_pendentes
+        self.max_corpo = max_corpo
+        self.timeout_leitura = timeout_leitura
+        self._executor = executor or ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+        self._proprio = executor is None
+        self._em_voo: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._servidor: Optional[asyncio.AbstractServer] = None
+        self.estatisticas = {"requisicoes": 0, "calculos": 0, "coalescidas": 0, "rejeitadas": 0, "erros": 0}
+
+    async def calcular(self, tipo: str, dados: Dict[str, Any]) -> Dict[str, Any]:
+        # Uma chave por (rota, JSON canônico): requisições iguais esperam o mesmo cálculo
+        texto = json.dumps(dados, sort_keys=True, separators=(",", ":"))
+        chave = (tipo, texto)
+        fut = self._em_voo.get(chave)
+        if fut is not None:
+            self.estatisticas["coalescidas"] += 1
+        else:
+            if len(self._em_voo) >= self.max_pendentes:
+                self.estatisticas["rejeitadas"] += 1
+                raise Sobrecarga(f"{len(self._em_voo)} cálculos em andamento")
+            loop = asyncio.get_running_loop()
+            fut = loop.run_in_executor(self._executor, calcular, tipo, texto, self.engine)
+            self._em_voo[chave] = fut
+            fut.add_done_callback(lambda _f: self._em_voo.pop(chave, None))
+            self.estatisticas["calculos"] += 1
+        # shield: cliente que desconecta não cancela o cálculo dos demais
+        return await asyncio.shield(fut)
+
+    async def _ler_requisicao(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        linha = await reader.readline()
+        if not linha:
+            return None
+        try:
+            metodo, alvo, versao = linha.decode("latin-1").split()
+        except ValueError:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, "Linha de requisição inválida") from None
+        cabecalhos: Dict[str, str] = {"_versao": versao}
+        while True:
+            linha = await reader.readline()
+            if linha in (b"\r\n", b"\n", b""):
+                break
+            nome, _, valor = linha.decode("latin-1").partition(":")
+            cabecalhos[nome.strip().lower()] = valor.strip()
+        corpo = b""
+        if metodo == "POST":
+            if "content-length" not in cabecalhos:
+                raise ErroHTTP(HTTPStatus.LENGTH_REQUIRED, "Content-Length obrigatório")
+            try:
+                n = int(cabecalhos["content-length"])
+            except ValueError:
+                raise ErroHTTP(HTTPStatus.BAD_REQUEST, "Content-Length inválido") from None
+            if n > self.max_corpo:
+                raise ErroHTTP(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Corpo acima de {self.max_corpo} bytes")
+            corpo = await reader.readexactly(n)
+        return metodo, alvo.split("?", 1)[0], cabecalhos, corpo
+
+    async def _responder(self, metodo: str, rota: str, corpo: bytes) -> Tuple[HTTPStatus, Dict[str, Any]]:
+        if rota == "/saude":
+            if metodo != "GET":
+                raise ErroHTTP(HTTPStatus.METHOD_NOT_ALLOWED, "Use GET")
+            return HTTPStatus.OK, {"status": "ok", "em_andamento": len(self._em_voo), **self.estatisticas}
+        tipo = ROTAS.get(rota)
+        if tipo is None:
+            raise ErroHTTP(HTTPStatus.NOT_FOUND, f"Rota desconhecida: {rota}")
+        if metodo != "POST":
+            raise ErroHTTP(HTTPStatus.METHOD_NOT_ALLOWED, "Use POST com corpo JSON")
+        try:
+            dados = json.loads(corpo or b"{}")
+        except ValueError as exc:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, f"JSON inválido: {exc}") from None
+        if not isinstance(dados, dict):
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, "Corpo deve ser um objeto JSON")
+        try:
+            return HTTPStatus.OK, await self.calcular(tipo, dados)
+        except ERROS_ENTRADA as exc:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, f"{type(exc).__name__}: {exc}") from None
+
+    async def _conexao(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                extra: Dict[str, str] = {}
+                manter = False
+                try:
+                    req = await asyncio.wait_for(self._ler_requisicao(reader), self.timeout_leitura)
+                    if req is None:
+                        break
+                    metodo, rota, cabecalhos, corpo = req
+                    self.estatisticas["requisicoes"] += 1
+                    conexao = cabecalhos.get("connection", "").lower()
+                    manter = conexao == "keep-alive" or (cabecalhos["_versao"] == "HTTP/1.1" and conexao != "close")
+                    status, saida = await self._responder(metodo, rota, corpo)
+                except ErroHTTP as exc:
+                    self.estatisticas["erros"] += 1
+                    status, saida = exc.status, {"erro": str(exc)}
+                except Sobrecarga as exc:
+                    status, saida = HTTPStatus.SERVICE_UNAVAILABLE, {"erro": f"Serviço ocupado: {exc}"}
+                    extra["Retry-After"] = "1"
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception as exc:    # erro inesperado no cálculo: 500, sem derrubar o serviço
+                    self.estatisticas["erros"] += 1
+                    status, saida = HTTPStatus.INTERNAL_SERVER_ERROR, {"erro": f"{type(exc).__name__}: {exc}"}
+                writer.write(_resposta(status, saida, manter, extra))
+                await writer.drain()
+                if not manter:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def iniciar(self, host: str = HOST_PADRAO, porta: int = PORTA_PADRAO) -> asyncio.AbstractServer:
+        self._servidor = await asyncio.start_server(self._conexao, host, porta)
+        return self._servidor
+
+    @property
+    def porta(self) -> int:
+        return self._servidor.sockets[0].getsockname()[1]
+
+    async def fechar(self) -> None:
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        if self._proprio:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+def _resposta(status: HTTPStatus, corpo: Dict[str, Any], manter: bool, extra: Dict[str, str]) -> bytes:
+    dados = json.dumps(corpo, ensure_ascii=False).encode("utf-8")
+    cabecalhos = {
+        "Content-Type": "application/json; charset=utf-8",
+        "Content-Length": str(len(dados)),
+        "Connection": "keep-alive" if manter else "close",
+        **extra,
+    }
+    topo = f"HTTP/1.1 {status.value} {status.phrase}\r\n" + "".join(f"{k}: {v}\r\n" for k, v in cabecalhos.items())
+    return (topo + "\r\n").encode("latin-1") + dados
+
+def servir(host: str = HOST_PADRAO, porta: int = PORTA_PADRAO, **kw) -> None:
+    async def principal():
+        servico = Servico(**kw)
+        servidor = await servico.iniciar(host, porta)
+        print(f"simfin servindo em http://{host}:{servico.porta} (Ctrl+C para sair)", flush=True)
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            await servico.fechar()
+    try:
+        asyncio.run(principal())
+    except KeyboardInterrupt:
+        pass
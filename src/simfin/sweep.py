@@ -0,0 +1,100 @@
+# src/simfin/sweep.py
+"""
+Varredura de parâmetros do SAC (juros × TR × IPCA × prazo × entrada).
+
+Células com os mesmos juros, TR, IPCA e prazo compartilham taxas mensais,
+fator de correção e o cronograma "unitário" (valor financiado = 1): o SAC é
+linear no valor financiado, então cada célula sai do cronograma unitário
+escalado, mais os encargos. Só há um laço mensal por (juros, TR, IPCA, prazo).
+
+Sem ``exato``, o total é escalado sem arredondar parcela a parcela e pode
+diferir de simular_sac_por_prazo em até 0,005 por mês; com ``exato=True``
+cada parcela é arredondada como no motor (custo proporcional ao prazo).
+"""
+from __future__ import annotations
+import csv
+from dataclasses import dataclass
+from decimal import Decimal
+from itertools import product
+from typing import Dict, Iterable, List, Optional, Sequence, TextIO
+
+from .models import EntradaPrazo
+from .contexto import contexto
+from .indices import taxa_mensal, fator_correcao_mensal
+from .sac import _passos_sac, _quant, simular_sac_por_prazo
+from .valuation import fatores_desconto, vpl as _vpl
+
+CAMPOS = ["juros_anual", "tr_anual", "ipca_anual", "prazo", "entrada", "valor_financiado",
+          "primeira_parcela", "ultima_parcela", "total_pago", "vpl"]
+
+@dataclass
+class _Unitario:
+    parcelas: List[Decimal]     # amortização + juros por unidade financiada (sem encargos)
+    soma: Decimal
+    soma_descontada: Optional[Decimal]
+
+def _unitario(juros_m: Decimal, fator: Decimal, prazo: int,
+              desconto: Optional[Sequence[Decimal]]) -> _Unitario:
+    parcelas = [p for _, p, _, _, _ in _passos_sac(Decimal(1), juros_m, fator, Decimal(0), prazo)]
+    soma_d = sum(p * d for p, d in zip(parcelas, desconto)) if desconto else None
+    return _Unitario(parcelas=parcelas, soma=sum(parcelas), soma_descontada=soma_d)
+
+def varrer_sac(valor_imovel: Decimal, entradas: Sequence[Decimal], juros_anuais: Sequence[Decimal],
+               prazos: Sequence[int], tr_anuais: Sequence[Decimal] = (Decimal(0),),
+               ipca_anuais: Sequence[Decimal] = (Decimal(0),), encargos: Decimal = Decimal(0),
+               taxa_desconto_anual: Optional[Decimal] = None,
+               exato: bool = False) -> List[Dict[str, Decimal]]:
+    """
+    Grade densa, na ordem juros, TR, IPCA, prazo, entrada. Cada linha traz
+    primeira/última parcela, total e (com taxa de desconto) o VPL.
+    """
+    with contexto():
+        if any(p <= 0 for p in prazos):
+            raise ValueError("Prazo inválido: deve ser maior que zero.")
+        desconto = (fatores_desconto(taxa_desconto_anual, max(prazos))
+                    if taxa_desconto_anual and prazos else None)
+        desconto_acum: List[Decimal] = []
+        if desconto:
+            s = Decimal(0)
+            for d in desconto:
+                s += d
+                desconto_acum.append(s)
+
+        linhas: List[Dict[str, Decimal]] = []
+        for juros, tr, ipca in product(juros_anuais, tr_anuais, ipca_anuais):
+            juros_m = taxa_mensal(juros)
+            fator = fator_correcao_mensal(tr, ipca)
+            for prazo in prazos:
+                u = _unitario(juros_m, fator, prazo, desconto)
+                for entrada in entradas:
+                    V = valor_imovel - entrada
+                    if V < 0:
+                        # Fora do domínio linear (ajuste final do saldo inverte); usa o motor
+                        r = simular_sac_por_prazo(EntradaPrazo(
+                            valor_imovel=valor_imovel, entrada=entrada, juros_anual=juros,
+                            tr_anual=tr, ipca_anual=ipca, encargos_fixos_mensais=encargos,
+                            prazo=prazo, prazo_oficial=prazo))
+                        primeira, ultima, total = r.primeira_parcela, r.ultima_parcela, r.valor_total_pago
+                        vpl = _vpl(r.parcelas_detalhadas, taxa_desconto_anual) if desconto else None
+                    else:
+                        primeira = _quant(V * u.parcelas[0] + encargos)
+                        ultima = _quant(V * u.parcelas[-1] + encargos)
+                        if exato:
+                            total = _quant(sum(_quant(V * p + encargos) for p in u.parcelas))
+                        else:
+                            total = _quant(V * u.soma + encargos * prazo)
+                        vpl = (V * u.soma_descontada + encargos * desconto_acum[prazo - 1]
+                               if desconto else None)
+                    linhas.append({
+                        "juros_anual": juros, "tr_anual": tr, "ipca_anual": ipca,
+                        "prazo": prazo, "entrada": entrada, "valor_financiado": V,
+                        "primeira_parcela": primeira, "ultima_parcela": ultima,
+                        "total_pago": total,
+                        "vpl": _quant(vpl) if vpl is not None else None,
+                    })
+        return linhas
+
+def escrever_csv(linhas: Iterable[Dict[str, Decimal]], f: TextIO) -> None:
+    w = csv.writer(f)
+    w.writerow(CAMPOS)
+    w.writerows([("" if l[c] is None else str(l[c])) for c in CAMPOS] for l in linhas)
@@ -0,0 +1,160 @@
+# src/simfin/valuation.py
+"""
+VPL, TIR e CET de cronogramas (SAC, consórcio ou qualquer sequência de valores).
+
+Os vetores de desconto ``v^k`` (v = 1 / (1 + taxa mensal)) são montados uma
+vez por (taxa anual, horizonte) e ficam em cache; o VPL de um cronograma é um
+produto escalar com esse vetor. ``vpl_lote`` compara N ofertas com uma só
+construção de vetor.
+
+A TIR usa Newton sobre v com salvaguarda de bisseção e aceita um chute
+inicial (a taxa do contrato, ou a TIR de um cenário vizinho em ``cet_lote``).
+"""
+from __future__ import annotations
+from decimal import Decimal
+from functools import lru_cache
+from operator import mul
+from typing import Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .cronograma import Cronograma
+from .contexto import contexto
+from .indices import TAMANHO_CACHE_TAXAS, taxa_mensal
+from . import perf
+
+Numero = Union[Decimal, int, float, str]
+Parcelas = Union[Cronograma, Iterable[Mapping[str, Decimal]], Iterable[Numero]]
+
+MAX_ITERACOES_TIR = 100
+TOLERANCIA_TIR = Decimal("1e-20")
+_UM = Decimal(1)
+
+def _dec(x: Numero) -> Decimal:
+    return x if isinstance(x, Decimal) else Decimal(str(x))
+
+@lru_cache(maxsize=TAMANHO_CACHE_TAXAS)
+def _fatores_desconto(taxa_anual: Decimal, meses: int) -> Tuple[Decimal, ...]:
+    if taxa_anual == 0:
+        return (_UM,) * meses
+    with contexto():
+        v = _UM / (_UM + taxa_mensal(taxa_anual))
+        fatores, d = [], _UM
+        for _ in range(meses):
+            d *= v
+            fatores.append(d)
+    return tuple(fatores)
+
+def fatores_desconto(taxa_anual: Numero, meses: int) -> Tuple[Decimal, ...]:
+    # (v, v^2, ..., v^meses) para a taxa anual dada
+    return _fatores_desconto(_dec(taxa_anual), meses)
+
+def _valores(parcelas: Parcelas, campo: str) -> Tuple[Sequence, int]:
+    # (valores, expoente): Cronograma vai direto nos centavos (expoente -2)
+    if isinstance(parcelas, Cronograma):
+        return parcelas.centavos(campo), -2
+    valores = [p[campo] if isinstance(p, Mapping) else _dec(p) for p in parcelas]
+    return valores, 0
+
+def vpl_lote(cronogramas: Iterable[Parcelas], taxa_anual: Numero, campo: str = "parcela") -> List[Decimal]:
+    """
+    VPL de cada cronograma na mesma taxa (1ª parcela descontada um mês): um
+    vetor de desconto para o maior horizonte e um produto escalar por cronograma.
+    """
+    with perf.fase("valuation.vpl"), contexto():
+        fluxos = [_valores(c, campo) for c in cronogramas]
+        desconto = fatores_desconto(taxa_anual, max((len(v) for v, _ in fluxos), default=0))
+        return [Decimal(sum(map(mul, desconto, v))).scaleb(e) for v, e in fluxos]
+
+def vpl(parcelas: Parcelas, taxa_anual: Numero, campo: str = "parcela") -> Decimal:
+    return vpl_lote([parcelas], taxa_anual, campo)[0]
+
+def _g(fluxos: Sequence[Decimal], v: Decimal) -> Tuple[Decimal, Decimal]:
+    # sum f_k v^k e sua derivada em v (Horner)
+    g = dg = Decimal(0)
+    for f in reversed(fluxos):
+        dg = dg * v + g
+        g = g * v + f
+    return g, dg
+
+def _chute(fluxos: Sequence[Decimal]) -> Decimal:
+    # Juros sobre o saldo médio de um empréstimo amortizado linearmente
+    principal = -fluxos[0]
+    if principal <= 0 or len(fluxos) < 2:
+        return Decimal("0.01")
+    juros = sum(fluxos[1:]) - principal
+    return 2 * juros / (principal * (len(fluxos)))
+
+def tir(fluxos: Sequence[Numero], chute: Optional[Numero] = None) -> Decimal:
+    """
+    Taxa por período r com sum f_k / (1 + r)^k = 0, k = 0..n (f_0 no instante
+    zero; ex.: -valor liberado seguido das parcelas). Levanta ValueError se
+    os fluxos não trocam de sinal.
+    """
+    f = [_dec(x) for x in fluxos]
+    while f and f[0] == 0:
+        f.pop(0)    # zeros iniciais não mudam as raízes com v > 0
+    if not f:
+        raise ValueError("TIR indefinida: fluxo vazio.")
+    with perf.fase("valuation.tir"), contexto():
+        # Intervalo em v com troca de sinal: g(0) = f_0; v = 1, 2, 4, ... (taxas >= -99,9%)
+        lo, g_lo = Decimal(0), f[0]
+        hi, g_hi = _UM, sum(f)
+        while g_hi * g_lo > 0 and hi < 1024:
+            lo, g_lo = hi, g_hi
+            hi *= 2
+            g_hi = _g(f, hi)[0]
+        if g_lo == 0:
+            return _UM / lo - _UM
+        if g_hi == 0:
+            return _UM / hi - _UM
+        if g_hi * g_lo > 0:
+            raise ValueError("TIR indefinida: fluxos sem troca de sinal.")
+
+        c = _dec(chute) if chute is not None else _chute(f)
+        v = _UM / (_UM + c) if c > -1 else (lo + hi) / 2
+        if not lo < v < hi:
+            v = (lo + hi) / 2
+        for _ in range(MAX_ITERACOES_TIR):
+            perf.contar("tir.iteracoes")
+            g, dg = _g(f, v)
+            if g == 0:
+                break
+            if (g < 0) == (g_lo < 0):
+                lo, g_lo = v, g
+            else:
+                hi = v
+            if dg:
+                passo = g / dg
+                if abs(passo) <= TOLERANCIA_TIR * v:
+                    v -= passo
+                    break
+                novo = v - passo
+            else:
+                novo = lo
+            # Passo de Newton fora do intervalo: bisseção
+            v = novo if lo < novo < hi else (lo + hi) / 2
+        return _UM / v - _UM
+
+def _fluxos_cet(valor_liberado: Numero, parcelas: Parcelas, campo: str) -> List[Decimal]:
+    valores, e = _valores(parcelas, campo)
+    with contexto():
+        if e:
+            valores = [Decimal(c).scaleb(e) for c in valores]
+        return [-_dec(valor_liberado)] + list(valores)
+
+def _anual(taxa_m: Decimal) -> Decimal:
+    with contexto():
+        return (_UM + taxa_m) ** 12 - _UM
+
+def cet(valor_liberado: Numero, parcelas: Parcelas, campo: str = "parcela",
+        chute: Optional[Numero] = None) -> Decimal:
+    # Custo efetivo total ao ano: TIR mensal de (-valor liberado, parcelas...) anualizada
+    return _anual(tir(_fluxos_cet(valor_liberado, parcelas, campo), chute))
+
+def cet_lote(ofertas: Iterable[Tuple[Numero, Parcelas]], campo: str = "parcela",
+             chute: Optional[Numero] = None) -> List[Decimal]:
+    # CET de várias ofertas; cada TIR parte da anterior (ofertas parecidas convergem em 1-2 passos)
+    saida = []
+    for valor_liberado, parcelas in ofertas:
+        chute = tir(_fluxos_cet(valor_liberado, parcelas, campo), chute)
+        saida.append(_anual(chute))
+    return saida
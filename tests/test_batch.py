@@ -0,0 +1,50 @@
+import json
+from decimal import Decimal
+from simfin.batch import ler_lote, simular_lote
+
+SAC = {"tipo": "prazo", "valor_imovel": 250000, "entrada": 87500, "juros_anual": 8.47,
+       "juros_em_percent": True, "encargos": 120, "prazo": 120, "prazo_oficial": 360}
+
+def _arquivo(tmp_path):
+    linhas = [
+        json.dumps(SAC),
+        json.dumps({**SAC, "prazo": 500}),                  # prazo inválido
+        "{nao e json",
+        json.dumps({"tipo": "consorcio", "carta_credito_inicial": 100000, "prazo_total_meses": 10,
+                    "taxa_adm_total_pct": 0, "mes_contemplacao_alvo": 3}),
+        json.dumps({**SAC, "tipo": "valor", "valor_max": 200000}),
+        json.dumps({"tipo": "consorcio", "carta_credito_inicial": 1000, "prazo_total_meses": -5}),
+        json.dumps({"tipo": "consorcio", "carta_credito_inicial": 1000, "prazo_total_meses": 10, "lance": 5}),
+    ]
+    path = tmp_path / "lote.jsonl"
+    path.write_text("\n".join(linhas) + "\n", encoding="utf-8")
+    return str(path)
+
+def test_lote_isola_erros_e_preserva_ordem(tmp_path):
+    r = list(simular_lote(ler_lote(_arquivo(tmp_path)), workers=1))
+    assert [x["linha"] for x in r] == [1, 2, 3, 4, 5, 6, 7]
+    assert r[0]["prazo_utilizado"] == 120
+    assert "Prazo inválido" in r[1]["erro"]
+    assert "erro" in r[2]
+    assert r[3]["total_pago"] == "100000.00"
+    assert Decimal(r[4]["total_pago"]) <= Decimal("200000")
+    assert "prazo_total_meses" in r[5]["erro"]
+    assert "'lance'" in r[6]["erro"]
+
+def test_lote_em_processos_igual_sequencial(tmp_path):
+    path = _arquivo(tmp_path)
+    sequencial = list(simular_lote(ler_lote(path), workers=1))
+    assert list(simular_lote(ler_lote(path), workers=2, chunksize=2)) == sequencial
+    assert list(simular_lote(ler_lote(path), workers=3, pool="threads")) == sequencial
+
+def test_lote_csv_com_campos_aninhados(tmp_path):
+    path = tmp_path / "lote.csv"
+    path.write_text(
+        "tipo,carta_credito_inicial,prazo_total_meses,taxa_adm_total_pct,mes_contemplacao_alvo,lance.percent_carta,prazo,valor_imovel,entrada,juros_anual\n"
+        "consorcio,100000,10,0,3,20,,,,\n"
+        "prazo,,,,,,12,1000,0,0.1\n",
+        encoding="utf-8",
+    )
+    r = list(simular_lote(ler_lote(str(path)), workers=1))
+    assert r[0]["tipo"] == "consorcio" and r[0]["ultima_parcela"] == "7142.86"
+    assert r[1]["prazo_utilizado"] == 12
@@ -0,0 +1,27 @@
+import json
+from simfin import bench
+from simfin.cli import main
+import pytest
+
+def test_executar_e_comparar(tmp_path):
+    r = bench.executar(["sac_prazo_360", "consorcio_200_lance"], repeticoes=1)
+    assert set(r["cargas"]) == {"sac_prazo_360", "consorcio_200_lance"}
+    assert all(m["tempo_s"] > 0 and m["pico_bytes"] > 0 for m in r["cargas"].values())
+    assert bench.comparar(r, r) == []
+    rapido = json.loads(json.dumps(r))
+    rapido["cargas"]["sac_prazo_360"]["tempo_s"] /= 10
+    regressoes = bench.comparar(r, rapido, limite=0.5)
+    assert len(regressoes) == 1 and regressoes[0].startswith("sac_prazo_360: tempo")
+    with pytest.raises(ValueError):
+        bench.executar(["nao_existe"])
+
+def test_cli_bench_falha_com_regressao(tmp_path, capsys):
+    base = tmp_path / "base.json"
+    main(["bench", "--cargas", "sac_prazo_360", "--repeticoes", "1", "--salvar", str(base)])
+    dados = json.loads(base.read_text())
+    dados["cargas"]["sac_prazo_360"]["pico_bytes"] //= 4
+    base.write_text(json.dumps(dados))
+    with pytest.raises(SystemExit) as exc:
+        main(["bench", "--cargas", "sac_prazo_360", "--repeticoes", "1", "--comparar", str(base), "--limite", "1"])
+    assert exc.value.code == 1
+    assert "REGRESSÃO sac_prazo_360: memória" in capsys.readouterr().out
@@ -0,0 +1,66 @@
+import multiprocessing, os
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from simfin.batch import COLUNAS_RESUMO, simular_entrada, simular_lote
+from simfin.cache import CacheResultados, abrir, chave
+from simfin.consorcio import ConsorcioInput, simular_consorcio
+from simfin.models import EntradaPrazo
+from simfin.sac import simular_sac_por_prazo
+
+def _entrada(juros="0.0847", prazo=240):
+    return EntradaPrazo(valor_imovel=Decimal("250000"), entrada=Decimal("87500"), juros_anual=Decimal(juros),
+                        tr_anual=Decimal(0), ipca_anual=Decimal("0.04"), encargos_fixos_mensais=Decimal(120),
+                        prazo=prazo, prazo_oficial=360)
+
+def test_ida_e_volta_e_colunas(tmp_path):
+    c = CacheResultados(str(tmp_path))
+    e = _entrada()
+    assert chave(e) == chave(_entrada("0.08470")) != chave(e, "fast") != chave(_entrada(prazo=241))
+
+    resumo = simular_entrada(e, colunas=COLUNAS_RESUMO, cache=c)
+    assert simular_entrada(e, colunas=COLUNAS_RESUMO, cache=c) == resumo
+    completo = simular_entrada(e, cache=c)     # resumo guardado não atende o cronograma completo
+    assert completo == simular_sac_por_prazo(e)
+    assert simular_entrada(e, cache=c) == completo and simular_entrada(e, colunas=COLUNAS_RESUMO, cache=c) == completo
+
+    ci = ConsorcioInput(administradora="X", grupo="1", cota="1", carta_credito_inicial=Decimal(200000),
+                        prazo_total_meses=120, correcao_anual=Decimal("0.05"))
+    simular_entrada(ci, cache=c)
+    assert simular_entrada(ci, cache=c) == simular_consorcio(ci)
+    st = c.estatisticas()
+    assert (st["acertos"], st["faltas"], st["entradas"]) == (4, 3, 2)
+
+def test_lru_por_tamanho(tmp_path):
+    c = CacheResultados(str(tmp_path), max_bytes=1)
+    for p in (120, 180, 240):
+        simular_entrada(_entrada(prazo=p), cache=c)
+    st = c.estatisticas()
+    assert st["entradas"] == 0 and st["despejos"] == 3
+    c.max_bytes = 1 << 20
+    for p in (120, 180, 240):
+        simular_entrada(_entrada(prazo=p), cache=c)
+    simular_entrada(_entrada(prazo=120), cache=c)        # 120 vira o mais recente
+    c.max_bytes = c.estatisticas()["bytes"] - 1
+    simular_entrada(_entrada(prazo=300), cache=c)
+    assert c.obter(_entrada(prazo=120)) is not None and c.obter(_entrada(prazo=180)) is None
+
+def test_lote_com_cache(tmp_path):
+    regs = [(i, {"tipo": "prazo", "valor_imovel": 250000, "entrada": 87500, "juros_anual": 0.0847,
+                 "prazo": 120 + (i % 3)}) for i in range(1, 7)]
+    d = str(tmp_path)
+    sem = list(simular_lote(regs, workers=1))
+    assert list(simular_lote(regs, workers=1, cache_dir=d)) == sem
+    assert list(simular_lote(regs, workers=2, cache_dir=d)) == sem
+    st = CacheResultados(d).estatisticas()
+    assert st["entradas"] == 3 and st["acertos"] == 9 and st["faltas"] == 3
+
+def _conexao(d):
+    return os.getpid(), id(abrir(d)._db)
+
+def test_conexao_nao_atravessa_fork(tmp_path):
+    d = str(tmp_path)
+    pai = _conexao(d)
+    assert _conexao(d) == pai                      # mesma conexão no mesmo processo
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("fork")) as ex:
+        filho = ex.submit(_conexao, d).result()
+    assert filho[0] != pai[0] and filho[1] != pai[1]
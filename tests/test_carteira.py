@@ -0,0 +1,64 @@
+import json
+from decimal import Decimal
+from simfin.batch import simular_entrada
+from simfin.carteira import agregar_carteira, totais
+from simfin.cli import main
+from simfin.leitura import entrada_de_dict
+from simfin.series import indice_mes
+from simfin.valuation import vpl
+
+CONTRATOS = [
+    {"tipo": "prazo", "valor_imovel": 300000, "entrada": 60000, "juros_anual": 0.0947, "tr_anual": 0.01,
+     "prazo": 120, "encargos": 80, "inicio": "2021-03"},
+    {"tipo": "consorcio", "carta_credito_inicial": 200000, "prazo_total_meses": 100, "correcao_anual": 0.05,
+     "fundo_reserva_pct": 2, "seguro_mensal_valor": 40, "taxa_adesao_valor": 300, "lance": {"percent_carta": 20},
+     "mes_contemplacao_alvo": 18, "inicio": "2020-11"},
+    {"tipo": "valor", "valor_imovel": 250000, "entrada": 50000, "juros_anual": 0.09, "valor_max": 320000,
+     "prazo_oficial": 240, "inicio": "2022-01"},
+    {"tipo": "prazo", "valor_imovel": 100000, "entrada": 0, "juros_anual": 0.09, "prazo": 12},
+    {"tipo": "prazo", "valor_imovel": 100000, "entrada": 0, "juros_anual": 0.09, "prazo": 12, "inicio": 202103},
+    {"tipo": "consorcio", "carta_credito_inicial": 1000, "prazo_total_meses": 10, "lance": 5, "inicio": "2021-01"},
+    {"tipo": "consorcio", "carta_credito_inicial": 1000, "prazo_total_meses": 0, "inicio": "2021-01"},
+]
+
+def _manual():
+    # Soma à mão dos cronogramas, deslocados pelo mês de início
+    base = indice_mes("2020-11")
+    soma = {}
+    for c in CONTRATOS[:3]:
+        r = simular_entrada(entrada_de_dict(c))
+        cron = getattr(r, "parcelas_detalhadas", None) or r.parcelas
+        for i, linha in enumerate(cron, start=indice_mes(c["inicio"]) - base):
+            soma[i] = soma.get(i, 0) + linha["parcela"]
+    return [soma.get(i, Decimal(0)) for i in range(max(soma) + 1)]
+
+def test_agregado_confere_com_soma_manual():
+    registros = list(enumerate(CONTRATOS, start=1))
+    r = agregar_carteira(registros, Decimal("0.10"), workers=1)
+    assert (r.inicio, r.contratos) == ("2020-11", 3)
+    assert [e["linha"] for e in r.erros] == [4, 5, 6, 7] and "inicio" in r.erros[0]["erro"]
+    assert "202103" in r.erros[1]["erro"] and "'lance'" in r.erros[2]["erro"] and "prazo" in r.erros[3]["erro"]
+    esperado = _manual()
+    assert r.fluxos.coluna("parcela") == esperado and len(r.fluxos) == len(esperado)
+    assert r.vpl == vpl(esperado, Decimal("0.10")).quantize(Decimal("0.01"))
+
+    t = totais(r)
+    assert t["parcela"] == sum(esperado)
+    assert sum(v for c, v in t.items() if c != "parcela") == t["parcela"]
+    assert t["juros"] > 0 and t["taxa_adm"] > 0 and t["seguro"] == 40 * 100
+
+    # Pool de threads e ordem diferente: mesmo agregado
+    outro = agregar_carteira(reversed(registros), Decimal("0.10"), workers=2, chunksize=1, pool="threads")
+    assert outro.fluxos == r.fluxos and outro.vpl == r.vpl and outro.inicio == r.inicio
+
+def test_cli(tmp_path, capsys):
+    arq = tmp_path / "carteira.jsonl"
+    arq.write_text("\n".join(json.dumps(c) for c in CONTRATOS[:3]) + "\n")
+    saida = tmp_path / "fluxo.csv"
+    main(["carteira", str(arq), "--workers", "1", "--engine", "centavos", "--taxa-desconto-anual", "10",
+          "--csv", str(saida)])
+    out = capsys.readouterr().out
+    assert "Contratos: 3 (0 com erro)" in out and "a partir de 2020-11" in out and "VPL" in out
+    linhas = saida.read_text().splitlines()
+    assert linhas[0] == "competencia,parcela,juros,amortizacao,taxa_adm,fundo_reserva,seguro,outros"
+    assert linhas[1].startswith("2020-11,") and len(linhas) == 1 + len(_manual())
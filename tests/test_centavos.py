@@ -0,0 +1,71 @@
+import random
+from decimal import Decimal
+from simfin import centavos, perf
+from simfin.batch import COLUNAS_RESUMO, simular_entrada
+from simfin.cli import main
+from simfin.consorcio import ConsorcioInput, Hipoteses, Lance, simular_consorcio
+from simfin.models import EntradaPrazo, EntradaValor
+from simfin.sac import simular_sac_por_prazo, simular_sac_por_valor
+
+def _d(rnd, lo, hi, casas=2):
+    return Decimal(rnd.randint(int(lo * 10 ** casas), int(hi * 10 ** casas))).scaleb(-casas)
+
+def test_corpus_identico_ao_decimal():
+    rnd = random.Random(7)
+    for i in range(60):
+        kw = dict(valor_imovel=_d(rnd, 50000, 2e6), juros_anual=rnd.choice([Decimal(0), _d(rnd, 0, 0.2, 4)]),
+                  tr_anual=rnd.choice([Decimal(0), _d(rnd, -0.01, 0.03, 4)]),
+                  ipca_anual=rnd.choice([Decimal(0), _d(rnd, 0, 0.1, 4)]),
+                  encargos_fixos_mensais=_d(rnd, 0, 500), prazo_oficial=rnd.choice([120, 360, 420]))
+        kw["entrada"] = (kw["valor_imovel"] * _d(rnd, 0, 0.8)).quantize(Decimal("0.01"))
+        e = EntradaPrazo(prazo=rnd.randint(1, kw["prazo_oficial"]), **kw)
+        assert centavos.simular_sac_por_prazo(e) == simular_sac_por_prazo(e)
+        v = EntradaValor(valor_maximo=_d(rnd, 50000, 3e6), **kw)
+        assert centavos.simular_sac_por_valor(v, colunas=()) == simular_sac_por_valor(v, colunas=())
+
+        n = rnd.randint(12, 240)
+        ci = ConsorcioInput(administradora="X", grupo="1", cota="1", carta_credito_inicial=_d(rnd, 30000, 1e6),
+                            prazo_total_meses=n, correcao_anual=rnd.choice([Decimal(0), _d(rnd, 0, 0.12, 4)]),
+                            taxa_adm_total_pct=_d(rnd, 0, 25), fundo_reserva_pct=_d(rnd, 0, 5),
+                            seguro_mensal_valor=_d(rnd, 0, 90), taxa_adesao_valor=_d(rnd, 0, 900),
+                            taxas_contemplacao_valor=_d(rnd, 0, 900), parcela_reduzida=i % 2 == 0,
+                            parcela_reduzida_pct=_d(rnd, 50, 100), parcela_reduzida_meses=rnd.randint(0, n),
+                            lance=Lance(percent_carta=_d(rnd, 0, 60)), mes_contemplacao_alvo=rnd.randint(0, n + 3),
+                            hipoteses=Hipoteses(aluguel_mensal_enquanto_espera=_d(rnd, 0, 3000)))
+        if i % 4 == 0:
+            ci.correcao_modo, ci.correcao_serie_mensal = "serie_mensal", [_d(rnd, -0.002, 0.01, 4) for _ in range(n // 2)]
+        assert centavos.simular_consorcio(ci) == simular_consorcio(ci)
+
+def test_empates_decididos_pelo_motor_decimal():
+    # Sem correção, o saldo do mês 19 é exatamente 41739,285 e a carta do mês 48
+    # (300000 * 1,05^4) é 364651,875: o arredondamento a 28 dígitos decide
+    e = EntradaPrazo(valor_imovel=Decimal("126482.69"), entrada=Decimal("70830.31"), juros_anual=Decimal("0.1099"),
+                     tr_anual=Decimal(0), ipca_anual=Decimal(0), encargos_fixos_mensais=Decimal("353.09"),
+                     prazo=76, prazo_oficial=120)
+    ci = ConsorcioInput(administradora="X", grupo="1", cota="1", carta_credito_inicial=Decimal(300000),
+                        prazo_total_meses=200, correcao_anual=Decimal("0.05"), lance=Lance(percent_carta=Decimal(25)),
+                        mes_contemplacao_alvo=24)
+    perf.ativar()
+    try:
+        assert centavos.simular_sac_por_prazo(e) == simular_sac_por_prazo(e)
+        assert centavos.simular_consorcio(ci) == simular_consorcio(ci)
+        assert perf.relatorio()["contadores"]["centavos.desempates"] >= 2
+    finally:
+        perf.desativar()
+
+def test_selecao_por_chamada_e_cli(tmp_path, capsys):
+    e = EntradaPrazo(valor_imovel=Decimal(250000), entrada=Decimal(87500), juros_anual=Decimal("0.0847"),
+                     tr_anual=Decimal("0.01"), ipca_anual=Decimal("0.04"), encargos_fixos_mensais=Decimal(120),
+                     prazo=360, prazo_oficial=360)
+    r = simular_entrada(e, "centavos", colunas=COLUNAS_RESUMO)
+    assert r.parcelas_detalhadas.campos == ["parcela"] and r == simular_entrada(e, colunas=COLUNAS_RESUMO)
+
+    argv = ["--tipo", "prazo", "--valor-imovel", "250000", "--entrada", "87500", "--juros-anual", "8.47",
+            "--juros-em-percent", "--prazo", "360", "--encargos", "120"]
+    saidas = []
+    for engine in ("decimal", "centavos"):
+        path = tmp_path / f"{engine}.csv"
+        main(argv + ["--engine", engine, "--csv", str(path)])
+        saidas.append(path.read_bytes())
+    capsys.readouterr()
+    assert saidas[0] == saidas[1]
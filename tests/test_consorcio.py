@@ -1,5 +1,6 @@
 from decimal import Decimal
-from simfin.consorcio import ConsorcioInput, simular_consorcio
+from simfin.consorcio import ConsorcioInput, Lance, simular_consorcio, iter_consorcio, resumir_consorcio
+from simfin.export import exportar_csv_consorcio
 
 def test_consorcio_basico_sem_correcao_sem_taxas():
     ci = ConsorcioInput(
@@ -16,3 +17,17 @@ def test_consorcio_basico_sem_correcao_sem_taxas():
     assert r.parcelas[0]["parcela"] == Decimal('10000.00')
     assert r.parcelas[-1]["parcela"] == Decimal('10000.00')
     assert r.total_pago == Decimal('100000.00')
+
+def test_iter_consorcio_e_resumo(tmp_path):
+    ci = ConsorcioInput(
+        administradora="X", grupo="G", cota="1",
+        carta_credito_inicial=Decimal('250000'), prazo_total_meses=180,
+        correcao_anual=Decimal('0.05'), fundo_reserva_pct=Decimal('2'),
+        lance=Lance(percent_carta=Decimal('25')), mes_contemplacao_alvo=3,
+    )
+    completo = simular_consorcio(ci)
+    assert list(iter_consorcio(ci)) == completo.parcelas
+    r = resumir_consorcio(ci)
+    assert (r.total_pago, r.total_pago_liquido) == (completo.total_pago, completo.total_pago_liquido)
+    exportar_csv_consorcio(iter_consorcio(ci), str(tmp_path / "c.csv"))
+    assert len((tmp_path / "c.csv").read_text().splitlines()) == 181
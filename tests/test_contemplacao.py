@@ -0,0 +1,61 @@
+import dataclasses
+from decimal import Decimal
+import pytest
+from simfin.consorcio import ConsorcioInput, Hipoteses, Lance, simular_consorcio
+from simfin.contemplacao import _prefixo, _Somas, varrer_contemplacao
+from simfin.contexto import contexto
+from simfin.valuation import vpl
+
+def _consorcio(**kw):
+    return ConsorcioInput(
+        administradora="X", grupo="1", cota="1", carta_credito_inicial=Decimal(120000), prazo_total_meses=60,
+        fundo_reserva_pct=Decimal(2), seguro_mensal_valor=Decimal("45.90"), taxa_adesao_valor=Decimal(500),
+        taxas_contemplacao_valor=Decimal(800), parcela_reduzida=True, parcela_reduzida_pct=Decimal(70),
+        parcela_reduzida_meses=12, hipoteses=Hipoteses(aluguel_mensal_enquanto_espera=Decimal(1500),
+                                                       taxa_desconto_anual=Decimal("0.10")), **kw)
+
+@pytest.mark.parametrize("correcao", [
+    dict(correcao_anual=Decimal("0.05")),
+    dict(correcao_modo="serie_mensal", correcao_serie_mensal=[Decimal(i % 5) / 1000 for i in range(60)]),
+])
+def test_tabela_confere_com_motor(correcao):
+    ci = _consorcio(**correcao)
+    lances = [Decimal(0), Decimal(30), Decimal(100)]      # 100%: o lance zera a contribuição restante
+    exata = varrer_contemplacao(ci, lances_pct=lances, exato=True)
+    rapida = varrer_contemplacao(ci, lances_pct=lances)
+    assert len(exata) == len(rapida) == 180
+    for linha, aprox in zip(exata, rapida):
+        k = linha["mes_contemplacao"]
+        r = simular_consorcio(dataclasses.replace(ci, mes_contemplacao_alvo=k,
+                                                  lance=Lance(percent_carta=linha["lance_pct"])))
+        assert (linha["total_pago"], linha["total_pago_liquido"]) == (r.total_pago, r.total_pago_liquido)
+        assert linha["vpl"] == vpl(r.parcelas, Decimal("0.10")).quantize(Decimal("0.01"))
+        assert linha["lance"] == r.parcelas[k - 1]["lance"]
+        folga = Decimal("0.005") * (60 - k) + Decimal("0.01")
+        assert abs(aprox["total_pago"] - r.total_pago) <= folga and abs(aprox["vpl"] - linha["vpl"]) <= folga
+
+def test_meses_invalidos_e_sem_desconto():
+    ci = _consorcio(correcao_anual=Decimal("0.05"))
+    with pytest.raises(ValueError):
+        varrer_contemplacao(ci, meses=[0])
+    linhas = varrer_contemplacao(ci, meses=[6], taxa_desconto_anual=Decimal(0))
+    assert linhas[0]["vpl"] is None and linhas[0]["lance_pct"] == 0
+
+def test_limiar_confere_com_laco():
+    # Uma base por mês (serie_mensal): a árvore de segmentos contra o sufixo somado mês a mês
+    ci = _consorcio(correcao_modo="serie_mensal", correcao_serie_mensal=[Decimal((i * 7) % 11) / 1000 for i in range(60)])
+    desconto = [Decimal("0.99") ** m for m in range(1, 61)]
+    with contexto():
+        p = _prefixo(ci, desconto)
+        s = _Somas(p, desconto)
+        for ini in (1, 2, 13, 37, 60):
+            for reducao in (Decimal(0), Decimal(1405), Decimal(1700), Decimal(2010), Decimal(5000)):
+                for saldo in (Decimal(0), Decimal(10000), Decimal(10) ** 9):
+                    restante, total, vp = saldo, Decimal(0), Decimal(0)
+                    for mes in range(ini, 61):
+                        c = min(max(Decimal(0), p.base[mes] - reducao), restante)
+                        restante -= c
+                        total += c
+                        vp += c * desconto[mes - 1]
+                    arvore = s.limiar(ini, reducao, saldo)
+                    assert abs(arvore[0] - total) < Decimal("1e-15") and abs(arvore[1] - vp) < Decimal("1e-15")
@@ -0,0 +1,48 @@
+import threading
+from decimal import Decimal, ROUND_DOWN, getcontext, localcontext
+from simfin.consorcio import ConsorcioInput, simular_consorcio
+from simfin.models import EntradaPrazo, EntradaValor
+from simfin.sac import iter_sac, simular_sac_por_prazo, simular_sac_por_valor
+from simfin.valuation import cet
+
+def _entrada(prazo=360):
+    return EntradaPrazo(valor_imovel=Decimal("250000"), entrada=Decimal("87500"), juros_anual=Decimal("0.0847"),
+                        tr_anual=Decimal("0.01"), ipca_anual=Decimal("0.04"), encargos_fixos_mensais=Decimal(120),
+                        prazo=prazo, prazo_oficial=360)
+
+def _tudo():
+    ci = ConsorcioInput(administradora="X", grupo="1", cota="1", carta_credito_inicial=Decimal(300000),
+                        prazo_total_meses=200, correcao_anual=Decimal("0.05"), fundo_reserva_pct=Decimal(2))
+    e = _entrada()
+    v = EntradaValor(valor_maximo=Decimal("330000"), prazo_oficial=420,
+                     **{k: getattr(e, k) for k in ("valor_imovel", "entrada", "juros_anual", "tr_anual",
+                                                    "ipca_anual", "encargos_fixos_mensais")})
+    r = simular_sac_por_prazo(e)
+    return r, simular_sac_por_valor(v), simular_consorcio(ci), cet(162500, r.parcelas_detalhadas)
+
+def test_independe_do_contexto_do_chamador_e_nao_o_altera():
+    esperado = _tudo()
+    with localcontext() as ctx:
+        ctx.prec, ctx.rounding = 6, ROUND_DOWN
+        assert _tudo() == esperado
+        assert (getcontext().prec, getcontext().rounding) == (6, ROUND_DOWN)
+        # Gerador consumido aos poucos: o contexto do motor não vaza entre os meses
+        for linha in iter_sac(_entrada()):
+            assert getcontext().prec == 6
+        assert Decimal(1) / Decimal(3) == Decimal("0.333333")
+
+def test_threads_com_contextos_diferentes():
+    esperado = simular_sac_por_prazo(_entrada(240))
+    saidas = []
+
+    def rodar(prec):
+        with localcontext() as ctx:
+            ctx.prec = prec
+            for _ in range(5):
+                saidas.append(simular_sac_por_prazo(_entrada(240)) == esperado)
+    threads = [threading.Thread(target=rodar, args=(p,)) for p in (4, 9, 28, 50)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(saidas) == 20 and all(saidas)
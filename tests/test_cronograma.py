@@ -0,0 +1,40 @@
+from decimal import Decimal
+import pytest
+from simfin.cronograma import Cronograma, CAMPOS_SAC
+from simfin.models import EntradaPrazo
+from simfin.sac import simular_sac_por_prazo
+from simfin.export import exportar_csv
+
+E = EntradaPrazo(
+    valor_imovel=Decimal('250000'), entrada=Decimal('87500'),
+    juros_anual=Decimal('0.0847'), tr_anual=Decimal('0.0'), ipca_anual=Decimal('0.0'),
+    encargos_fixos_mensais=Decimal('120'), prazo=360, prazo_oficial=360,
+)
+
+def test_linhas_se_comportam_como_dict(tmp_path):
+    c = simular_sac_por_prazo(E).parcelas_detalhadas
+    assert isinstance(c, Cronograma)
+    linha = c[0]
+    assert dict(linha) == {"mes": Decimal(1), "parcela": Decimal("1676.11"), "juros": Decimal("1104.72"),
+                           "amortizacao": Decimal("451.39"), "saldo_devedor": Decimal("162048.61")}
+    assert linha.get("inexistente", "") == ""
+    assert c[-1]["saldo_devedor"] == Decimal("0.00")
+    assert c == c.para_dicts()
+    assert len(c[10:20]) == 10 and c[10:20][0]["mes"] == Decimal(11)
+    exportar_csv(c, str(tmp_path / "p.csv"))
+    assert (tmp_path / "p.csv").read_text().splitlines()[1] == "1,1676.11,1104.72,451.39,162048.61"
+
+def test_somente_resumo_e_memoria():
+    completo = simular_sac_por_prazo(E)
+    resumo = simular_sac_por_prazo(E, colunas=())
+    assert resumo.valor_total_pago == completo.valor_total_pago
+    assert resumo.ultima_parcela == completo.ultima_parcela
+    so_resumo = resumo.parcelas_detalhadas
+    assert so_resumo.meses == 360 and len(so_resumo) == 0 and list(so_resumo) == []
+    with pytest.raises(IndexError):
+        so_resumo[0]
+    so_parcela = simular_sac_por_prazo(E, colunas=("mes", "parcela")).parcelas_detalhadas
+    assert so_parcela.memoria_bytes() < completo.parcelas_detalhadas.memoria_bytes()
+    assert so_parcela.coluna("parcela") == completo.parcelas_detalhadas.coluna("parcela")
+    with pytest.raises(ValueError):
+        Cronograma(CAMPOS_SAC, manter=("nao_existe",))
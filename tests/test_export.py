@@ -0,0 +1,54 @@
+from decimal import Decimal
+import pytest
+from simfin.cli import main
+from simfin.cronograma import CAMPOS_CONSORCIO
+from simfin.consorcio import ConsorcioInput, Lance, simular_consorcio, iter_consorcio
+from simfin.export import CAMPOS_CSV_CONSORCIO, exportar, ler_colunar
+
+CI = ConsorcioInput(
+    administradora="X", grupo="G", cota="1", carta_credito_inicial=Decimal('300000'),
+    prazo_total_meses=200, correcao_anual=Decimal('0.05'), fundo_reserva_pct=Decimal(2),
+    seguro_mensal_valor=Decimal('45.90'), lance=Lance(percent_carta=Decimal(25)), mes_contemplacao_alvo=30,
+)
+
+def test_csv_cronograma_igual_ao_de_linhas(tmp_path):
+    c = simular_consorcio(CI).parcelas
+    exportar(c, str(tmp_path / "a.csv"), CAMPOS_CSV_CONSORCIO)
+    exportar(iter_consorcio(CI), str(tmp_path / "b.csv"), CAMPOS_CSV_CONSORCIO)
+    exportar(c.para_dicts(), str(tmp_path / "c.csv"), CAMPOS_CSV_CONSORCIO)
+    a = (tmp_path / "a.csv").read_text()
+    assert a == (tmp_path / "b.csv").read_text() == (tmp_path / "c.csv").read_text()
+
+def test_colunar_ida_e_volta(tmp_path):
+    c = simular_consorcio(CI).parcelas
+    exportar(c, str(tmp_path / "p.sfc"))
+    lido = ler_colunar(str(tmp_path / "p.sfc"))
+    assert lido == c and lido.campos == CAMPOS_CONSORCIO
+    assert lido[29]["lance"] == c[29]["lance"] > 0
+    exportar(lido, str(tmp_path / "p.csv"))
+    exportar(c, str(tmp_path / "q.csv"))
+    assert (tmp_path / "p.csv").read_text() == (tmp_path / "q.csv").read_text()
+
+def test_colunar_de_dicts_e_erros(tmp_path):
+    linhas = [{"mes": Decimal(1), "parcela": Decimal("-0.05")}, {"mes": Decimal(2), "parcela": Decimal("10.5")}]
+    exportar(linhas, str(tmp_path / "x.bin"), ["mes", "parcela"], formato="colunar")
+    lido = ler_colunar(str(tmp_path / "x.bin"))
+    assert lido.coluna("parcela") == [Decimal("-0.05"), Decimal("10.50")]
+    exportar(lido, str(tmp_path / "x.csv"))
+    assert (tmp_path / "x.csv").read_text().splitlines() == ["mes,parcela", "1,-0.05", "2,10.50"]
+    (tmp_path / "ruim.sfc").write_bytes(b"nada disso" * 4)
+    with pytest.raises(ValueError):
+        ler_colunar(str(tmp_path / "ruim.sfc"))
+    with pytest.raises(ValueError):
+        exportar(linhas, str(tmp_path / "y"), formato="xlsx")
+
+def test_cli_mensagem_pelo_formato(tmp_path, capsys):
+    (tmp_path / "c.json").write_text('{"administradora": "X", "grupo": "1", "cota": "1",'
+                                     ' "carta_credito_inicial": 120000, "prazo_total_meses": 48}')
+    main(["--tipo", "prazo", "--valor-imovel", "250000", "--entrada", "87500", "--juros-anual", "0.0847",
+          "--prazo", "120", "--csv", str(tmp_path / "s.sfc"), "--consorcio-json", str(tmp_path / "c.json"),
+          "--csv-consorcio", str(tmp_path / "c.csv")])
+    out = capsys.readouterr().out
+    assert f"Cronograma colunar (.sfc) exportado em: {tmp_path / 's.sfc'}" in out and "CSV exportado" not in out
+    assert f"CSV (consórcio) exportado em: {tmp_path / 'c.csv'}" in out
+    assert len(ler_colunar(str(tmp_path / "s.sfc"))) == 120
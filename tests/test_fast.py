@@ -0,0 +1,63 @@
+import dataclasses
+from decimal import Decimal
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from simfin import fast, sac
+from simfin.models import EntradaPrazo, EntradaValor
+from simfin.sac import simular_sac_por_prazo, simular_sac_por_valor
+from simfin.consorcio import ConsorcioInput, Lance, Hipoteses, simular_consorcio
+
+def test_sac_fast_confere_com_decimal():
+    e = EntradaPrazo(
+        valor_imovel=Decimal('250000'), entrada=Decimal('87500'),
+        juros_anual=Decimal('0.0847'), tr_anual=Decimal('0.02'), ipca_anual=Decimal('0.05'),
+        encargos_fixos_mensais=Decimal('120'), prazo=360, prazo_oficial=360,
+    )
+    r = fast.simular_sac_por_prazo(e, verificar=True)
+    ref = simular_sac_por_prazo(e)
+    assert r.colunas["parcela"].shape == (360,)
+    assert abs(r.valor_total_pago - float(ref.valor_total_pago)) < 1.0
+    assert r.para_decimal().primeira_parcela == ref.primeira_parcela
+
+def test_consorcio_fast_confere_com_decimal():
+    ci = ConsorcioInput(
+        administradora="X", grupo="G", cota="1",
+        carta_credito_inicial=Decimal('250000'), prazo_total_meses=180,
+        correcao_anual=Decimal('0.05'), fundo_reserva_pct=Decimal('2'),
+        taxas_contemplacao_valor=Decimal('800'),
+        parcela_reduzida=True, parcela_reduzida_pct=Decimal('70'), parcela_reduzida_meses=12,
+        lance=Lance(percent_carta=Decimal('25')), mes_contemplacao_alvo=3,
+        hipoteses=Hipoteses(aluguel_mensal_enquanto_espera=Decimal('1800')),
+    )
+    r = fast.simular_consorcio(ci, verificar=True)
+    assert r.para_decimal().total_pago == simular_consorcio(ci).total_pago
+
+def test_verificacao_acusa_divergencia():
+    e = EntradaPrazo(
+        valor_imovel=Decimal('100000'), entrada=Decimal('0'),
+        juros_anual=Decimal('0.1'), tr_anual=Decimal('0'), ipca_anual=Decimal('0'),
+        encargos_fixos_mensais=Decimal('0'), prazo=120, prazo_oficial=120,
+    )
+    with pytest.raises(fast.DivergenciaMotor):
+        fast.simular_sac_por_prazo(e, verificar=True, tolerancia=-1.0)
+
+def test_sac_por_valor_mesmo_prazo_do_decimal(monkeypatch):
+    e = EntradaValor(
+        valor_imovel=Decimal('250000'), entrada=Decimal('50000'), juros_anual=Decimal('0.09'),
+        tr_anual=Decimal('0.01'), ipca_anual=Decimal('0'), encargos_fixos_mensais=Decimal('80'),
+        valor_maximo=Decimal('320000'), prazo_oficial=420,
+    )
+    ref = simular_sac_por_valor(e)
+    r = fast.simular_sac_por_valor(e, verificar=True)
+    assert r.prazo_utilizado == ref.prazo_utilizado and 6 < r.prazo_utilizado < 420
+    assert r.para_decimal().valor_total_pago == ref.valor_total_pago
+    # Sem prazo viável: 6 meses, como no Decimal
+    assert fast.simular_sac_por_valor(dataclasses.replace(e, valor_maximo=Decimal(1)), verificar=True).prazo_utilizado == 6
+
+    # O prazo escolhido também é verificado
+    monkeypatch.setattr(sac, "simular_sac_por_valor",
+                        lambda e: simular_sac_por_prazo(sac._entrada_prazo(e, ref.prazo_utilizado - 1)))
+    with pytest.raises(fast.DivergenciaMotor, match="prazo_utilizado"):
+        fast.simular_sac_por_valor(e, verificar=True)
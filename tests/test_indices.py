@@ -0,0 +1,21 @@
+from decimal import Decimal
+from simfin.indices import (
+    taxa_mensal, fator_correcao_mensal, aplicar_tr_e_ipca,
+    cache_taxas_info, limpar_cache_taxas,
+)
+
+def test_cache_de_taxas_conta_acertos():
+    limpar_cache_taxas()
+    a = taxa_mensal(Decimal('0.0847'))
+    b = taxa_mensal(Decimal('0.0847'))
+    assert a == b
+    info = cache_taxas_info()["taxa_mensal"]
+    assert info["misses"] == 1 and info["hits"] == 1
+
+def test_fator_correcao_equivale_a_aplicar_indices():
+    tr, ipca = Decimal('0.02'), Decimal('0.06')
+    f = fator_correcao_mensal(tr, ipca)
+    esperado = (Decimal(1) + taxa_mensal(tr)) * (Decimal(1) + taxa_mensal(ipca))
+    assert f == esperado
+    assert aplicar_tr_e_ipca(Decimal('1000'), tr, ipca) == Decimal('1000') * f
+    assert fator_correcao_mensal(Decimal(0), Decimal(0)) == Decimal(1)
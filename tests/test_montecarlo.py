@@ -0,0 +1,41 @@
+from decimal import Decimal
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from simfin.models import EntradaPrazo
+from simfin.sac import simular_sac_por_prazo
+from simfin.consorcio import ConsorcioInput, Lance
+from simfin.montecarlo import ModeloIndice, monte_carlo_sac, monte_carlo_consorcio
+
+E = EntradaPrazo(
+    valor_imovel=Decimal('250000'), entrada=Decimal('87500'),
+    juros_anual=Decimal('0.0847'), tr_anual=Decimal('0.01'), ipca_anual=Decimal('0.04'),
+    encargos_fixos_mensais=Decimal('120'), prazo=240, prazo_oficial=360,
+)
+
+def test_sem_volatilidade_reproduz_motor():
+    r = monte_carlo_sac(E, tr=ModeloIndice(Decimal('0.01')), ipca=ModeloIndice(Decimal('0.04')),
+                        n_caminhos=50, seed=1)
+    ref = simular_sac_por_prazo(E)
+    assert abs(r.percentis["total_pago"][50.0] - float(ref.valor_total_pago)) < 0.005 * E.prazo
+    assert abs(r.percentis["pico_parcela"][95.0] - float(ref.primeira_parcela)) < 0.01
+
+def test_semente_independe_do_bloco():
+    ipca = ModeloIndice(Decimal('0.045'), Decimal('0.02'), persistencia=0.8)
+    a = monte_carlo_sac(E, ipca=ipca, n_caminhos=1000, seed=42, taxa_desconto_anual=0.1, bloco=1000)
+    b = monte_carlo_sac(E, ipca=ipca, n_caminhos=1000, seed=42, taxa_desconto_anual=0.1, bloco=128)
+    assert np.array_equal(a.amostras["vpl"], b.amostras["vpl"])
+    assert a.percentis["total_pago"][5.0] < a.percentis["total_pago"][95.0]
+
+def test_consorcio_por_caminho():
+    ci = ConsorcioInput(
+        administradora="X", grupo="G", cota="1",
+        carta_credito_inicial=Decimal('200000'), prazo_total_meses=120,
+        lance=Lance(percent_carta=Decimal('20')), mes_contemplacao_alvo=24,
+    )
+    r = monte_carlo_consorcio(ci, ModeloIndice(0.05, 0.03), n_caminhos=2000, seed=7,
+                              taxa_desconto_anual=0.1, bloco=500)
+    assert r.n_caminhos == 2000
+    assert set(r.percentis) == {"pico_parcela", "total_pago", "vpl"}
+    assert r.percentis["vpl"][50.0] < r.percentis["total_pago"][50.0]
@@ -0,0 +1,77 @@
+import dataclasses
+from decimal import Decimal
+import pytest
+from simfin.cli import main
+from simfin.consorcio import ConsorcioInput, Hipoteses, Lance, simular_consorcio
+from simfin.otimizador import otimizar_lance
+from simfin.valuation import vpl
+
+CURVA = {1: Decimal(45), 6: Decimal(30), 12: Decimal(20), 24: Decimal(10), 36: Decimal(0)}
+
+def _consorcio(**kw):
+    return ConsorcioInput(
+        administradora="X", grupo="1", cota="1", carta_credito_inicial=Decimal(120000), prazo_total_meses=48,
+        correcao_anual=Decimal("0.05"), fundo_reserva_pct=Decimal(2), seguro_mensal_valor=Decimal("45.90"),
+        taxa_adesao_valor=Decimal(500), taxas_contemplacao_valor=Decimal(800), parcela_reduzida=True,
+        parcela_reduzida_pct=Decimal(70), parcela_reduzida_meses=12,
+        hipoteses=Hipoteses(aluguel_mensal_enquanto_espera=Decimal(1500), taxa_desconto_anual=Decimal("0.10")), **kw)
+
+def _forca_bruta(ci, lances, caixa):
+    pontos = []
+    for reducao in (False, True):
+        for k in range(1, 49):
+            exigido = CURVA[max(m for m in CURVA if m <= k)]
+            for pct in lances:
+                r = simular_consorcio(dataclasses.replace(ci, parcela_reduzida=reducao, mes_contemplacao_alvo=k,
+                                                          lance=Lance(percent_carta=pct)))
+                desembolso = r.parcelas[k - 1]["lance"]
+                if pct >= exigido and desembolso <= caixa:
+                    pontos.append((desembolso, vpl(r.parcelas, Decimal("0.10")).quantize(Decimal("0.01"))))
+    return {p for p in pontos if not any(q != p and q[0] <= p[0] and q[1] <= p[1] for q in pontos)}
+
+def test_fronteira_confere_com_forca_bruta():
+    ci = _consorcio()
+    lances = [Decimal(x) for x in (0, 10, 20, 30, 45)]
+    res = otimizar_lance(ci, caixa=Decimal(40000), lances_pct=lances, fontes=["proprio"], lance_minimo=CURVA)
+    assert res.completo and res.podados > 0
+    assert {(c.desembolso, c.custo) for c in res.fronteira} == _forca_bruta(ci, lances, Decimal(40000))
+    assert len(res.fronteira) > 1 and res.melhor.custo == min(c.custo for c in res.fronteira)
+    assert [c.desembolso for c in res.fronteira] == sorted(c.desembolso for c in res.fronteira)
+
+def test_embutido_carta_minima_e_tempo():
+    ci = _consorcio()
+    res = otimizar_lance(ci, objetivo="total_pago_liquido", caixa=Decimal(0), carta_minima=Decimal(100000),
+                         lance_minimo=CURVA)
+    assert res.fronteira and all(c.desembolso == 0 for c in res.fronteira)
+    assert all(c.carta_liquida >= 100000 for c in res.fronteira)
+    melhor = res.melhor
+    assert melhor.fonte == "embutido" and melhor.mes_contemplacao < 36
+    r = simular_consorcio(dataclasses.replace(ci, parcela_reduzida=melhor.reducao is not None,
+                                              mes_contemplacao_alvo=melhor.mes_contemplacao,
+                                              lance=Lance(percent_carta=melhor.lance_pct, fonte="embutido")))
+    assert r.total_pago_liquido == melhor.total_pago_liquido
+
+    parcial = otimizar_lance(ci, tempo_max_s=0)
+    assert not parcial.completo and parcial.avaliados == 0
+
+def test_validacao_e_cli(tmp_path, capsys):
+    ci = _consorcio()
+    with pytest.raises(ValueError):
+        otimizar_lance(ci, objetivo="parcela")
+    with pytest.raises(ValueError):
+        otimizar_lance(ci, meses=[49])
+    with pytest.raises(ValueError):
+        otimizar_lance(dataclasses.replace(ci, hipoteses=Hipoteses()), objetivo="vpl")
+
+    (tmp_path / "c.json").write_text(
+        '{"administradora": "X", "grupo": "1", "cota": "1", "carta_credito_inicial": 120000,'
+        ' "prazo_total_meses": 48, "correcao_anual": 0.05, "taxa_adesao_valor": 500,'
+        ' "hipoteses": {"aluguel_mensal_enquanto_espera": 1500, "taxa_desconto_anual": 0.10}}')
+    saida = tmp_path / "f.csv"
+    main(["otimizar", "--consorcio-json", str(tmp_path / "c.json"), "--caixa", "40000", "--lances", "0:45:15",
+          "--fontes", "proprio", "--reducoes", "sem,70:12", "--lance-minimo", "1:45,12:20,36:0",
+          "--csv", str(saida)])
+    linhas = saida.read_text().splitlines()
+    assert linhas[0].startswith("mes_contemplacao,lance_pct,fonte") and len(linhas) > 2
+    main(["otimizar", "--consorcio-json", str(tmp_path / "c.json"), "--caixa", "40000"])
+    assert "Melhor" in capsys.readouterr().out
@@ -0,0 +1,52 @@
+import json
+from decimal import Decimal
+from simfin import perf
+from simfin.cli import main
+from simfin.consorcio import ConsorcioInput, Lance, simular_consorcio
+from simfin.indices import limpar_cache_taxas
+from simfin.models import EntradaValor
+from simfin.sac import simular_sac_por_valor
+
+E = EntradaValor(valor_imovel=Decimal('250000'), entrada=Decimal('87500'), juros_anual=Decimal('0.0847'),
+                 tr_anual=Decimal('0'), ipca_anual=Decimal('0'), encargos_fixos_mensais=Decimal('120'),
+                 valor_maximo=Decimal('300000'), prazo_oficial=360)
+
+def test_desligado_nao_registra_e_ligado_conta():
+    perf.zerar()
+    simular_sac_por_valor(E)
+    assert perf.relatorio()["fases"] == {} and perf.relatorio()["contadores"] == {}
+    sem_perfil = simular_sac_por_valor(E)
+    ci = ConsorcioInput(administradora="X", grupo="1", cota="1", carta_credito_inicial=Decimal(300000),
+                        prazo_total_meses=200, correcao_anual=Decimal("0.05"), lance=Lance(percent_carta=Decimal(25)))
+    limpar_cache_taxas()
+    perf.ativar()
+    try:
+        r = simular_sac_por_valor(E)
+        c = simular_consorcio(ci)
+    finally:
+        perf.desativar()
+    assert r == sem_perfil and c == simular_consorcio(ci)     # o laço cronometrado dá o mesmo resultado
+    rel = perf.relatorio()
+    assert rel["fases"]["sac.busca_valor"]["chamadas"] == 1
+    assert rel["fases"]["sac.meses"]["segundos"] <= rel["fases"]["sac.busca_valor"]["segundos"]
+    # Conversão de taxa (faltas do cache) e arredondamento dentro do laço, medidos em separado
+    assert rel["fases"]["indices.taxa_mensal"]["chamadas"] == rel["cache_taxas"]["taxa_mensal"]["misses"] == 2
+    assert rel["fases"]["consorcio.arredondamento"]["chamadas"] == 200 * 10     # 10 campos em centavos por mês
+    assert 0 < rel["fases"]["consorcio.arredondamento"]["segundos"] < rel["fases"]["consorcio.meses"]["segundos"]
+    # Busca: uma parcela por mês de cada total; prazo vencedor: 4 campos por mês
+    meses_busca = rel["contadores"]["meses_simulados"] - 200 - r.prazo_utilizado
+    assert rel["fases"]["sac.arredondamento"]["chamadas"] == meses_busca + 4 * r.prazo_utilizado
+    assert "sac.laco" not in rel["fases"] and "consorcio.laco" not in rel["fases"]
+    assert "quantizacoes" not in rel["contadores"]
+    assert rel["contadores"]["cronogramas"] == 2
+    assert rel["contadores"]["meses_simulados"] >= r.prazo_utilizado
+    assert rel["contadores"]["sac.totais_busca"] > 1
+
+def test_cli_profile_json(tmp_path, capsys):
+    destino = tmp_path / "perfil.json"
+    main(["--tipo", "prazo", "--valor-imovel", "250000", "--entrada", "87500", "--juros-anual", "8.47",
+          "--juros-em-percent", "--prazo", "120", "--csv", str(tmp_path / "p.csv"), "--profile", str(destino)])
+    rel = json.loads(destino.read_text())
+    assert {"cli.total", "sac.meses", "export.csv"} <= set(rel["fases"])
+    assert rel["contadores"]["linhas_exportadas"] == 120
+    assert not perf.ATIVO
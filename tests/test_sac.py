@@ -1,6 +1,9 @@
 from decimal import Decimal
-from simfin.models import EntradaPrazo
-from simfin.sac import simular_sac_por_prazo
+from simfin.models import EntradaPrazo, EntradaValor
+from simfin.sac import (
+    simular_sac_por_prazo, simular_sac_por_valor, _simular_sac_por_valor_linear, iter_sac, resumir_sac,
+)
+from simfin.export import exportar_csv
 
 def test_basico_sem_indices():
     e = EntradaPrazo(
@@ -19,3 +22,50 @@ def test_basico_sem_indices():
     assert r.parcelas_detalhadas[0]["parcela"] > 0
     assert r.primeira_parcela >= r.ultima_parcela
     assert len(r.parcelas_detalhadas) == 360
+
+def _entrada_valor(**kw):
+    base = dict(
+        valor_imovel=Decimal('250000'),
+        entrada=Decimal('87500'),
+        juros_anual=Decimal('0.0847'),
+        tr_anual=Decimal('0.0'),
+        ipca_anual=Decimal('0.0'),
+        encargos_fixos_mensais=Decimal('120'),
+        valor_maximo=Decimal('274238.30'),
+        prazo_oficial=360,
+    )
+    base.update(kw)
+    return EntradaValor(**base)
+
+def test_por_valor_bissecao_igual_busca_linear():
+    casos = [
+        _entrada_valor(),
+        _entrada_valor(valor_maximo=Decimal('200000')),
+        _entrada_valor(valor_maximo=Decimal('1000')),          # nenhum prazo viável
+        _entrada_valor(valor_maximo=Decimal('10000000')),      # prazo oficial
+        _entrada_valor(tr_anual=Decimal('0.02'), ipca_anual=Decimal('0.05'), prazo_oficial=120),
+        _entrada_valor(juros_anual=Decimal('0'), encargos_fixos_mensais=Decimal('0'),
+                       valor_maximo=Decimal('162500'), prazo_oficial=60),  # não monotônico
+    ]
+    for e in casos:
+        r = simular_sac_por_valor(e)
+        esperado = _simular_sac_por_valor_linear(e)
+        assert r.prazo_utilizado == esperado.prazo_utilizado
+        assert r.valor_total_pago == esperado.valor_total_pago
+        assert r.parcelas_detalhadas == esperado.parcelas_detalhadas
+
+def test_iter_sac_e_resumo_sem_materializar(tmp_path):
+    e = EntradaPrazo(
+        valor_imovel=Decimal('250000'), entrada=Decimal('87500'),
+        juros_anual=Decimal('0.0847'), tr_anual=Decimal('0.01'), ipca_anual=Decimal('0.03'),
+        encargos_fixos_mensais=Decimal('120'), prazo=420, prazo_oficial=420,
+    )
+    completo = simular_sac_por_prazo(e)
+    linhas = iter_sac(e)
+    assert next(linhas) == completo.parcelas_detalhadas[0]
+    exportar_csv(iter_sac(e), str(tmp_path / "stream.csv"))
+    exportar_csv(completo.parcelas_detalhadas, str(tmp_path / "lista.csv"))
+    assert (tmp_path / "stream.csv").read_text() == (tmp_path / "lista.csv").read_text()
+    r = resumir_sac(e)
+    assert (r.valor_total_pago, r.primeira_parcela, r.ultima_parcela) == \
+        (completo.valor_total_pago, completo.primeira_parcela, completo.ultima_parcela)
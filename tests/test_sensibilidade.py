@@ -0,0 +1,88 @@
+import dataclasses
+from decimal import Decimal
+import pytest
+from simfin.cli import main
+from simfin.consorcio import ConsorcioInput, Hipoteses, Lance, _passos_consorcio, simular_consorcio
+from simfin.contexto import contexto
+from simfin.indices import fator_correcao_mensal, taxa_mensal
+from simfin.models import EntradaPrazo
+from simfin.sac import _passos_sac, simular_sac_por_prazo
+from simfin.sensibilidade import estimar, sensibilidades_consorcio, sensibilidades_sac
+from simfin.valuation import fatores_desconto, vpl
+
+H = Decimal("1e-9")
+
+def _medidas(parcelas, desconto):
+    # total, primeira e VPL sem arredondar, para diferenças finitas
+    d = fatores_desconto(desconto, len(parcelas))
+    return sum(parcelas), parcelas[0], sum(p * v for p, v in zip(parcelas, d))
+
+def _confere(s, medidas_em, param, tol=Decimal("1e-6")):
+    cima, baixo = medidas_em(param, H), medidas_em(param, -H)
+    for m, a, b in zip(("total_pago", "primeira_parcela", "vpl"), cima, baixo):
+        numerica = (a - b) / (2 * H)
+        assert abs(s.derivadas[m][param] - numerica) <= tol * max(1, abs(numerica)), (m, param)
+
+def test_sac_valores_do_motor_e_derivadas():
+    e = EntradaPrazo(valor_imovel=Decimal(250000), entrada=Decimal(87500), juros_anual=Decimal("0.0847"),
+                     tr_anual=Decimal("0.01"), ipca_anual=Decimal(0), encargos_fixos_mensais=Decimal(120),
+                     prazo=300, prazo_oficial=360)
+    s = sensibilidades_sac(e, Decimal("0.10"))
+    r = simular_sac_por_prazo(e)
+    assert s.parametros == ["juros_anual", "tr_anual", "ipca_anual", "taxa_desconto_anual"]
+    assert s.valores == {"total_pago": r.valor_total_pago, "primeira_parcela": r.primeira_parcela,
+                         "vpl": vpl(r.parcelas_detalhadas, Decimal("0.10"))}
+
+    def medidas_em(param, h):
+        x = dict(juros_anual=e.juros_anual, tr_anual=e.tr_anual, ipca_anual=e.ipca_anual, taxa_desconto_anual=Decimal("0.10"))
+        x[param] += h
+        with contexto():
+            fator = fator_correcao_mensal(x["tr_anual"], x["ipca_anual"])
+            parcelas = [p for _, p, _, _, _ in _passos_sac(Decimal(162500), taxa_mensal(x["juros_anual"]), fator,
+                                                          Decimal(120), 300)]
+            return _medidas(parcelas, x["taxa_desconto_anual"])
+    for param in s.parametros:
+        _confere(s, medidas_em, param)
+    assert s.derivadas["total_pago"]["juros_anual"] > 0 and s.derivadas["vpl"]["taxa_desconto_anual"] < 0
+
+def _consorcio(**kw):
+    return ConsorcioInput(
+        administradora="X", grupo="1", cota="1", carta_credito_inicial=Decimal(300000), prazo_total_meses=200,
+        correcao_anual=Decimal("0.05"), fundo_reserva_pct=Decimal(2), seguro_mensal_valor=Decimal("45.90"),
+        parcela_reduzida=True, parcela_reduzida_pct=Decimal(70), parcela_reduzida_meses=12,
+        lance=Lance(percent_carta=Decimal(25)), mes_contemplacao_alvo=24,
+        hipoteses=Hipoteses(aluguel_mensal_enquanto_espera=Decimal(1800), taxa_desconto_anual=Decimal("0.10")), **kw)
+
+def test_consorcio_valores_do_motor_e_derivadas():
+    ci = _consorcio()
+    s = sensibilidades_consorcio(ci)
+    r = simular_consorcio(ci)
+    assert s.parametros == ["correcao_anual", "taxa_desconto_anual"]
+    assert s.valores == {"total_pago": r.total_pago, "primeira_parcela": r.parcelas[0]["parcela"],
+                         "vpl": vpl(r.parcelas, Decimal("0.10"))}
+
+    def medidas_em(param, h):
+        desconto = Decimal("0.10") + (h if param == "taxa_desconto_anual" else 0)
+        c = dataclasses.replace(ci, correcao_anual=ci.correcao_anual + (h if param == "correcao_anual" else 0))
+        with contexto():
+            return _medidas([p[9] for p in _passos_consorcio(c, saida=lambda x: x)], desconto)
+    for param in s.parametros:
+        _confere(s, medidas_em, param)
+
+    # Série mensal: correcao_anual não entra; sem taxa de desconto não há VPL
+    serie = sensibilidades_consorcio(_consorcio(correcao_modo="serie_mensal",
+                                                correcao_serie_mensal=[Decimal("0.004")] * 200), Decimal(0))
+    assert serie.parametros == [] and serie.valores["vpl"] is None and "vpl" not in serie.derivadas
+
+def test_estimar_e_cli(capsys):
+    s = sensibilidades_consorcio(_consorcio())
+    est = estimar(s, {"correcao_anual": Decimal("0.001")})
+    r = simular_consorcio(dataclasses.replace(_consorcio(), correcao_anual=Decimal("0.051")))
+    assert abs(est["vpl"] - vpl(r.parcelas, Decimal("0.10"))) < 1 and abs(est["total_pago"] - r.total_pago) < 1
+    with pytest.raises(ValueError):
+        estimar(s, {"juros_anual": Decimal("0.005")})
+
+    main(["--tipo", "prazo", "--valor-imovel", "250000", "--entrada", "87500", "--juros-anual", "8.47",
+          "--juros-em-percent", "--prazo", "360", "--sensibilidades", "--taxa-desconto-anual", "10"])
+    out = capsys.readouterr().out
+    assert "Sensibilidades" in out and "juros_anual: total R$ +" in out and "VPL R$ -" in out
@@ -0,0 +1,52 @@
+from decimal import Decimal
+import math
+import pytest
+from simfin.models import EntradaPrazo, EntradaValor
+from simfin.sac import simular_sac_por_prazo, simular_sac_por_valor, _simular_sac_por_valor_linear
+from simfin.consorcio import ConsorcioInput, simular_consorcio
+from simfin.series import abrir_serie, gravar_serie, importar_csv, indice_mes, listar_series
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.setenv("SIMFIN_SERIES_DIR", str(tmp_path / "series"))
+    return tmp_path
+
+def test_importar_csv_e_fator(repo):
+    csv = repo / "ipca.csv"
+    csv.write_text("data;valor\n01/01/2020;0,21\n01/03/2020;0,07\n01/02/2020;0,25\n", encoding="utf-8")
+    s = importar_csv(str(csv), "ipca", em_percent=True)
+    assert listar_series() == ["IPCA"] and len(s) == 3 and s.inicio == indice_mes("2020-01")
+    assert s.taxas("2020-02", 4) == [Decimal("0.0025"), Decimal("0.0007"), Decimal("0.0007"), Decimal("0.0007")]
+    assert math.isclose(s.fator("2020-01", "2020-04"), 1.0021 * 1.0025 * 1.0007, rel_tol=1e-15)
+    assert math.isclose(s.fator("2020-02", "2020-06"), 1.0025 * 1.0007 ** 3, rel_tol=1e-14)
+    assert s.fator("2020-03", "2020-03") == 1.0
+    with pytest.raises(ValueError):
+        s.taxas("2019-12", 1)
+    csv.write_text("2020-01;0.1\n2020-03;0.1\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        importar_csv(str(csv), "buraco")
+
+def test_sac_e_consorcio_com_series(repo):
+    gravar_serie("ZERO", "2015-01", [0] * 12)
+    base = dict(valor_imovel=Decimal("250000"), entrada=Decimal("87500"), juros_anual=Decimal("0.0847"),
+                tr_anual=Decimal(0), ipca_anual=Decimal(0), encargos_fixos_mensais=Decimal("120"))
+    sem = simular_sac_por_prazo(EntradaPrazo(prazo=360, prazo_oficial=360, **base))
+    com = simular_sac_por_prazo(EntradaPrazo(prazo=360, prazo_oficial=360, tr_serie="zero",
+                                             serie_inicio="2015-06", **base))
+    assert com.parcelas_detalhadas == sem.parcelas_detalhadas
+
+    taxas = [Decimal("0.004"), Decimal("0.0051"), Decimal("-0.001"), Decimal("0.003")]
+    gravar_serie("IPCA", "2019-10", taxas)
+    ev = EntradaValor(valor_maximo=Decimal("300000"), prazo_oficial=360, ipca_serie="IPCA",
+                      serie_inicio="2019-11", **base)
+    assert simular_sac_por_valor(ev) == _simular_sac_por_valor_linear(ev)
+    r = simular_sac_por_prazo(EntradaPrazo(prazo=120, prazo_oficial=360, ipca_serie="IPCA",
+                                           serie_inicio="2019-11", **base))
+    assert r.parcelas_detalhadas[0]["juros"] == (Decimal(162500) * Decimal("1.0051") * (
+        (Decimal(1) + Decimal("0.0847")) ** (Decimal(1) / Decimal(12)) - 1)).quantize(Decimal("0.01"))
+
+    ci = dict(administradora="X", grupo="1", cota="1", carta_credito_inicial=Decimal(200000), prazo_total_meses=60)
+    nomeada = simular_consorcio(ConsorcioInput(correcao_serie_nome="ipca", correcao_serie_inicio="2019-11", **ci))
+    explicita = simular_consorcio(ConsorcioInput(correcao_modo="serie_mensal", correcao_serie_mensal=taxas[1:], **ci))
+    assert nomeada == explicita
+    assert abrir_serie("ipca") is abrir_serie("IPCA")
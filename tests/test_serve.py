@@ -0,0 +1,73 @@
+import asyncio, json, threading, urllib.error, urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from simfin.serve import Servico, Sobrecarga, calcular
+
+SAC = {"valor_imovel": 250000, "entrada": 87500, "juros_anual": 8.47, "juros_em_percent": True,
+       "prazo": 120, "encargos": 120}
+
+class _Lento(ThreadPoolExecutor):
+    # Segura os cálculos até liberar, para as requisições se sobreporem
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.liberar = threading.Event()
+
+    def submit(self, fn, *a, **kw):
+        return super().submit(lambda: (self.liberar.wait(5), fn(*a, **kw))[1])
+
+def test_coalescencia_e_sobrecarga():
+    async def rodar():
+        ex = _Lento()
+        s = Servico(executor=ex, max_pendentes=1)
+        pedidos = [asyncio.ensure_future(s.calcular("prazo", dict(reversed(SAC.items())) if i % 2 else SAC))
+                   for i in range(5)]
+        await asyncio.sleep(0)
+        with pytest.raises(Sobrecarga):
+            await s.calcular("prazo", {**SAC, "prazo": 60})
+        ex.liberar.set()
+        saidas = await asyncio.gather(*pedidos)
+        ex.shutdown()
+        return s.estatisticas, saidas
+    est, saidas = asyncio.run(rodar())
+    assert est["calculos"] == 1 and est["coalescidas"] == 4 and est["rejeitadas"] == 1
+    assert all(o == saidas[0] for o in saidas)
+    assert saidas[0] == calcular("prazo", json.dumps(SAC))
+
+def _http(porta, metodo, rota, corpo=None):
+    dados = None if corpo is None else (corpo if isinstance(corpo, bytes) else json.dumps(corpo).encode())
+    req = urllib.request.Request(f"http://127.0.0.1:{porta}{rota}", data=dados, method=metodo)
+    try:
+        with urllib.request.urlopen(req, timeout=10) as r:
+            return r.status, json.loads(r.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+def test_http():
+    consorcio = {"carta_credito_inicial": 200000, "prazo_total_meses": 120, "correcao_anual": 0.05,
+                 "mes_contemplacao_alvo": 6, "hipoteses": {"taxa_desconto_anual": 0.10}}
+
+    async def rodar():
+        with ThreadPoolExecutor(2) as ex:
+            s = Servico(executor=ex)
+            await s.iniciar("127.0.0.1", 0)
+            chamadas = [
+                ("POST", "/sac/prazo", {**SAC, "parcelas": True}),
+                ("POST", "/consorcio", consorcio),
+                ("POST", "/comparar", {"financiamento": SAC, "consorcio": consorcio}),
+                ("POST", "/sac/valor", {"valor_imovel": 100}),
+                ("POST", "/sac/prazo", b"{nao e json"),
+                ("GET", "/nada", None),
+                ("GET", "/sac/prazo", None),
+                ("GET", "/saude", None),
+            ]
+            saidas = [await asyncio.to_thread(_http, s.porta, *c) for c in chamadas]
+            await s.fechar()
+            return saidas
+    sac, con, comp, faltando, invalido, nada, metodo, saude = asyncio.run(rodar())
+    assert sac[0] == 200 and sac[1]["prazo_utilizado"] == 120 and len(sac[1]["parcelas"]) == 120
+    assert float(sac[1]["cet"]) > 0.0847
+    assert con[0] == 200 and con[1]["tipo"] == "consorcio"
+    assert comp[0] == 200 and set(comp[1]["vpl"]) == {"taxa_desconto_anual", "financiamento", "consorcio"}
+    assert faltando[0] == invalido[0] == 400 and "erro" in faltando[1]
+    assert nada[0] == 404 and metodo[0] == 405
+    assert saude[0] == 200 and saude[1]["requisicoes"] == 8 and saude[1]["erros"] == 4
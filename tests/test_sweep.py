@@ -0,0 +1,44 @@
+from decimal import Decimal
+from simfin.cli import main
+from simfin.models import EntradaPrazo
+from simfin.sac import simular_sac_por_prazo
+from simfin.sweep import varrer_sac
+
+def test_grade_confere_com_motor():
+    entradas = [Decimal('50000'), Decimal('87500')]
+    juros = [Decimal('0.0847'), Decimal('0.12')]
+    prazos = [60, 120]
+    kw = dict(tr_anuais=[Decimal('0.01')], ipca_anuais=[Decimal('0.04')], encargos=Decimal('120'))
+    exata = varrer_sac(Decimal('250000'), entradas, juros, prazos, exato=True, **kw)
+    rapida = varrer_sac(Decimal('250000'), entradas, juros, prazos, **kw)
+    assert len(exata) == 8
+    for linha, aprox in zip(exata, rapida):
+        r = simular_sac_por_prazo(EntradaPrazo(
+            valor_imovel=Decimal('250000'), entrada=linha["entrada"], juros_anual=linha["juros_anual"],
+            tr_anual=Decimal('0.01'), ipca_anual=Decimal('0.04'), encargos_fixos_mensais=Decimal('120'),
+            prazo=linha["prazo"], prazo_oficial=360,
+        ))
+        assert linha["primeira_parcela"] == r.primeira_parcela
+        assert linha["ultima_parcela"] == r.ultima_parcela
+        assert linha["total_pago"] == r.valor_total_pago
+        assert abs(aprox["total_pago"] - r.valor_total_pago) <= Decimal('0.005') * linha["prazo"]
+
+def test_grade_com_vpl():
+    r = varrer_sac(Decimal('1000'), [Decimal('0')], [Decimal('0')], [2],
+                   taxa_desconto_anual=Decimal('0'))
+    assert r[0]["vpl"] is None
+    r = varrer_sac(Decimal('1000'), [Decimal('0')], [Decimal('0')], [1],
+                   taxa_desconto_anual=Decimal('0.1'))
+    assert r[0]["vpl"] < Decimal('1000')
+
+def test_cli_taxas_em_percentual(tmp_path):
+    # 8 e 9 (juros), 1 (TR) e 4.5 (IPCA) são percentuais, como no modo principal
+    base = ["sweep", "--valor-imovel", "300000", "--entradas", "60000", "--prazos", "120"]
+    main(base + ["--juros", "8:9:1", "--tr-anual", "1", "--ipca-anual", "4.5", "--csv", str(tmp_path / "a.csv")])
+    main(base + ["--juros", "0.08,0.09", "--tr-anual", "0.01", "--ipca-anual", "0.045", "--csv", str(tmp_path / "b.csv")])
+    main(base + ["--juros", "8,9", "--juros-em-percent", "--tr-anual", "0.01", "--ipca-anual", "0.045",
+                 "--csv", str(tmp_path / "c.csv")])
+    a = (tmp_path / "a.csv").read_text()
+    assert a == (tmp_path / "b.csv").read_text() == (tmp_path / "c.csv").read_text()
+    linhas = a.splitlines()
+    assert len(linhas) == 3 and linhas[1].split(",")[0] == "0.08"
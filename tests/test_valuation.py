@@ -0,0 +1,46 @@
+from decimal import Decimal
+import pytest
+from simfin.cli import main
+from simfin.models import EntradaPrazo
+from simfin.sac import simular_sac_por_prazo
+from simfin.indices import taxa_mensal
+from simfin.valuation import cet, cet_lote, fatores_desconto, tir, vpl, vpl_lote
+
+def _entrada(encargos, juros=Decimal("0.0847")):
+    return EntradaPrazo(valor_imovel=Decimal("250000"), entrada=Decimal("87500"), juros_anual=juros,
+                        tr_anual=Decimal(0), ipca_anual=Decimal(0), encargos_fixos_mensais=Decimal(encargos),
+                        prazo=360, prazo_oficial=360)
+
+def test_vpl_igual_a_soma_direta():
+    c = simular_sac_por_prazo(_entrada(120)).parcelas_detalhadas
+    m = taxa_mensal(Decimal("0.10"))
+    direto = sum(p["parcela"] / (1 + m) ** i for i, p in enumerate(c, start=1))
+    assert vpl(c, Decimal("0.10")).quantize(Decimal("0.0001")) == direto.quantize(Decimal("0.0001"))
+    assert vpl(c.para_dicts(), "0.10") == vpl([p["parcela"] for p in c], 0.10) == vpl(c, Decimal("0.10"))
+    a, b = vpl_lote([c, c[:12]], Decimal("0.10"))
+    assert b == vpl(c[:12], Decimal("0.10")) and a > b
+    assert fatores_desconto(Decimal("0.10"), 360) is fatores_desconto("0.10", 360)
+    assert vpl(c, 0) == simular_sac_por_prazo(_entrada(120)).valor_total_pago
+
+def test_tir_e_cet():
+    assert tir([-100, 110]) == Decimal("0.1")
+    assert abs(tir([-100, 0, 121]) - Decimal("0.1")) < Decimal("1e-25")
+    sem_encargos = simular_sac_por_prazo(_entrada(0))
+    juros_a = cet(162500, sem_encargos.parcelas_detalhadas)
+    assert abs(juros_a - Decimal("0.0847")) < Decimal("0.0001")     # só o arredondamento das parcelas
+    com_encargos = simular_sac_por_prazo(_entrada(120)).parcelas_detalhadas
+    assert cet(162500, com_encargos) > juros_a
+    ofertas = [(162500, simular_sac_por_prazo(_entrada(120, Decimal(j) / 100)).parcelas_detalhadas)
+               for j in ("8", "9", "10")]
+    assert cet_lote(ofertas) == [cet(v, p) for v, p in ofertas]
+    with pytest.raises(ValueError):
+        tir([100, 10])
+
+def test_cli_cet_sob_demanda(capsys):
+    args = ["--tipo", "prazo", "--valor-imovel", "250000", "--entrada", "87500", "--juros-anual", "8.47",
+            "--juros-em-percent", "--prazo", "360", "--encargos", "120"]
+    main(args)
+    assert "CET" not in capsys.readouterr().out
+    main(args + ["--cet"])
+    c = cet(162500, simular_sac_por_prazo(_entrada(120)).parcelas_detalhadas)
+    assert f"CET: {(c * 100).quantize(Decimal('0.01'))}% a.a." in capsys.readouterr().out